@@ -0,0 +1,61 @@
+'''
+    .. console - Comprehensive utility library for ANSI terminals.
+    .. © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
+
+    Benchmark of _LineWriter, which batches the lines of each write,
+    against the former per-line path, kept below for reference.
+
+    ::
+
+        ⏵ PYTHONPATH=. python3 bench/line_writer.py
+'''
+import os
+from timeit import repeat
+
+from console.core import _LineWriter
+
+
+class PerLineWriter:
+    ''' The former _LineWriter, one stream write per line. '''
+    def __init__(self, start, stream, default):
+        self.start = start
+        self.stream = stream
+        self.default = default
+
+    def write(self, data):
+        if data == '\n':  # print does this
+            return self.stream.write(data)
+        else:
+            bytes_written = 0
+            for line in data.splitlines(True):  # keep ends: True
+                end = ''
+                if line.endswith('\n'):  # mv nl to end of output below:
+                    line = line[:-1]
+                    end = '\n'
+                bytes_written += self.stream.write(
+                                    f'{self.start}{line}{self.default}{end}'
+                                 ) or 0  # in case None returned (on Windows)
+            return bytes_written
+
+    def __getattr__(self, attr):  # slows attribute access, keep to compare
+        return getattr(self.stream, attr)
+
+
+def bench(writer_class, stream, lines_per_print, total_lines=200_000):
+    writer = writer_class('\x1b[31m', stream, '\x1b[39m')
+    text = '\n'.join(['x' * 100] * lines_per_print)
+    prints = total_lines // lines_per_print
+    return min(repeat(lambda: [print(text, file=writer) for _ in range(prints)],
+                      number=1, repeat=5))
+
+
+if __name__ == '__main__':
+
+    with open(os.devnull, 'w') as text_out, open(os.devnull, 'wb') as bin_out:
+        print(f'{"200k lines of 100 chars, to devnull":40} per-line  batched')
+        for lines in (1, 100):
+            print(f'  {lines:3}-line prints{"":23}'
+                  f'{bench(PerLineWriter, text_out, lines):6.3f} s'
+                  f'{bench(_LineWriter, text_out, lines):7.3f} s')
+        print(f'  100-line prints, binary stream{"":17}'
+              f'{bench(_LineWriter, bin_out, 100):7.3f} s')
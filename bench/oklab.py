@@ -0,0 +1,45 @@
+'''
+    .. console - Comprehensive utility library for ANSI terminals.
+    .. © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
+
+    Benchmark of the oklab downgrade method against euclid, the default,
+    per color over color_table8.
+
+    ::
+
+        ⏵ PYTHONPATH=. python3 bench/oklab.py
+'''
+import random
+from timeit import repeat
+
+from console import color_tables
+from console.proximity import (build_color_tables, find_nearest_color_index,
+                               rgb_to_oklab)
+
+
+def bench(method, colors, cold=False):
+    ''' Returns the best time per color, in µs. '''
+    def run():
+        if cold:  # conversion cache, only used by oklab
+            rgb_to_oklab.cache_clear()
+        for rgb in colors:
+            find_nearest_color_index(*rgb, method=method)
+
+    return min(repeat(run, number=1, repeat=5)) / len(colors) * 1e6
+
+
+if __name__ == '__main__':
+
+    build_color_tables(base=color_tables.xterm_palette4)
+    rand = random.Random(8)
+    few = [tuple(rand.randrange(256) for _ in range(3)) for _ in range(100)]
+    many = [tuple(rand.randrange(256) for _ in range(3)) for _ in range(10_000)]
+
+    print(f'{"color_table8, per color":40}  euclid   oklab')
+    for label, colors, cold in (
+            ('10k random colors, cold cache', many, True),
+            ('10k random colors, more than cached', many, False),
+            ('100 colors x100, warm cache', few * 100, False),
+        ):
+        print(f'  {label:38}{bench("euclid", colors):5.1f} µs'
+              f'{bench("oklab", colors, cold):6.1f} µs')
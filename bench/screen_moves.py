@@ -0,0 +1,99 @@
+'''
+    .. console - Comprehensive utility library for ANSI terminals.
+    .. © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
+
+    Benchmark of cursor moves: the rendered position cache of move_to and
+    move_many, against rendering each move with the uncached template.
+    Screen and, where curses is available, ScreenTermInfo with plain tparm
+    or precompiled templates.
+
+    Cold is the first move to each point, with an empty cache, which costs
+    more than rendering uncached; the break-even line gives the moves to a
+    point needed to make up for it.
+
+    ::
+
+        ⏵ PYTHONPATH=. python3 bench/screen_moves.py
+'''
+import os
+from timeit import repeat
+
+os.environ['PY_CONSOLE_USE_TERMINFO'] = '1'  # before import, for terminfo
+if not os.environ.get('TERM'):
+    os.environ['TERM'] = 'xterm-256color'
+
+from console import using_terminfo  # noqa: E402
+from console.screen import Screen, ScreenTermInfo, _TemplateString  # noqa
+
+
+def bench(function, points, clear=None):
+    ''' Returns the best time per move, in ns. '''
+    def run():
+        if clear:
+            clear()
+        function(points)
+
+    return min(repeat(run, number=1, repeat=15)) / len(points) * 1e9
+
+
+def report(title, uncached, cases, points):
+    ''' Print cold and warm times per move, then the break-even point of
+        the first cached case against the uncached one.
+    '''
+    print(f'{title:40}  cold   warm')
+    label, function = uncached
+    plain = bench(function, points)
+    print(f'  {label:38}{plain:4.0f} ns')
+    times = []
+    for label, function, clear in cases:
+        cold, warm = bench(function, points, clear), bench(function, points)
+        times.append((cold, warm))
+        print(f'  {label:38}{cold:4.0f} ns{warm:5.0f} ns')
+
+    cold, warm = times[0]
+    print(f'  break-even, moves to each point{"":7}'
+          f'{(cold - warm) / max(plain - warm, 1):4.1f}\n')
+
+
+def swapped(function):
+    ''' Render each point, in x, y order, with a template function. '''
+    return lambda points: [function(y, x) for x, y in points]
+
+
+if __name__ == '__main__':
+
+    points = [(x, y) for y in range(50) for x in range(200)]  # 10k
+    sc = Screen(force=True)
+    uncached = _TemplateString('H', '%s;%s')
+    report(
+        'Screen, 10k points (200x50), per move',
+        ('uncached template', lambda points: [uncached(*point)
+                                              for point in points]),
+        (('move_to', lambda points: [sc.move_to(*point) for point in points],
+          sc.move_to._cache.clear),
+         ('move_many', sc.move_many, sc.move_to._cache.clear)),
+        points,
+    )
+
+    if using_terminfo:
+        from console.screen import _tparm
+
+        for precompile in (False, True):
+            sct = ScreenTermInfo(force=True, precompile=precompile)
+            cup = sct.move_to
+            if precompile:
+                uncached = ('precompiled, uncached', swapped(cup._format))
+            else:
+                byte_str = cup._byte_str
+                uncached = ('tparm, uncached', swapped(
+                    lambda *args: _tparm(byte_str, *args).decode('ascii')
+                ))
+            report(
+                f'ScreenTermInfo, precompile={precompile}',
+                uncached,
+                (('move_to', lambda points, cup=cup: [cup(*point)
+                                                      for point in points],
+                  cup._cache.clear),
+                 ('move_many', sct.move_many, cup._cache.clear)),
+                points,
+            )
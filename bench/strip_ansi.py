@@ -0,0 +1,70 @@
+'''
+    .. console - Comprehensive utility library for ANSI terminals.
+    .. © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
+
+    Benchmark of strip_ansi and len_stripped against the former multi-pass
+    versions, kept below for reference.
+
+    ::
+
+        ⏵ PYTHONPATH=. python3 bench/strip_ansi.py
+'''
+from timeit import repeat
+
+from console.utils import (ansi_csi0_finder, ansi_csi1_finder,
+                           ansi_osc0_finder, ansi_osc1_finder,
+                           len_stripped, strip_ansi)
+
+
+def multi_pass_strip_ansi(text, c1=False, osc=False):
+    ''' The former strip_ansi, one re.sub() pass per kind. '''
+    text = ansi_csi0_finder.sub('', text)
+    if osc:
+        text = ansi_osc0_finder.sub('', text)
+    if c1:
+        text = ansi_csi1_finder.sub('', text)
+        if osc:
+            text = ansi_osc1_finder.sub('', text)
+    return text
+
+
+def multi_pass_len_stripped(text):
+    return len(multi_pass_strip_ansi(text))
+
+
+def make_log(total_lines):
+    ''' A colored log, with a hyperlink every tenth line. '''
+    lines = []
+    for i in range(total_lines):
+        line = (f'\x1b[2m2025-01-01 12:00:{i % 60:02}\x1b[22m \x1b[32mINFO'
+                f'\x1b[39m request {i} handled in \x1b[1m{i % 97} ms\x1b[22m')
+        if not i % 10:
+            line += (' \x1b]8;;https://example.com/req/%d\x1b\\details'
+                     '\x1b]8;;\x1b\\' % i)
+        lines.append(line)
+    return lines
+
+
+def bench(function, *args, **kwargs):
+    return min(repeat(lambda: function(*args, **kwargs), number=1, repeat=10))
+
+
+if __name__ == '__main__':
+
+    lines = make_log(200_000)
+    text = '\n'.join(lines)
+    print(f'{"colored log, 200k lines, %.0f MB" % (len(text) / 1e6):36}'
+          ' multi-pass  single')
+    for label, kwargs in (('default', {}), ('osc', dict(osc=True)),
+                          ('c1', dict(c1=True)),
+                          ('c1 + osc', dict(c1=True, osc=True))):
+        print(f'  strip_ansi, {label:24}'
+              f'{bench(multi_pass_strip_ansi, text, **kwargs):8.3f} s'
+              f'{bench(strip_ansi, text, **kwargs):8.3f} s')
+
+    def per_line(function):
+        return lambda: [function(line) for line in lines]
+
+    print(f'  len_stripped, per line{"":14}'
+          f'{bench(per_line(multi_pass_len_stripped)):8.3f} s'
+          f'{bench(per_line(len_stripped)):8.3f} s')
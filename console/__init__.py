@@ -1,20 +1,29 @@
 '''
     | console - Comprehensive utility library for ANSI terminals.
     | © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
+
+    Terminal detection, which may query the terminal, is deferred until the
+    first use of one of the names in _DETECTED_NAMES, e.g. fg or sc.
+    Palette and screen objects are loaded on their own first use, after the
+    level, so that style and core may be imported before the package names.
 '''
+from threading import Lock as _Lock
+
 from .disabled import empty_bin as _empty_bin, empty_scr_bin as _empty_scr_bin
 
 
-term_level = ansi_capable = using_terminfo = None
-# Define pass-thru palette objects for streams and dumb terminals:
-fg = bg = ul = fx = defx = _empty_bin
-sc = _empty_scr_bin
+using_terminfo = None
+_DETECTED_NAMES = ('term_level', 'ansi_capable',
+                   'fg', 'bg', 'ul', 'fx', 'defx', 'sc')
+_OBJECT_NAMES = _DETECTED_NAMES[2:]  # loaded after detection
+_detect_lock = _Lock()
 
 
 try:  # avoid install issue with new pip:2024 :-/
     import env as _env
 except ModuleNotFoundError as err:
     print(str(err))
+    _env = None
 else:
     # Early terminfo support
     if _env.PY_CONSOLE_USE_TERMINFO.truthy or _env.SSH_CLIENT:
@@ -39,36 +48,65 @@ else:
             _curses.setupterm()
             using_terminfo = True
 
-    # defer imports for proper ordering, read using_terminfo
-    # _TermLevel import was here
-    from .detection import TermStack
 
+def _detect():
+    ''' Detect terminal capabilities, i.e. term_level and ansi_capable. '''
+    global term_level, ansi_capable
+
+    term_level = ansi_capable = None
     # detection is performed if not explicitly disabled
-    if (_env.PY_CONSOLE_AUTODETECT.value is None or
-        _env.PY_CONSOLE_AUTODETECT.truthy):
+    if _env and (_env.PY_CONSOLE_AUTODETECT.value is None or
+                 _env.PY_CONSOLE_AUTODETECT.truthy):
 
         # detect palette, other modules are dependent
-        from .constants import TermLevel as _TermLevel
         from .detection import init as _init
 
         term_level = _init(using_terminfo=using_terminfo)
+        ansi_capable = bool(term_level)  # simplify comparisons
+
+
+def _load_objects():
+    ''' Set up the palette and screen objects to match detection.  Not run
+        by _detect(), as style imports core, which needs the level.
+    '''
+    global fg, bg, ul, fx, defx, sc
+
+    # Define pass-thru palette objects for streams and dumb terminals:
+    _fg = _bg = _ul = _fx = _defx = _empty_bin
+    _sc = _empty_scr_bin
 
-        if term_level:  # > 0, may now import other modules
-            ansi_capable = True  # simplify comparisons
-            # monochrome stuff first
-            from .style import fx, defx
-            from .screen import sc
-            from .detection import is_fbterm as _is_fbterm
-
-            if term_level > _TermLevel.ANSI_MONOCHROME:
-                from .style import fg, bg  # Yo Iz, let's do this…
-
-            # curly or colored underlines not handled well by linux consoles:
-            if term_level > _TermLevel.ANSI_BASIC and not _is_fbterm:
-                from .style import ul
-            else:
-                fx.curly_underline = fx.underline  # downgrade
+    if term_level:  # > 0, may now import other modules
+        from .constants import TermLevel as _TermLevel
+        # monochrome stuff first
+        from .style import fx as _fx, defx as _defx
+        from .screen import sc as _sc
+        from .detection import is_fbterm as _is_fbterm
+
+        if term_level > _TermLevel.ANSI_MONOCHROME:
+            from .style import fg as _fg, bg as _bg  # Yo Iz, let's do this…
+
+        # curly or colored underlines not handled well by linux consoles:
+        if term_level > _TermLevel.ANSI_BASIC and not _is_fbterm:
+            from .style import ul as _ul
         else:
-            ansi_capable = False  # simplify comparisons
+            _fx.curly_underline = _fx.underline  # downgrade
+
+    fg, bg, ul, fx, defx, sc = _fg, _bg, _ul, _fx, _defx, _sc
+
+
+def __getattr__(name):
+    ''' Run detection on first use of its results, and import the rest on
+        demand.
+    '''
+    if name in _DETECTED_NAMES:
+        with _detect_lock:
+            if 'term_level' not in globals():  # another thread may have won
+                _detect()
+        if name in _OBJECT_NAMES and name not in globals():
+            _load_objects()  # not under the lock, imports have their own
+        return globals()[name]
+    elif name == 'TermStack':
+        from .detection import TermStack
+        return TermStack
 
-        fg, bg, ul, fx, defx, sc, TermStack  # quiet pyflakes
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
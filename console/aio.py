@@ -0,0 +1,222 @@
+'''
+    .. console - Comprehensive utility library for ANSI terminals.
+    .. © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
+
+    Terminal queries for asyncio programs.
+
+    Rather than blocking on select() as the versions in the detection module
+    do, these register the tty with the running event loop and await the
+    response, so other tasks keep running while the terminal answers.
+    Responses are parsed as in the detection module.
+    Queries are run one at a time per event loop, as they share the tty.
+
+    On Windows, the blocking versions are run in a thread instead.
+
+    Example::
+
+        from console import aio
+
+        async def main():
+            theme, (x, y) = await aio.get_theme(), await aio.get_position()
+'''
+import asyncio
+import logging
+import sys
+from weakref import WeakKeyDictionary
+
+from . import detection
+from .constants import BEL, CSI, ST
+from .detection import (TermStack, _find_markers, _find_probe_end, env,
+                        os_name, termios, tty)
+from .meta import defaults
+
+
+log = logging.getLogger(__name__)
+_locks = WeakKeyDictionary()  # per event loop
+_in_thread = (os_name == 'nt' and not env.SSH_CLIENT)  # no add_reader
+
+
+async def _query(sequence, find_end, max_bytes=100, stream=sys.stdout,
+                 timeout=defaults.READ_TIMEOUT, infile=sys.stdin):
+    ''' Write a query to the terminal and await its response.
+
+        Arguments:
+            sequence: str, query to write.
+            find_end: function, returns where the response and its end
+                      marker end, or None.
+            max_bytes: int, read no longer than this.
+            stream: file, to write the query to.
+            timeout: float secs, how long to wait until giving up.
+            infile: file, tty to read the response from.
+
+        Returns:
+            str: the response up to its end, or what had arrived by the
+                 timeout.  Empty on error.
+    '''
+    loop = asyncio.get_running_loop()
+    lock = _locks.get(loop)
+    if lock is None:
+        lock = _locks[loop] = asyncio.Lock()
+
+    data = bytearray()
+    async with lock:
+        try:
+            with TermStack(infile) as fd:
+                termios.tcflush(fd, termios.TCIFLUSH)   # clear input
+                tty.setcbreak(fd, termios.TCSANOW)      # shut off echo
+                done = loop.create_future()
+
+                def on_readable():  # leaves what follows, as detection
+                    if not done.done() and detection._read_chunk(
+                        infile, data, find_end, max_bytes
+                    ):
+                        done.set_result(None)
+
+                loop.add_reader(fd, on_readable)
+                try:
+                    stream.write(sequence)
+                    stream.flush()
+                    await asyncio.wait_for(done, timeout)
+                except asyncio.TimeoutError:
+                    log.debug('response not received in time, %s secs.',
+                              timeout)
+                finally:
+                    loop.remove_reader(fd)
+
+        except AttributeError:
+            log.debug('warning - no .fileno() attribute was found on the stream.')
+        except (OSError, termios.error) as err:
+            log.debug('query failed: %s', err)
+
+    return data.decode('utf8', 'replace')
+
+
+async def _run_in_thread(function, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, lambda: function(*args, **kwargs)
+    )
+
+
+async def get_color(name, number=None, stream=sys.stdout,
+                    timeout=defaults.READ_TIMEOUT):
+    ''' Query the terminal for colors, see detection.get_color().
+
+        Returns:
+            tuple[str]: four-digit hex strings, empty on failure.
+    '''
+    if _in_thread:
+        return await _run_in_thread(detection.get_color, name, number,
+                                    stream=stream, timeout=timeout)
+    color = ()
+    query_sequence = detection._get_color_query(name, number)
+    if query_sequence and detection._can_query_color():
+        resp = await _query(  # max bytes 26 + 2 for 256 digits
+            query_sequence, _find_markers(BEL, ST), max_bytes=28,
+            stream=stream, timeout=timeout,
+        )
+        color = detection._parse_color(resp)
+
+    log.debug('%s %s color: %r', name, number, color)
+    return color
+
+
+async def get_clipboard(source='c', encoding='utf8',
+                        max_bytes=defaults.MAX_CLIPBOARD_SIZE, timeout=.2):
+    ''' Read string or byte data from the clipboard,
+        see utils.get_clipboard().
+    '''
+    from . import ansi_capable  # defer, runs detection
+
+    if not ansi_capable:
+        return None
+    if _in_thread:
+        return await _run_in_thread(
+            detection._read_clipboard, source=source, encoding=encoding,
+            max_bytes=max_bytes, timeout=timeout,
+        )
+    resp = await _query(
+        f'\x1b]52;{source};?{ST}', _find_markers(ST), max_bytes=max_bytes,
+        timeout=timeout,
+    )
+    return detection._parse_clipboard(resp, encoding)
+
+
+async def get_position(fallback=defaults.CURSOR_POS_FALLBACK,
+                       timeout=defaults.READ_TIMEOUT):
+    ''' Return the current position of the terminal cursor,
+        see detection.get_position().
+
+        Returns:
+            tuple(int): (x, y) | fallback, if an error occurred.
+    '''
+    if _in_thread:
+        return await _run_in_thread(detection.get_position, fallback)
+
+    resp = await _query(CSI + '6n', _find_markers('R'), max_bytes=10,
+                        timeout=timeout)
+    if not resp:
+        return fallback
+    return detection._parse_position(resp)
+
+
+async def get_theme(timeout=defaults.READ_TIMEOUT, default=None):
+    ''' Checks terminal for light/dark theme information,
+        see detection.get_theme().
+
+        Returns:
+            str, None:  'dark', 'light', or None if no information.
+    '''
+    if _in_thread:
+        return await _run_in_thread(detection.get_theme, timeout=timeout,
+                                    default=default)
+
+    theme = detection._find_theme(default)
+    if theme is Ellipsis:  # try xterm query
+        colors = await get_color('background', timeout=timeout)
+        theme = detection._theme_from_colors(colors, default)
+
+    log.debug('%r', theme)
+    return theme
+
+
+async def get_title(mode='title', timeout=.2):
+    ''' Return the terminal/console title, see detection.get_title().
+
+        Returns:
+            title string, or None if not able to be found.
+    '''
+    if _in_thread:
+        return await _run_in_thread(detection.get_title, mode)
+
+    if sys.platform == 'darwin':
+        if env.TERM_PROGRAM != 'iTerm.app':
+            return None
+
+    mode = detection._query_mode_map.get(mode, mode)
+    resp = await _query(f'{CSI}{mode}t', _find_markers(ST), timeout=timeout)
+    title = detection._parse_title(resp)
+    log.debug('%r', title)
+    return title
+
+
+async def probe(*queries, stream=sys.stdout, timeout=defaults.READ_TIMEOUT):
+    ''' Ask the terminal several questions at once,
+        see detection.probe().
+
+        Returns:
+            dict: of each query to its parsed reply, None if not answered.
+    '''
+    if _in_thread:
+        return await _run_in_thread(detection.probe, *queries, stream=stream,
+                                    timeout=timeout)
+
+    sequences = detection._get_probe_sequences(queries)
+    resp = ''
+    if detection.is_a_tty(stream=sys.stdin):  # else can't read answer
+        resp = await _query(
+            ''.join(sequences) + detection._probe_sentinel,
+            _find_probe_end, max_bytes=defaults.MAX_CLIPBOARD_SIZE,
+            stream=stream, timeout=timeout,
+        )
+    return detection._parse_probe_replies(queries, resp)
@@ -2,685 +2,735 @@
     .. console - Comprehensive utility library for ANSI terminals.
     .. © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
 
-    Tables for the X11 color palette.
-    Entries are recorded here as strings as no calculation needs to be done.
-    Strings are what they'll be on final output.
+    Table for the X11 color palette.
+
+    Packed into a single bytes object that loads as one constant:
+    fixed-width records of a name padded with spaces, followed by its red,
+    green, and blue bytes, sorted by name for binary search.
 
     | X11 full color values from '/usr/share/X11/rgb.txt'
     | ! $Xorg: rgb.txt,v 1.3 2000/08/17 19:54:00 cpqbld Exp $
 '''
 
 
-x11_color_map = {
-    'snow':                 ('255', '250', '250'),
-    'ghostwhite':           ('248', '248', '255'),
-    'whitesmoke':           ('245', '245', '245'),
-    'gainsboro':            ('220', '220', '220'),
-    'floralwhite':          ('255', '250', '240'),
-    'oldlace':              ('253', '245', '230'),
-    'linen':                ('250', '240', '230'),
-    'antiquewhite':         ('250', '235', '215'),
-    'papayawhip':           ('255', '239', '213'),
-    'blanchedalmond':       ('255', '235', '205'),
-    'bisque':               ('255', '228', '196'),
-    'peachpuff':            ('255', '218', '185'),
-    'navajowhite':          ('255', '222', '173'),
-    'moccasin':             ('255', '228', '181'),
-    'cornsilk':             ('255', '248', '220'),
-    'ivory':                ('255', '255', '240'),
-    'lemonchiffon':         ('255', '250', '205'),
-    'seashell':             ('255', '245', '238'),
-    'honeydew':             ('240', '255', '240'),
-    'mintcream':            ('245', '255', '250'),
-    'azure':                ('240', '255', '255'),
-    'aliceblue':            ('240', '248', '255'),
-    'lavender':             ('230', '230', '250'),
-    'lavenderblush':        ('255', '240', '245'),
-    'mistyrose':            ('255', '228', '225'),
-    'white':                ('255', '255', '255'),
-    'black':                ('0', '0', '0'),
-    'darkslategray':        ('47', '79', '79'),
-    'darkslategrey':        ('47', '79', '79'),
-    'dimgray':              ('105', '105', '105'),
-    'dimgrey':              ('105', '105', '105'),
-    'slategray':            ('112', '128', '144'),
-    'slategrey':            ('112', '128', '144'),
-    'lightslategray':       ('119', '136', '153'),
-    'lightslategrey':       ('119', '136', '153'),
-    'gray':                 ('190', '190', '190'),
-    'grey':                 ('190', '190', '190'),
-    'lightgrey':            ('211', '211', '211'),
-    'lightgray':            ('211', '211', '211'),
-    'midnightblue':         ('25', '25', '112'),
-    'navy':                 ('0', '0', '128'),
-    'navyblue':             ('0', '0', '128'),
-    'cornflowerblue':       ('100', '149', '237'),
-    'darkslateblue':        ('72', '61', '139'),
-    'slateblue':            ('106', '90', '205'),
-    'mediumslateblue':      ('123', '104', '238'),
-    'lightslateblue':       ('132', '112', '255'),
-    'mediumblue':           ('0', '0', '205'),
-    'royalblue':            ('65', '105', '225'),
-    'blue':                 ('0', '0', '255'),
-    'dodgerblue':           ('30', '144', '255'),
-    'deepskyblue':          ('0', '191', '255'),
-    'skyblue':              ('135', '206', '235'),
-    'lightskyblue':         ('135', '206', '250'),
-    'steelblue':            ('70', '130', '180'),
-    'lightsteelblue':       ('176', '196', '222'),
-    'lightblue':            ('173', '216', '230'),
-    'powderblue':           ('176', '224', '230'),
-    'paleturquoise':        ('175', '238', '238'),
-    'darkturquoise':        ('0', '206', '209'),
-    'mediumturquoise':      ('72', '209', '204'),
-    'turquoise':            ('64', '224', '208'),
-    'cyan':                 ('0', '255', '255'),
-    'lightcyan':            ('224', '255', '255'),
-    'cadetblue':            ('95', '158', '160'),
-    'mediumaquamarine':     ('102', '205', '170'),
-    'aquamarine':           ('127', '255', '212'),
-    'darkgreen':            ('0', '100', '0'),
-    'darkolivegreen':       ('85', '107', '47'),
-    'darkseagreen':         ('143', '188', '143'),
-    'seagreen':             ('46', '139', '87'),
-    'mediumseagreen':       ('60', '179', '113'),
-    'lightseagreen':        ('32', '178', '170'),
-    'palegreen':            ('152', '251', '152'),
-    'springgreen':          ('0', '255', '127'),
-    'lawngreen':            ('124', '252', '0'),
-    'green':                ('0', '255', '0'),
-    'chartreuse':           ('127', '255', '0'),
-    'mediumspringgreen':    ('0', '250', '154'),
-    'greenyellow':          ('173', '255', '47'),
-    'limegreen':            ('50', '205', '50'),
-    'yellowgreen':          ('154', '205', '50'),
-    'forestgreen':          ('34', '139', '34'),
-    'olivedrab':            ('107', '142', '35'),
-    'darkkhaki':            ('189', '183', '107'),
-    'khaki':                ('240', '230', '140'),
-    'palegoldenrod':        ('238', '232', '170'),
-    'lightgoldenrodyellow': ('250', '250', '210'),
-    'lightyellow':          ('255', '255', '224'),
-    'yellow':               ('255', '255', '0'),
-    'gold':                 ('255', '215', '0'),
-    'lightgoldenrod':       ('238', '221', '130'),
-    'goldenrod':            ('218', '165', '32'),
-    'darkgoldenrod':        ('184', '134', '11'),
-    'rosybrown':            ('188', '143', '143'),
-    'indianred':            ('205', '92', '92'),
-    'saddlebrown':          ('139', '69', '19'),
-    'sienna':               ('160', '82', '45'),
-    'peru':                 ('205', '133', '63'),
-    'burlywood':            ('222', '184', '135'),
-    'beige':                ('245', '245', '220'),
-    'wheat':                ('245', '222', '179'),
-    'sandybrown':           ('244', '164', '96'),
-    'tan':                  ('210', '180', '140'),
-    'chocolate':            ('210', '105', '30'),
-    'firebrick':            ('178', '34', '34'),
-    'brown':                ('165', '42', '42'),
-    'darksalmon':           ('233', '150', '122'),
-    'salmon':               ('250', '128', '114'),
-    'lightsalmon':          ('255', '160', '122'),
-    'orange':               ('255', '165', '0'),
-    'darkorange':           ('255', '140', '0'),
-    'coral':                ('255', '127', '80'),
-    'lightcoral':           ('240', '128', '128'),
-    'tomato':               ('255', '99', '71'),
-    'orangered':            ('255', '69', '0'),
-    'red':                  ('255', '0', '0'),
-    'hotpink':              ('255', '105', '180'),
-    'deeppink':             ('255', '20', '147'),
-    'pink':                 ('255', '192', '203'),
-    'lightpink':            ('255', '182', '193'),
-    'palevioletred':        ('219', '112', '147'),
-    'maroon':               ('176', '48', '96'),
-    'mediumvioletred':      ('199', '21', '133'),
-    'violetred':            ('208', '32', '144'),
-    'magenta':              ('255', '0', '255'),
-    'violet':               ('238', '130', '238'),
-    'plum':                 ('221', '160', '221'),
-    'orchid':               ('218', '112', '214'),
-    'mediumorchid':         ('186', '85', '211'),
-    'darkorchid':           ('153', '50', '204'),
-    'darkviolet':           ('148', '0', '211'),
-    'blueviolet':           ('138', '43', '226'),
-    'purple':               ('160', '32', '240'),
-    'mediumpurple':         ('147', '112', '219'),
-    'thistle':              ('216', '191', '216'),
-    'snow1':                ('255', '250', '250'),
-    'snow2':                ('238', '233', '233'),
-    'snow3':                ('205', '201', '201'),
-    'snow4':                ('139', '137', '137'),
-    'seashell1':            ('255', '245', '238'),
-    'seashell2':            ('238', '229', '222'),
-    'seashell3':            ('205', '197', '191'),
-    'seashell4':            ('139', '134', '130'),
-    'antiquewhite1':        ('255', '239', '219'),
-    'antiquewhite2':        ('238', '223', '204'),
-    'antiquewhite3':        ('205', '192', '176'),
-    'antiquewhite4':        ('139', '131', '120'),
-    'bisque1':              ('255', '228', '196'),
-    'bisque2':              ('238', '213', '183'),
-    'bisque3':              ('205', '183', '158'),
-    'bisque4':              ('139', '125', '107'),
-    'peachpuff1':           ('255', '218', '185'),
-    'peachpuff2':           ('238', '203', '173'),
-    'peachpuff3':           ('205', '175', '149'),
-    'peachpuff4':           ('139', '119', '101'),
-    'navajowhite1':         ('255', '222', '173'),
-    'navajowhite2':         ('238', '207', '161'),
-    'navajowhite3':         ('205', '179', '139'),
-    'navajowhite4':         ('139', '121', '94'),
-    'lemonchiffon1':        ('255', '250', '205'),
-    'lemonchiffon2':        ('238', '233', '191'),
-    'lemonchiffon3':        ('205', '201', '165'),
-    'lemonchiffon4':        ('139', '137', '112'),
-    'cornsilk1':            ('255', '248', '220'),
-    'cornsilk2':            ('238', '232', '205'),
-    'cornsilk3':            ('205', '200', '177'),
-    'cornsilk4':            ('139', '136', '120'),
-    'ivory1':               ('255', '255', '240'),
-    'ivory2':               ('238', '238', '224'),
-    'ivory3':               ('205', '205', '193'),
-    'ivory4':               ('139', '139', '131'),
-    'honeydew1':            ('240', '255', '240'),
-    'honeydew2':            ('224', '238', '224'),
-    'honeydew3':            ('193', '205', '193'),
-    'honeydew4':            ('131', '139', '131'),
-    'lavenderblush1':       ('255', '240', '245'),
-    'lavenderblush2':       ('238', '224', '229'),
-    'lavenderblush3':       ('205', '193', '197'),
-    'lavenderblush4':       ('139', '131', '134'),
-    'mistyrose1':           ('255', '228', '225'),
-    'mistyrose2':           ('238', '213', '210'),
-    'mistyrose3':           ('205', '183', '181'),
-    'mistyrose4':           ('139', '125', '123'),
-    'azure1':               ('240', '255', '255'),
-    'azure2':               ('224', '238', '238'),
-    'azure3':               ('193', '205', '205'),
-    'azure4':               ('131', '139', '139'),
-    'slateblue1':           ('131', '111', '255'),
-    'slateblue2':           ('122', '103', '238'),
-    'slateblue3':           ('105', '89', '205'),
-    'slateblue4':           ('71', '60', '139'),
-    'royalblue1':           ('72', '118', '255'),
-    'royalblue2':           ('67', '110', '238'),
-    'royalblue3':           ('58', '95', '205'),
-    'royalblue4':           ('39', '64', '139'),
-    'blue1':                ('0', '0', '255'),
-    'blue2':                ('0', '0', '238'),
-    'blue3':                ('0', '0', '205'),
-    'blue4':                ('0', '0', '139'),
-    'dodgerblue1':          ('30', '144', '255'),
-    'dodgerblue2':          ('28', '134', '238'),
-    'dodgerblue3':          ('24', '116', '205'),
-    'dodgerblue4':          ('16', '78', '139'),
-    'steelblue1':           ('99', '184', '255'),
-    'steelblue2':           ('92', '172', '238'),
-    'steelblue3':           ('79', '148', '205'),
-    'steelblue4':           ('54', '100', '139'),
-    'deepskyblue1':         ('0', '191', '255'),
-    'deepskyblue2':         ('0', '178', '238'),
-    'deepskyblue3':         ('0', '154', '205'),
-    'deepskyblue4':         ('0', '104', '139'),
-    'skyblue1':             ('135', '206', '255'),
-    'skyblue2':             ('126', '192', '238'),
-    'skyblue3':             ('108', '166', '205'),
-    'skyblue4':             ('74', '112', '139'),
-    'lightskyblue1':        ('176', '226', '255'),
-    'lightskyblue2':        ('164', '211', '238'),
-    'lightskyblue3':        ('141', '182', '205'),
-    'lightskyblue4':        ('96', '123', '139'),
-    'slategray1':           ('198', '226', '255'),
-    'slategray2':           ('185', '211', '238'),
-    'slategray3':           ('159', '182', '205'),
-    'slategray4':           ('108', '123', '139'),
-    'lightsteelblue1':      ('202', '225', '255'),
-    'lightsteelblue2':      ('188', '210', '238'),
-    'lightsteelblue3':      ('162', '181', '205'),
-    'lightsteelblue4':      ('110', '123', '139'),
-    'lightblue1':           ('191', '239', '255'),
-    'lightblue2':           ('178', '223', '238'),
-    'lightblue3':           ('154', '192', '205'),
-    'lightblue4':           ('104', '131', '139'),
-    'lightcyan1':           ('224', '255', '255'),
-    'lightcyan2':           ('209', '238', '238'),
-    'lightcyan3':           ('180', '205', '205'),
-    'lightcyan4':           ('122', '139', '139'),
-    'paleturquoise1':       ('187', '255', '255'),
-    'paleturquoise2':       ('174', '238', '238'),
-    'paleturquoise3':       ('150', '205', '205'),
-    'paleturquoise4':       ('102', '139', '139'),
-    'cadetblue1':           ('152', '245', '255'),
-    'cadetblue2':           ('142', '229', '238'),
-    'cadetblue3':           ('122', '197', '205'),
-    'cadetblue4':           ('83', '134', '139'),
-    'turquoise1':           ('0', '245', '255'),
-    'turquoise2':           ('0', '229', '238'),
-    'turquoise3':           ('0', '197', '205'),
-    'turquoise4':           ('0', '134', '139'),
-    'cyan1':                ('0', '255', '255'),
-    'cyan2':                ('0', '238', '238'),
-    'cyan3':                ('0', '205', '205'),
-    'cyan4':                ('0', '139', '139'),
-    'darkslategray1':       ('151', '255', '255'),
-    'darkslategray2':       ('141', '238', '238'),
-    'darkslategray3':       ('121', '205', '205'),
-    'darkslategray4':       ('82', '139', '139'),
-    'aquamarine1':          ('127', '255', '212'),
-    'aquamarine2':          ('118', '238', '198'),
-    'aquamarine3':          ('102', '205', '170'),
-    'aquamarine4':          ('69', '139', '116'),
-    'darkseagreen1':        ('193', '255', '193'),
-    'darkseagreen2':        ('180', '238', '180'),
-    'darkseagreen3':        ('155', '205', '155'),
-    'darkseagreen4':        ('105', '139', '105'),
-    'seagreen1':            ('84', '255', '159'),
-    'seagreen2':            ('78', '238', '148'),
-    'seagreen3':            ('67', '205', '128'),
-    'seagreen4':            ('46', '139', '87'),
-    'palegreen1':           ('154', '255', '154'),
-    'palegreen2':           ('144', '238', '144'),
-    'palegreen3':           ('124', '205', '124'),
-    'palegreen4':           ('84', '139', '84'),
-    'springgreen1':         ('0', '255', '127'),
-    'springgreen2':         ('0', '238', '118'),
-    'springgreen3':         ('0', '205', '102'),
-    'springgreen4':         ('0', '139', '69'),
-    'green1':               ('0', '255', '0'),
-    'green2':               ('0', '238', '0'),
-    'green3':               ('0', '205', '0'),
-    'green4':               ('0', '139', '0'),
-    'chartreuse1':          ('127', '255', '0'),
-    'chartreuse2':          ('118', '238', '0'),
-    'chartreuse3':          ('102', '205', '0'),
-    'chartreuse4':          ('69', '139', '0'),
-    'olivedrab1':           ('192', '255', '62'),
-    'olivedrab2':           ('179', '238', '58'),
-    'olivedrab3':           ('154', '205', '50'),
-    'olivedrab4':           ('105', '139', '34'),
-    'darkolivegreen1':      ('202', '255', '112'),
-    'darkolivegreen2':      ('188', '238', '104'),
-    'darkolivegreen3':      ('162', '205', '90'),
-    'darkolivegreen4':      ('110', '139', '61'),
-    'khaki1':               ('255', '246', '143'),
-    'khaki2':               ('238', '230', '133'),
-    'khaki3':               ('205', '198', '115'),
-    'khaki4':               ('139', '134', '78'),
-    'lightgoldenrod1':      ('255', '236', '139'),
-    'lightgoldenrod2':      ('238', '220', '130'),
-    'lightgoldenrod3':      ('205', '190', '112'),
-    'lightgoldenrod4':      ('139', '129', '76'),
-    'lightyellow1':         ('255', '255', '224'),
-    'lightyellow2':         ('238', '238', '209'),
-    'lightyellow3':         ('205', '205', '180'),
-    'lightyellow4':         ('139', '139', '122'),
-    'yellow1':              ('255', '255', '0'),
-    'yellow2':              ('238', '238', '0'),
-    'yellow3':              ('205', '205', '0'),
-    'yellow4':              ('139', '139', '0'),
-    'gold1':                ('255', '215', '0'),
-    'gold2':                ('238', '201', '0'),
-    'gold3':                ('205', '173', '0'),
-    'gold4':                ('139', '117', '0'),
-    'goldenrod1':           ('255', '193', '37'),
-    'goldenrod2':           ('238', '180', '34'),
-    'goldenrod3':           ('205', '155', '29'),
-    'goldenrod4':           ('139', '105', '20'),
-    'darkgoldenrod1':       ('255', '185', '15'),
-    'darkgoldenrod2':       ('238', '173', '14'),
-    'darkgoldenrod3':       ('205', '149', '12'),
-    'darkgoldenrod4':       ('139', '101', '8'),
-    'rosybrown1':           ('255', '193', '193'),
-    'rosybrown2':           ('238', '180', '180'),
-    'rosybrown3':           ('205', '155', '155'),
-    'rosybrown4':           ('139', '105', '105'),
-    'indianred1':           ('255', '106', '106'),
-    'indianred2':           ('238', '99', '99'),
-    'indianred3':           ('205', '85', '85'),
-    'indianred4':           ('139', '58', '58'),
-    'sienna1':              ('255', '130', '71'),
-    'sienna2':              ('238', '121', '66'),
-    'sienna3':              ('205', '104', '57'),
-    'sienna4':              ('139', '71', '38'),
-    'burlywood1':           ('255', '211', '155'),
-    'burlywood2':           ('238', '197', '145'),
-    'burlywood3':           ('205', '170', '125'),
-    'burlywood4':           ('139', '115', '85'),
-    'wheat1':               ('255', '231', '186'),
-    'wheat2':               ('238', '216', '174'),
-    'wheat3':               ('205', '186', '150'),
-    'wheat4':               ('139', '126', '102'),
-    'tan1':                 ('255', '165', '79'),
-    'tan2':                 ('238', '154', '73'),
-    'tan3':                 ('205', '133', '63'),
-    'tan4':                 ('139', '90', '43'),
-    'chocolate1':           ('255', '127', '36'),
-    'chocolate2':           ('238', '118', '33'),
-    'chocolate3':           ('205', '102', '29'),
-    'chocolate4':           ('139', '69', '19'),
-    'firebrick1':           ('255', '48', '48'),
-    'firebrick2':           ('238', '44', '44'),
-    'firebrick3':           ('205', '38', '38'),
-    'firebrick4':           ('139', '26', '26'),
-    'brown1':               ('255', '64', '64'),
-    'brown2':               ('238', '59', '59'),
-    'brown3':               ('205', '51', '51'),
-    'brown4':               ('139', '35', '35'),
-    'salmon1':              ('255', '140', '105'),
-    'salmon2':              ('238', '130', '98'),
-    'salmon3':              ('205', '112', '84'),
-    'salmon4':              ('139', '76', '57'),
-    'lightsalmon1':         ('255', '160', '122'),
-    'lightsalmon2':         ('238', '149', '114'),
-    'lightsalmon3':         ('205', '129', '98'),
-    'lightsalmon4':         ('139', '87', '66'),
-    'orange1':              ('255', '165', '0'),
-    'orange2':              ('238', '154', '0'),
-    'orange3':              ('205', '133', '0'),
-    'orange4':              ('139', '90', '0'),
-    'darkorange1':          ('255', '127', '0'),
-    'darkorange2':          ('238', '118', '0'),
-    'darkorange3':          ('205', '102', '0'),
-    'darkorange4':          ('139', '69', '0'),
-    'coral1':               ('255', '114', '86'),
-    'coral2':               ('238', '106', '80'),
-    'coral3':               ('205', '91', '69'),
-    'coral4':               ('139', '62', '47'),
-    'tomato1':              ('255', '99', '71'),
-    'tomato2':              ('238', '92', '66'),
-    'tomato3':              ('205', '79', '57'),
-    'tomato4':              ('139', '54', '38'),
-    'orangered1':           ('255', '69', '0'),
-    'orangered2':           ('238', '64', '0'),
-    'orangered3':           ('205', '55', '0'),
-    'orangered4':           ('139', '37', '0'),
-    'red1':                 ('255', '0', '0'),
-    'red2':                 ('238', '0', '0'),
-    'red3':                 ('205', '0', '0'),
-    'red4':                 ('139', '0', '0'),
-    'debianred':            ('215', '7', '81'),
-    'deeppink1':            ('255', '20', '147'),
-    'deeppink2':            ('238', '18', '137'),
-    'deeppink3':            ('205', '16', '118'),
-    'deeppink4':            ('139', '10', '80'),
-    'hotpink1':             ('255', '110', '180'),
-    'hotpink2':             ('238', '106', '167'),
-    'hotpink3':             ('205', '96', '144'),
-    'hotpink4':             ('139', '58', '98'),
-    'pink1':                ('255', '181', '197'),
-    'pink2':                ('238', '169', '184'),
-    'pink3':                ('205', '145', '158'),
-    'pink4':                ('139', '99', '108'),
-    'lightpink1':           ('255', '174', '185'),
-    'lightpink2':           ('238', '162', '173'),
-    'lightpink3':           ('205', '140', '149'),
-    'lightpink4':           ('139', '95', '101'),
-    'palevioletred1':       ('255', '130', '171'),
-    'palevioletred2':       ('238', '121', '159'),
-    'palevioletred3':       ('205', '104', '137'),
-    'palevioletred4':       ('139', '71', '93'),
-    'maroon1':              ('255', '52', '179'),
-    'maroon2':              ('238', '48', '167'),
-    'maroon3':              ('205', '41', '144'),
-    'maroon4':              ('139', '28', '98'),
-    'violetred1':           ('255', '62', '150'),
-    'violetred2':           ('238', '58', '140'),
-    'violetred3':           ('205', '50', '120'),
-    'violetred4':           ('139', '34', '82'),
-    'magenta1':             ('255', '0', '255'),
-    'magenta2':             ('238', '0', '238'),
-    'magenta3':             ('205', '0', '205'),
-    'magenta4':             ('139', '0', '139'),
-    'orchid1':              ('255', '131', '250'),
-    'orchid2':              ('238', '122', '233'),
-    'orchid3':              ('205', '105', '201'),
-    'orchid4':              ('139', '71', '137'),
-    'plum1':                ('255', '187', '255'),
-    'plum2':                ('238', '174', '238'),
-    'plum3':                ('205', '150', '205'),
-    'plum4':                ('139', '102', '139'),
-    'mediumorchid1':        ('224', '102', '255'),
-    'mediumorchid2':        ('209', '95', '238'),
-    'mediumorchid3':        ('180', '82', '205'),
-    'mediumorchid4':        ('122', '55', '139'),
-    'darkorchid1':          ('191', '62', '255'),
-    'darkorchid2':          ('178', '58', '238'),
-    'darkorchid3':          ('154', '50', '205'),
-    'darkorchid4':          ('104', '34', '139'),
-    'purple1':              ('155', '48', '255'),
-    'purple2':              ('145', '44', '238'),
-    'purple3':              ('125', '38', '205'),
-    'purple4':              ('85', '26', '139'),
-    'mediumpurple1':        ('171', '130', '255'),
-    'mediumpurple2':        ('159', '121', '238'),
-    'mediumpurple3':        ('137', '104', '205'),
-    'mediumpurple4':        ('93', '71', '139'),
-    'thistle1':             ('255', '225', '255'),
-    'thistle2':             ('238', '210', '238'),
-    'thistle3':             ('205', '181', '205'),
-    'thistle4':             ('139', '123', '139'),
-    'gray0':                ('0', '0', '0'),
-    'grey0':                ('0', '0', '0'),
-    'gray1':                ('3', '3', '3'),
-    'grey1':                ('3', '3', '3'),
-    'gray2':                ('5', '5', '5'),
-    'grey2':                ('5', '5', '5'),
-    'gray3':                ('8', '8', '8'),
-    'grey3':                ('8', '8', '8'),
-    'gray4':                ('10', '10', '10'),
-    'grey4':                ('10', '10', '10'),
-    'gray5':                ('13', '13', '13'),
-    'grey5':                ('13', '13', '13'),
-    'gray6':                ('15', '15', '15'),
-    'grey6':                ('15', '15', '15'),
-    'gray7':                ('18', '18', '18'),
-    'grey7':                ('18', '18', '18'),
-    'gray8':                ('20', '20', '20'),
-    'grey8':                ('20', '20', '20'),
-    'gray9':                ('23', '23', '23'),
-    'grey9':                ('23', '23', '23'),
-    'gray10':               ('26', '26', '26'),
-    'grey10':               ('26', '26', '26'),
-    'gray11':               ('28', '28', '28'),
-    'grey11':               ('28', '28', '28'),
-    'gray12':               ('31', '31', '31'),
-    'grey12':               ('31', '31', '31'),
-    'gray13':               ('33', '33', '33'),
-    'grey13':               ('33', '33', '33'),
-    'gray14':               ('36', '36', '36'),
-    'grey14':               ('36', '36', '36'),
-    'gray15':               ('38', '38', '38'),
-    'grey15':               ('38', '38', '38'),
-    'gray16':               ('41', '41', '41'),
-    'grey16':               ('41', '41', '41'),
-    'gray17':               ('43', '43', '43'),
-    'grey17':               ('43', '43', '43'),
-    'gray18':               ('46', '46', '46'),
-    'grey18':               ('46', '46', '46'),
-    'gray19':               ('48', '48', '48'),
-    'grey19':               ('48', '48', '48'),
-    'gray20':               ('51', '51', '51'),
-    'grey20':               ('51', '51', '51'),
-    'gray21':               ('54', '54', '54'),
-    'grey21':               ('54', '54', '54'),
-    'gray22':               ('56', '56', '56'),
-    'grey22':               ('56', '56', '56'),
-    'gray23':               ('59', '59', '59'),
-    'grey23':               ('59', '59', '59'),
-    'gray24':               ('61', '61', '61'),
-    'grey24':               ('61', '61', '61'),
-    'gray25':               ('64', '64', '64'),
-    'grey25':               ('64', '64', '64'),
-    'gray26':               ('66', '66', '66'),
-    'grey26':               ('66', '66', '66'),
-    'gray27':               ('69', '69', '69'),
-    'grey27':               ('69', '69', '69'),
-    'gray28':               ('71', '71', '71'),
-    'grey28':               ('71', '71', '71'),
-    'gray29':               ('74', '74', '74'),
-    'grey29':               ('74', '74', '74'),
-    'gray30':               ('77', '77', '77'),
-    'grey30':               ('77', '77', '77'),
-    'gray31':               ('79', '79', '79'),
-    'grey31':               ('79', '79', '79'),
-    'gray32':               ('82', '82', '82'),
-    'grey32':               ('82', '82', '82'),
-    'gray33':               ('84', '84', '84'),
-    'grey33':               ('84', '84', '84'),
-    'gray34':               ('87', '87', '87'),
-    'grey34':               ('87', '87', '87'),
-    'gray35':               ('89', '89', '89'),
-    'grey35':               ('89', '89', '89'),
-    'gray36':               ('92', '92', '92'),
-    'grey36':               ('92', '92', '92'),
-    'gray37':               ('94', '94', '94'),
-    'grey37':               ('94', '94', '94'),
-    'gray38':               ('97', '97', '97'),
-    'grey38':               ('97', '97', '97'),
-    'gray39':               ('99', '99', '99'),
-    'grey39':               ('99', '99', '99'),
-    'gray40':               ('102', '102', '102'),
-    'grey40':               ('102', '102', '102'),
-    'gray41':               ('105', '105', '105'),
-    'grey41':               ('105', '105', '105'),
-    'gray42':               ('107', '107', '107'),
-    'grey42':               ('107', '107', '107'),
-    'gray43':               ('110', '110', '110'),
-    'grey43':               ('110', '110', '110'),
-    'gray44':               ('112', '112', '112'),
-    'grey44':               ('112', '112', '112'),
-    'gray45':               ('115', '115', '115'),
-    'grey45':               ('115', '115', '115'),
-    'gray46':               ('117', '117', '117'),
-    'grey46':               ('117', '117', '117'),
-    'gray47':               ('120', '120', '120'),
-    'grey47':               ('120', '120', '120'),
-    'gray48':               ('122', '122', '122'),
-    'grey48':               ('122', '122', '122'),
-    'gray49':               ('125', '125', '125'),
-    'grey49':               ('125', '125', '125'),
-    'gray50':               ('127', '127', '127'),
-    'grey50':               ('127', '127', '127'),
-    'gray51':               ('130', '130', '130'),
-    'grey51':               ('130', '130', '130'),
-    'gray52':               ('133', '133', '133'),
-    'grey52':               ('133', '133', '133'),
-    'gray53':               ('135', '135', '135'),
-    'grey53':               ('135', '135', '135'),
-    'gray54':               ('138', '138', '138'),
-    'grey54':               ('138', '138', '138'),
-    'gray55':               ('140', '140', '140'),
-    'grey55':               ('140', '140', '140'),
-    'gray56':               ('143', '143', '143'),
-    'grey56':               ('143', '143', '143'),
-    'gray57':               ('145', '145', '145'),
-    'grey57':               ('145', '145', '145'),
-    'gray58':               ('148', '148', '148'),
-    'grey58':               ('148', '148', '148'),
-    'gray59':               ('150', '150', '150'),
-    'grey59':               ('150', '150', '150'),
-    'gray60':               ('153', '153', '153'),
-    'grey60':               ('153', '153', '153'),
-    'gray61':               ('156', '156', '156'),
-    'grey61':               ('156', '156', '156'),
-    'gray62':               ('158', '158', '158'),
-    'grey62':               ('158', '158', '158'),
-    'gray63':               ('161', '161', '161'),
-    'grey63':               ('161', '161', '161'),
-    'gray64':               ('163', '163', '163'),
-    'grey64':               ('163', '163', '163'),
-    'gray65':               ('166', '166', '166'),
-    'grey65':               ('166', '166', '166'),
-    'gray66':               ('168', '168', '168'),
-    'grey66':               ('168', '168', '168'),
-    'gray67':               ('171', '171', '171'),
-    'grey67':               ('171', '171', '171'),
-    'gray68':               ('173', '173', '173'),
-    'grey68':               ('173', '173', '173'),
-    'gray69':               ('176', '176', '176'),
-    'grey69':               ('176', '176', '176'),
-    'gray70':               ('179', '179', '179'),
-    'grey70':               ('179', '179', '179'),
-    'gray71':               ('181', '181', '181'),
-    'grey71':               ('181', '181', '181'),
-    'gray72':               ('184', '184', '184'),
-    'grey72':               ('184', '184', '184'),
-    'gray73':               ('186', '186', '186'),
-    'grey73':               ('186', '186', '186'),
-    'gray74':               ('189', '189', '189'),
-    'grey74':               ('189', '189', '189'),
-    'gray75':               ('191', '191', '191'),
-    'grey75':               ('191', '191', '191'),
-    'gray76':               ('194', '194', '194'),
-    'grey76':               ('194', '194', '194'),
-    'gray77':               ('196', '196', '196'),
-    'grey77':               ('196', '196', '196'),
-    'gray78':               ('199', '199', '199'),
-    'grey78':               ('199', '199', '199'),
-    'gray79':               ('201', '201', '201'),
-    'grey79':               ('201', '201', '201'),
-    'gray80':               ('204', '204', '204'),
-    'grey80':               ('204', '204', '204'),
-    'gray81':               ('207', '207', '207'),
-    'grey81':               ('207', '207', '207'),
-    'gray82':               ('209', '209', '209'),
-    'grey82':               ('209', '209', '209'),
-    'gray83':               ('212', '212', '212'),
-    'grey83':               ('212', '212', '212'),
-    'gray84':               ('214', '214', '214'),
-    'grey84':               ('214', '214', '214'),
-    'gray85':               ('217', '217', '217'),
-    'grey85':               ('217', '217', '217'),
-    'gray86':               ('219', '219', '219'),
-    'grey86':               ('219', '219', '219'),
-    'gray87':               ('222', '222', '222'),
-    'grey87':               ('222', '222', '222'),
-    'gray88':               ('224', '224', '224'),
-    'grey88':               ('224', '224', '224'),
-    'gray89':               ('227', '227', '227'),
-    'grey89':               ('227', '227', '227'),
-    'gray90':               ('229', '229', '229'),
-    'grey90':               ('229', '229', '229'),
-    'gray91':               ('232', '232', '232'),
-    'grey91':               ('232', '232', '232'),
-    'gray92':               ('235', '235', '235'),
-    'grey92':               ('235', '235', '235'),
-    'gray93':               ('237', '237', '237'),
-    'grey93':               ('237', '237', '237'),
-    'gray94':               ('240', '240', '240'),
-    'grey94':               ('240', '240', '240'),
-    'gray95':               ('242', '242', '242'),
-    'grey95':               ('242', '242', '242'),
-    'gray96':               ('245', '245', '245'),
-    'grey96':               ('245', '245', '245'),
-    'gray97':               ('247', '247', '247'),
-    'grey97':               ('247', '247', '247'),
-    'gray98':               ('250', '250', '250'),
-    'grey98':               ('250', '250', '250'),
-    'gray99':               ('252', '252', '252'),
-    'grey99':               ('252', '252', '252'),
-    'gray100':              ('255', '255', '255'),
-    'grey100':              ('255', '255', '255'),
-    'darkgrey':             ('169', '169', '169'),
-    'darkgray':             ('169', '169', '169'),
-    'darkblue':             ('0', '0', '139'),
-    'darkcyan':             ('0', '139', '139'),
-    'darkmagenta':          ('139', '0', '139'),
-    'darkred':              ('139', '0', '0'),
-    'lightgreen':           ('144', '238', '144'),
-}
+NAME_WIDTH = 20
+RECORD_WIDTH = NAME_WIDTH + 3  # r, g, b bytes
+
+x11_colors = (
+    b'aliceblue           \xf0\xf8\xff'
+    b'antiquewhite        \xfa\xeb\xd7'
+    b'antiquewhite1       \xff\xef\xdb'
+    b'antiquewhite2       \xee\xdf\xcc'
+    b'antiquewhite3       \xcd\xc0\xb0'
+    b'antiquewhite4       \x8b\x83\x78'
+    b'aquamarine          \x7f\xff\xd4'
+    b'aquamarine1         \x7f\xff\xd4'
+    b'aquamarine2         \x76\xee\xc6'
+    b'aquamarine3         \x66\xcd\xaa'
+    b'aquamarine4         \x45\x8b\x74'
+    b'azure               \xf0\xff\xff'
+    b'azure1              \xf0\xff\xff'
+    b'azure2              \xe0\xee\xee'
+    b'azure3              \xc1\xcd\xcd'
+    b'azure4              \x83\x8b\x8b'
+    b'beige               \xf5\xf5\xdc'
+    b'bisque              \xff\xe4\xc4'
+    b'bisque1             \xff\xe4\xc4'
+    b'bisque2             \xee\xd5\xb7'
+    b'bisque3             \xcd\xb7\x9e'
+    b'bisque4             \x8b\x7d\x6b'
+    b'black               \x00\x00\x00'
+    b'blanchedalmond      \xff\xeb\xcd'
+    b'blue                \x00\x00\xff'
+    b'blue1               \x00\x00\xff'
+    b'blue2               \x00\x00\xee'
+    b'blue3               \x00\x00\xcd'
+    b'blue4               \x00\x00\x8b'
+    b'blueviolet          \x8a\x2b\xe2'
+    b'brown               \xa5\x2a\x2a'
+    b'brown1              \xff\x40\x40'
+    b'brown2              \xee\x3b\x3b'
+    b'brown3              \xcd\x33\x33'
+    b'brown4              \x8b\x23\x23'
+    b'burlywood           \xde\xb8\x87'
+    b'burlywood1          \xff\xd3\x9b'
+    b'burlywood2          \xee\xc5\x91'
+    b'burlywood3          \xcd\xaa\x7d'
+    b'burlywood4          \x8b\x73\x55'
+    b'cadetblue           \x5f\x9e\xa0'
+    b'cadetblue1          \x98\xf5\xff'
+    b'cadetblue2          \x8e\xe5\xee'
+    b'cadetblue3          \x7a\xc5\xcd'
+    b'cadetblue4          \x53\x86\x8b'
+    b'chartreuse          \x7f\xff\x00'
+    b'chartreuse1         \x7f\xff\x00'
+    b'chartreuse2         \x76\xee\x00'
+    b'chartreuse3         \x66\xcd\x00'
+    b'chartreuse4         \x45\x8b\x00'
+    b'chocolate           \xd2\x69\x1e'
+    b'chocolate1          \xff\x7f\x24'
+    b'chocolate2          \xee\x76\x21'
+    b'chocolate3          \xcd\x66\x1d'
+    b'chocolate4          \x8b\x45\x13'
+    b'coral               \xff\x7f\x50'
+    b'coral1              \xff\x72\x56'
+    b'coral2              \xee\x6a\x50'
+    b'coral3              \xcd\x5b\x45'
+    b'coral4              \x8b\x3e\x2f'
+    b'cornflowerblue      \x64\x95\xed'
+    b'cornsilk            \xff\xf8\xdc'
+    b'cornsilk1           \xff\xf8\xdc'
+    b'cornsilk2           \xee\xe8\xcd'
+    b'cornsilk3           \xcd\xc8\xb1'
+    b'cornsilk4           \x8b\x88\x78'
+    b'cyan                \x00\xff\xff'
+    b'cyan1               \x00\xff\xff'
+    b'cyan2               \x00\xee\xee'
+    b'cyan3               \x00\xcd\xcd'
+    b'cyan4               \x00\x8b\x8b'
+    b'darkblue            \x00\x00\x8b'
+    b'darkcyan            \x00\x8b\x8b'
+    b'darkgoldenrod       \xb8\x86\x0b'
+    b'darkgoldenrod1      \xff\xb9\x0f'
+    b'darkgoldenrod2      \xee\xad\x0e'
+    b'darkgoldenrod3      \xcd\x95\x0c'
+    b'darkgoldenrod4      \x8b\x65\x08'
+    b'darkgray            \xa9\xa9\xa9'
+    b'darkgreen           \x00\x64\x00'
+    b'darkgrey            \xa9\xa9\xa9'
+    b'darkkhaki           \xbd\xb7\x6b'
+    b'darkmagenta         \x8b\x00\x8b'
+    b'darkolivegreen      \x55\x6b\x2f'
+    b'darkolivegreen1     \xca\xff\x70'
+    b'darkolivegreen2     \xbc\xee\x68'
+    b'darkolivegreen3     \xa2\xcd\x5a'
+    b'darkolivegreen4     \x6e\x8b\x3d'
+    b'darkorange          \xff\x8c\x00'
+    b'darkorange1         \xff\x7f\x00'
+    b'darkorange2         \xee\x76\x00'
+    b'darkorange3         \xcd\x66\x00'
+    b'darkorange4         \x8b\x45\x00'
+    b'darkorchid          \x99\x32\xcc'
+    b'darkorchid1         \xbf\x3e\xff'
+    b'darkorchid2         \xb2\x3a\xee'
+    b'darkorchid3         \x9a\x32\xcd'
+    b'darkorchid4         \x68\x22\x8b'
+    b'darkred             \x8b\x00\x00'
+    b'darksalmon          \xe9\x96\x7a'
+    b'darkseagreen        \x8f\xbc\x8f'
+    b'darkseagreen1       \xc1\xff\xc1'
+    b'darkseagreen2       \xb4\xee\xb4'
+    b'darkseagreen3       \x9b\xcd\x9b'
+    b'darkseagreen4       \x69\x8b\x69'
+    b'darkslateblue       \x48\x3d\x8b'
+    b'darkslategray       \x2f\x4f\x4f'
+    b'darkslategray1      \x97\xff\xff'
+    b'darkslategray2      \x8d\xee\xee'
+    b'darkslategray3      \x79\xcd\xcd'
+    b'darkslategray4      \x52\x8b\x8b'
+    b'darkslategrey       \x2f\x4f\x4f'
+    b'darkturquoise       \x00\xce\xd1'
+    b'darkviolet          \x94\x00\xd3'
+    b'debianred           \xd7\x07\x51'
+    b'deeppink            \xff\x14\x93'
+    b'deeppink1           \xff\x14\x93'
+    b'deeppink2           \xee\x12\x89'
+    b'deeppink3           \xcd\x10\x76'
+    b'deeppink4           \x8b\x0a\x50'
+    b'deepskyblue         \x00\xbf\xff'
+    b'deepskyblue1        \x00\xbf\xff'
+    b'deepskyblue2        \x00\xb2\xee'
+    b'deepskyblue3        \x00\x9a\xcd'
+    b'deepskyblue4        \x00\x68\x8b'
+    b'dimgray             \x69\x69\x69'
+    b'dimgrey             \x69\x69\x69'
+    b'dodgerblue          \x1e\x90\xff'
+    b'dodgerblue1         \x1e\x90\xff'
+    b'dodgerblue2         \x1c\x86\xee'
+    b'dodgerblue3         \x18\x74\xcd'
+    b'dodgerblue4         \x10\x4e\x8b'
+    b'firebrick           \xb2\x22\x22'
+    b'firebrick1          \xff\x30\x30'
+    b'firebrick2          \xee\x2c\x2c'
+    b'firebrick3          \xcd\x26\x26'
+    b'firebrick4          \x8b\x1a\x1a'
+    b'floralwhite         \xff\xfa\xf0'
+    b'forestgreen         \x22\x8b\x22'
+    b'gainsboro           \xdc\xdc\xdc'
+    b'ghostwhite          \xf8\xf8\xff'
+    b'gold                \xff\xd7\x00'
+    b'gold1               \xff\xd7\x00'
+    b'gold2               \xee\xc9\x00'
+    b'gold3               \xcd\xad\x00'
+    b'gold4               \x8b\x75\x00'
+    b'goldenrod           \xda\xa5\x20'
+    b'goldenrod1          \xff\xc1\x25'
+    b'goldenrod2          \xee\xb4\x22'
+    b'goldenrod3          \xcd\x9b\x1d'
+    b'goldenrod4          \x8b\x69\x14'
+    b'gray                \xbe\xbe\xbe'
+    b'gray0               \x00\x00\x00'
+    b'gray1               \x03\x03\x03'
+    b'gray10              \x1a\x1a\x1a'
+    b'gray100             \xff\xff\xff'
+    b'gray11              \x1c\x1c\x1c'
+    b'gray12              \x1f\x1f\x1f'
+    b'gray13              \x21\x21\x21'
+    b'gray14              \x24\x24\x24'
+    b'gray15              \x26\x26\x26'
+    b'gray16              \x29\x29\x29'
+    b'gray17              \x2b\x2b\x2b'
+    b'gray18              \x2e\x2e\x2e'
+    b'gray19              \x30\x30\x30'
+    b'gray2               \x05\x05\x05'
+    b'gray20              \x33\x33\x33'
+    b'gray21              \x36\x36\x36'
+    b'gray22              \x38\x38\x38'
+    b'gray23              \x3b\x3b\x3b'
+    b'gray24              \x3d\x3d\x3d'
+    b'gray25              \x40\x40\x40'
+    b'gray26              \x42\x42\x42'
+    b'gray27              \x45\x45\x45'
+    b'gray28              \x47\x47\x47'
+    b'gray29              \x4a\x4a\x4a'
+    b'gray3               \x08\x08\x08'
+    b'gray30              \x4d\x4d\x4d'
+    b'gray31              \x4f\x4f\x4f'
+    b'gray32              \x52\x52\x52'
+    b'gray33              \x54\x54\x54'
+    b'gray34              \x57\x57\x57'
+    b'gray35              \x59\x59\x59'
+    b'gray36              \x5c\x5c\x5c'
+    b'gray37              \x5e\x5e\x5e'
+    b'gray38              \x61\x61\x61'
+    b'gray39              \x63\x63\x63'
+    b'gray4               \x0a\x0a\x0a'
+    b'gray40              \x66\x66\x66'
+    b'gray41              \x69\x69\x69'
+    b'gray42              \x6b\x6b\x6b'
+    b'gray43              \x6e\x6e\x6e'
+    b'gray44              \x70\x70\x70'
+    b'gray45              \x73\x73\x73'
+    b'gray46              \x75\x75\x75'
+    b'gray47              \x78\x78\x78'
+    b'gray48              \x7a\x7a\x7a'
+    b'gray49              \x7d\x7d\x7d'
+    b'gray5               \x0d\x0d\x0d'
+    b'gray50              \x7f\x7f\x7f'
+    b'gray51              \x82\x82\x82'
+    b'gray52              \x85\x85\x85'
+    b'gray53              \x87\x87\x87'
+    b'gray54              \x8a\x8a\x8a'
+    b'gray55              \x8c\x8c\x8c'
+    b'gray56              \x8f\x8f\x8f'
+    b'gray57              \x91\x91\x91'
+    b'gray58              \x94\x94\x94'
+    b'gray59              \x96\x96\x96'
+    b'gray6               \x0f\x0f\x0f'
+    b'gray60              \x99\x99\x99'
+    b'gray61              \x9c\x9c\x9c'
+    b'gray62              \x9e\x9e\x9e'
+    b'gray63              \xa1\xa1\xa1'
+    b'gray64              \xa3\xa3\xa3'
+    b'gray65              \xa6\xa6\xa6'
+    b'gray66              \xa8\xa8\xa8'
+    b'gray67              \xab\xab\xab'
+    b'gray68              \xad\xad\xad'
+    b'gray69              \xb0\xb0\xb0'
+    b'gray7               \x12\x12\x12'
+    b'gray70              \xb3\xb3\xb3'
+    b'gray71              \xb5\xb5\xb5'
+    b'gray72              \xb8\xb8\xb8'
+    b'gray73              \xba\xba\xba'
+    b'gray74              \xbd\xbd\xbd'
+    b'gray75              \xbf\xbf\xbf'
+    b'gray76              \xc2\xc2\xc2'
+    b'gray77              \xc4\xc4\xc4'
+    b'gray78              \xc7\xc7\xc7'
+    b'gray79              \xc9\xc9\xc9'
+    b'gray8               \x14\x14\x14'
+    b'gray80              \xcc\xcc\xcc'
+    b'gray81              \xcf\xcf\xcf'
+    b'gray82              \xd1\xd1\xd1'
+    b'gray83              \xd4\xd4\xd4'
+    b'gray84              \xd6\xd6\xd6'
+    b'gray85              \xd9\xd9\xd9'
+    b'gray86              \xdb\xdb\xdb'
+    b'gray87              \xde\xde\xde'
+    b'gray88              \xe0\xe0\xe0'
+    b'gray89              \xe3\xe3\xe3'
+    b'gray9               \x17\x17\x17'
+    b'gray90              \xe5\xe5\xe5'
+    b'gray91              \xe8\xe8\xe8'
+    b'gray92              \xeb\xeb\xeb'
+    b'gray93              \xed\xed\xed'
+    b'gray94              \xf0\xf0\xf0'
+    b'gray95              \xf2\xf2\xf2'
+    b'gray96              \xf5\xf5\xf5'
+    b'gray97              \xf7\xf7\xf7'
+    b'gray98              \xfa\xfa\xfa'
+    b'gray99              \xfc\xfc\xfc'
+    b'green               \x00\xff\x00'
+    b'green1              \x00\xff\x00'
+    b'green2              \x00\xee\x00'
+    b'green3              \x00\xcd\x00'
+    b'green4              \x00\x8b\x00'
+    b'greenyellow         \xad\xff\x2f'
+    b'grey                \xbe\xbe\xbe'
+    b'grey0               \x00\x00\x00'
+    b'grey1               \x03\x03\x03'
+    b'grey10              \x1a\x1a\x1a'
+    b'grey100             \xff\xff\xff'
+    b'grey11              \x1c\x1c\x1c'
+    b'grey12              \x1f\x1f\x1f'
+    b'grey13              \x21\x21\x21'
+    b'grey14              \x24\x24\x24'
+    b'grey15              \x26\x26\x26'
+    b'grey16              \x29\x29\x29'
+    b'grey17              \x2b\x2b\x2b'
+    b'grey18              \x2e\x2e\x2e'
+    b'grey19              \x30\x30\x30'
+    b'grey2               \x05\x05\x05'
+    b'grey20              \x33\x33\x33'
+    b'grey21              \x36\x36\x36'
+    b'grey22              \x38\x38\x38'
+    b'grey23              \x3b\x3b\x3b'
+    b'grey24              \x3d\x3d\x3d'
+    b'grey25              \x40\x40\x40'
+    b'grey26              \x42\x42\x42'
+    b'grey27              \x45\x45\x45'
+    b'grey28              \x47\x47\x47'
+    b'grey29              \x4a\x4a\x4a'
+    b'grey3               \x08\x08\x08'
+    b'grey30              \x4d\x4d\x4d'
+    b'grey31              \x4f\x4f\x4f'
+    b'grey32              \x52\x52\x52'
+    b'grey33              \x54\x54\x54'
+    b'grey34              \x57\x57\x57'
+    b'grey35              \x59\x59\x59'
+    b'grey36              \x5c\x5c\x5c'
+    b'grey37              \x5e\x5e\x5e'
+    b'grey38              \x61\x61\x61'
+    b'grey39              \x63\x63\x63'
+    b'grey4               \x0a\x0a\x0a'
+    b'grey40              \x66\x66\x66'
+    b'grey41              \x69\x69\x69'
+    b'grey42              \x6b\x6b\x6b'
+    b'grey43              \x6e\x6e\x6e'
+    b'grey44              \x70\x70\x70'
+    b'grey45              \x73\x73\x73'
+    b'grey46              \x75\x75\x75'
+    b'grey47              \x78\x78\x78'
+    b'grey48              \x7a\x7a\x7a'
+    b'grey49              \x7d\x7d\x7d'
+    b'grey5               \x0d\x0d\x0d'
+    b'grey50              \x7f\x7f\x7f'
+    b'grey51              \x82\x82\x82'
+    b'grey52              \x85\x85\x85'
+    b'grey53              \x87\x87\x87'
+    b'grey54              \x8a\x8a\x8a'
+    b'grey55              \x8c\x8c\x8c'
+    b'grey56              \x8f\x8f\x8f'
+    b'grey57              \x91\x91\x91'
+    b'grey58              \x94\x94\x94'
+    b'grey59              \x96\x96\x96'
+    b'grey6               \x0f\x0f\x0f'
+    b'grey60              \x99\x99\x99'
+    b'grey61              \x9c\x9c\x9c'
+    b'grey62              \x9e\x9e\x9e'
+    b'grey63              \xa1\xa1\xa1'
+    b'grey64              \xa3\xa3\xa3'
+    b'grey65              \xa6\xa6\xa6'
+    b'grey66              \xa8\xa8\xa8'
+    b'grey67              \xab\xab\xab'
+    b'grey68              \xad\xad\xad'
+    b'grey69              \xb0\xb0\xb0'
+    b'grey7               \x12\x12\x12'
+    b'grey70              \xb3\xb3\xb3'
+    b'grey71              \xb5\xb5\xb5'
+    b'grey72              \xb8\xb8\xb8'
+    b'grey73              \xba\xba\xba'
+    b'grey74              \xbd\xbd\xbd'
+    b'grey75              \xbf\xbf\xbf'
+    b'grey76              \xc2\xc2\xc2'
+    b'grey77              \xc4\xc4\xc4'
+    b'grey78              \xc7\xc7\xc7'
+    b'grey79              \xc9\xc9\xc9'
+    b'grey8               \x14\x14\x14'
+    b'grey80              \xcc\xcc\xcc'
+    b'grey81              \xcf\xcf\xcf'
+    b'grey82              \xd1\xd1\xd1'
+    b'grey83              \xd4\xd4\xd4'
+    b'grey84              \xd6\xd6\xd6'
+    b'grey85              \xd9\xd9\xd9'
+    b'grey86              \xdb\xdb\xdb'
+    b'grey87              \xde\xde\xde'
+    b'grey88              \xe0\xe0\xe0'
+    b'grey89              \xe3\xe3\xe3'
+    b'grey9               \x17\x17\x17'
+    b'grey90              \xe5\xe5\xe5'
+    b'grey91              \xe8\xe8\xe8'
+    b'grey92              \xeb\xeb\xeb'
+    b'grey93              \xed\xed\xed'
+    b'grey94              \xf0\xf0\xf0'
+    b'grey95              \xf2\xf2\xf2'
+    b'grey96              \xf5\xf5\xf5'
+    b'grey97              \xf7\xf7\xf7'
+    b'grey98              \xfa\xfa\xfa'
+    b'grey99              \xfc\xfc\xfc'
+    b'honeydew            \xf0\xff\xf0'
+    b'honeydew1           \xf0\xff\xf0'
+    b'honeydew2           \xe0\xee\xe0'
+    b'honeydew3           \xc1\xcd\xc1'
+    b'honeydew4           \x83\x8b\x83'
+    b'hotpink             \xff\x69\xb4'
+    b'hotpink1            \xff\x6e\xb4'
+    b'hotpink2            \xee\x6a\xa7'
+    b'hotpink3            \xcd\x60\x90'
+    b'hotpink4            \x8b\x3a\x62'
+    b'indianred           \xcd\x5c\x5c'
+    b'indianred1          \xff\x6a\x6a'
+    b'indianred2          \xee\x63\x63'
+    b'indianred3          \xcd\x55\x55'
+    b'indianred4          \x8b\x3a\x3a'
+    b'ivory               \xff\xff\xf0'
+    b'ivory1              \xff\xff\xf0'
+    b'ivory2              \xee\xee\xe0'
+    b'ivory3              \xcd\xcd\xc1'
+    b'ivory4              \x8b\x8b\x83'
+    b'khaki               \xf0\xe6\x8c'
+    b'khaki1              \xff\xf6\x8f'
+    b'khaki2              \xee\xe6\x85'
+    b'khaki3              \xcd\xc6\x73'
+    b'khaki4              \x8b\x86\x4e'
+    b'lavender            \xe6\xe6\xfa'
+    b'lavenderblush       \xff\xf0\xf5'
+    b'lavenderblush1      \xff\xf0\xf5'
+    b'lavenderblush2      \xee\xe0\xe5'
+    b'lavenderblush3      \xcd\xc1\xc5'
+    b'lavenderblush4      \x8b\x83\x86'
+    b'lawngreen           \x7c\xfc\x00'
+    b'lemonchiffon        \xff\xfa\xcd'
+    b'lemonchiffon1       \xff\xfa\xcd'
+    b'lemonchiffon2       \xee\xe9\xbf'
+    b'lemonchiffon3       \xcd\xc9\xa5'
+    b'lemonchiffon4       \x8b\x89\x70'
+    b'lightblue           \xad\xd8\xe6'
+    b'lightblue1          \xbf\xef\xff'
+    b'lightblue2          \xb2\xdf\xee'
+    b'lightblue3          \x9a\xc0\xcd'
+    b'lightblue4          \x68\x83\x8b'
+    b'lightcoral          \xf0\x80\x80'
+    b'lightcyan           \xe0\xff\xff'
+    b'lightcyan1          \xe0\xff\xff'
+    b'lightcyan2          \xd1\xee\xee'
+    b'lightcyan3          \xb4\xcd\xcd'
+    b'lightcyan4          \x7a\x8b\x8b'
+    b'lightgoldenrod      \xee\xdd\x82'
+    b'lightgoldenrod1     \xff\xec\x8b'
+    b'lightgoldenrod2     \xee\xdc\x82'
+    b'lightgoldenrod3     \xcd\xbe\x70'
+    b'lightgoldenrod4     \x8b\x81\x4c'
+    b'lightgoldenrodyellow\xfa\xfa\xd2'
+    b'lightgray           \xd3\xd3\xd3'
+    b'lightgreen          \x90\xee\x90'
+    b'lightgrey           \xd3\xd3\xd3'
+    b'lightpink           \xff\xb6\xc1'
+    b'lightpink1          \xff\xae\xb9'
+    b'lightpink2          \xee\xa2\xad'
+    b'lightpink3          \xcd\x8c\x95'
+    b'lightpink4          \x8b\x5f\x65'
+    b'lightsalmon         \xff\xa0\x7a'
+    b'lightsalmon1        \xff\xa0\x7a'
+    b'lightsalmon2        \xee\x95\x72'
+    b'lightsalmon3        \xcd\x81\x62'
+    b'lightsalmon4        \x8b\x57\x42'
+    b'lightseagreen       \x20\xb2\xaa'
+    b'lightskyblue        \x87\xce\xfa'
+    b'lightskyblue1       \xb0\xe2\xff'
+    b'lightskyblue2       \xa4\xd3\xee'
+    b'lightskyblue3       \x8d\xb6\xcd'
+    b'lightskyblue4       \x60\x7b\x8b'
+    b'lightslateblue      \x84\x70\xff'
+    b'lightslategray      \x77\x88\x99'
+    b'lightslategrey      \x77\x88\x99'
+    b'lightsteelblue      \xb0\xc4\xde'
+    b'lightsteelblue1     \xca\xe1\xff'
+    b'lightsteelblue2     \xbc\xd2\xee'
+    b'lightsteelblue3     \xa2\xb5\xcd'
+    b'lightsteelblue4     \x6e\x7b\x8b'
+    b'lightyellow         \xff\xff\xe0'
+    b'lightyellow1        \xff\xff\xe0'
+    b'lightyellow2        \xee\xee\xd1'
+    b'lightyellow3        \xcd\xcd\xb4'
+    b'lightyellow4        \x8b\x8b\x7a'
+    b'limegreen           \x32\xcd\x32'
+    b'linen               \xfa\xf0\xe6'
+    b'magenta             \xff\x00\xff'
+    b'magenta1            \xff\x00\xff'
+    b'magenta2            \xee\x00\xee'
+    b'magenta3            \xcd\x00\xcd'
+    b'magenta4            \x8b\x00\x8b'
+    b'maroon              \xb0\x30\x60'
+    b'maroon1             \xff\x34\xb3'
+    b'maroon2             \xee\x30\xa7'
+    b'maroon3             \xcd\x29\x90'
+    b'maroon4             \x8b\x1c\x62'
+    b'mediumaquamarine    \x66\xcd\xaa'
+    b'mediumblue          \x00\x00\xcd'
+    b'mediumorchid        \xba\x55\xd3'
+    b'mediumorchid1       \xe0\x66\xff'
+    b'mediumorchid2       \xd1\x5f\xee'
+    b'mediumorchid3       \xb4\x52\xcd'
+    b'mediumorchid4       \x7a\x37\x8b'
+    b'mediumpurple        \x93\x70\xdb'
+    b'mediumpurple1       \xab\x82\xff'
+    b'mediumpurple2       \x9f\x79\xee'
+    b'mediumpurple3       \x89\x68\xcd'
+    b'mediumpurple4       \x5d\x47\x8b'
+    b'mediumseagreen      \x3c\xb3\x71'
+    b'mediumslateblue     \x7b\x68\xee'
+    b'mediumspringgreen   \x00\xfa\x9a'
+    b'mediumturquoise     \x48\xd1\xcc'
+    b'mediumvioletred     \xc7\x15\x85'
+    b'midnightblue        \x19\x19\x70'
+    b'mintcream           \xf5\xff\xfa'
+    b'mistyrose           \xff\xe4\xe1'
+    b'mistyrose1          \xff\xe4\xe1'
+    b'mistyrose2          \xee\xd5\xd2'
+    b'mistyrose3          \xcd\xb7\xb5'
+    b'mistyrose4          \x8b\x7d\x7b'
+    b'moccasin            \xff\xe4\xb5'
+    b'navajowhite         \xff\xde\xad'
+    b'navajowhite1        \xff\xde\xad'
+    b'navajowhite2        \xee\xcf\xa1'
+    b'navajowhite3        \xcd\xb3\x8b'
+    b'navajowhite4        \x8b\x79\x5e'
+    b'navy                \x00\x00\x80'
+    b'navyblue            \x00\x00\x80'
+    b'oldlace             \xfd\xf5\xe6'
+    b'olivedrab           \x6b\x8e\x23'
+    b'olivedrab1          \xc0\xff\x3e'
+    b'olivedrab2          \xb3\xee\x3a'
+    b'olivedrab3          \x9a\xcd\x32'
+    b'olivedrab4          \x69\x8b\x22'
+    b'orange              \xff\xa5\x00'
+    b'orange1             \xff\xa5\x00'
+    b'orange2             \xee\x9a\x00'
+    b'orange3             \xcd\x85\x00'
+    b'orange4             \x8b\x5a\x00'
+    b'orangered           \xff\x45\x00'
+    b'orangered1          \xff\x45\x00'
+    b'orangered2          \xee\x40\x00'
+    b'orangered3          \xcd\x37\x00'
+    b'orangered4          \x8b\x25\x00'
+    b'orchid              \xda\x70\xd6'
+    b'orchid1             \xff\x83\xfa'
+    b'orchid2             \xee\x7a\xe9'
+    b'orchid3             \xcd\x69\xc9'
+    b'orchid4             \x8b\x47\x89'
+    b'palegoldenrod       \xee\xe8\xaa'
+    b'palegreen           \x98\xfb\x98'
+    b'palegreen1          \x9a\xff\x9a'
+    b'palegreen2          \x90\xee\x90'
+    b'palegreen3          \x7c\xcd\x7c'
+    b'palegreen4          \x54\x8b\x54'
+    b'paleturquoise       \xaf\xee\xee'
+    b'paleturquoise1      \xbb\xff\xff'
+    b'paleturquoise2      \xae\xee\xee'
+    b'paleturquoise3      \x96\xcd\xcd'
+    b'paleturquoise4      \x66\x8b\x8b'
+    b'palevioletred       \xdb\x70\x93'
+    b'palevioletred1      \xff\x82\xab'
+    b'palevioletred2      \xee\x79\x9f'
+    b'palevioletred3      \xcd\x68\x89'
+    b'palevioletred4      \x8b\x47\x5d'
+    b'papayawhip          \xff\xef\xd5'
+    b'peachpuff           \xff\xda\xb9'
+    b'peachpuff1          \xff\xda\xb9'
+    b'peachpuff2          \xee\xcb\xad'
+    b'peachpuff3          \xcd\xaf\x95'
+    b'peachpuff4          \x8b\x77\x65'
+    b'peru                \xcd\x85\x3f'
+    b'pink                \xff\xc0\xcb'
+    b'pink1               \xff\xb5\xc5'
+    b'pink2               \xee\xa9\xb8'
+    b'pink3               \xcd\x91\x9e'
+    b'pink4               \x8b\x63\x6c'
+    b'plum                \xdd\xa0\xdd'
+    b'plum1               \xff\xbb\xff'
+    b'plum2               \xee\xae\xee'
+    b'plum3               \xcd\x96\xcd'
+    b'plum4               \x8b\x66\x8b'
+    b'powderblue          \xb0\xe0\xe6'
+    b'purple              \xa0\x20\xf0'
+    b'purple1             \x9b\x30\xff'
+    b'purple2             \x91\x2c\xee'
+    b'purple3             \x7d\x26\xcd'
+    b'purple4             \x55\x1a\x8b'
+    b'red                 \xff\x00\x00'
+    b'red1                \xff\x00\x00'
+    b'red2                \xee\x00\x00'
+    b'red3                \xcd\x00\x00'
+    b'red4                \x8b\x00\x00'
+    b'rosybrown           \xbc\x8f\x8f'
+    b'rosybrown1          \xff\xc1\xc1'
+    b'rosybrown2          \xee\xb4\xb4'
+    b'rosybrown3          \xcd\x9b\x9b'
+    b'rosybrown4          \x8b\x69\x69'
+    b'royalblue           \x41\x69\xe1'
+    b'royalblue1          \x48\x76\xff'
+    b'royalblue2          \x43\x6e\xee'
+    b'royalblue3          \x3a\x5f\xcd'
+    b'royalblue4          \x27\x40\x8b'
+    b'saddlebrown         \x8b\x45\x13'
+    b'salmon              \xfa\x80\x72'
+    b'salmon1             \xff\x8c\x69'
+    b'salmon2             \xee\x82\x62'
+    b'salmon3             \xcd\x70\x54'
+    b'salmon4             \x8b\x4c\x39'
+    b'sandybrown          \xf4\xa4\x60'
+    b'seagreen            \x2e\x8b\x57'
+    b'seagreen1           \x54\xff\x9f'
+    b'seagreen2           \x4e\xee\x94'
+    b'seagreen3           \x43\xcd\x80'
+    b'seagreen4           \x2e\x8b\x57'
+    b'seashell            \xff\xf5\xee'
+    b'seashell1           \xff\xf5\xee'
+    b'seashell2           \xee\xe5\xde'
+    b'seashell3           \xcd\xc5\xbf'
+    b'seashell4           \x8b\x86\x82'
+    b'sienna              \xa0\x52\x2d'
+    b'sienna1             \xff\x82\x47'
+    b'sienna2             \xee\x79\x42'
+    b'sienna3             \xcd\x68\x39'
+    b'sienna4             \x8b\x47\x26'
+    b'skyblue             \x87\xce\xeb'
+    b'skyblue1            \x87\xce\xff'
+    b'skyblue2            \x7e\xc0\xee'
+    b'skyblue3            \x6c\xa6\xcd'
+    b'skyblue4            \x4a\x70\x8b'
+    b'slateblue           \x6a\x5a\xcd'
+    b'slateblue1          \x83\x6f\xff'
+    b'slateblue2          \x7a\x67\xee'
+    b'slateblue3          \x69\x59\xcd'
+    b'slateblue4          \x47\x3c\x8b'
+    b'slategray           \x70\x80\x90'
+    b'slategray1          \xc6\xe2\xff'
+    b'slategray2          \xb9\xd3\xee'
+    b'slategray3          \x9f\xb6\xcd'
+    b'slategray4          \x6c\x7b\x8b'
+    b'slategrey           \x70\x80\x90'
+    b'snow                \xff\xfa\xfa'
+    b'snow1               \xff\xfa\xfa'
+    b'snow2               \xee\xe9\xe9'
+    b'snow3               \xcd\xc9\xc9'
+    b'snow4               \x8b\x89\x89'
+    b'springgreen         \x00\xff\x7f'
+    b'springgreen1        \x00\xff\x7f'
+    b'springgreen2        \x00\xee\x76'
+    b'springgreen3        \x00\xcd\x66'
+    b'springgreen4        \x00\x8b\x45'
+    b'steelblue           \x46\x82\xb4'
+    b'steelblue1          \x63\xb8\xff'
+    b'steelblue2          \x5c\xac\xee'
+    b'steelblue3          \x4f\x94\xcd'
+    b'steelblue4          \x36\x64\x8b'
+    b'tan                 \xd2\xb4\x8c'
+    b'tan1                \xff\xa5\x4f'
+    b'tan2                \xee\x9a\x49'
+    b'tan3                \xcd\x85\x3f'
+    b'tan4                \x8b\x5a\x2b'
+    b'thistle             \xd8\xbf\xd8'
+    b'thistle1            \xff\xe1\xff'
+    b'thistle2            \xee\xd2\xee'
+    b'thistle3            \xcd\xb5\xcd'
+    b'thistle4            \x8b\x7b\x8b'
+    b'tomato              \xff\x63\x47'
+    b'tomato1             \xff\x63\x47'
+    b'tomato2             \xee\x5c\x42'
+    b'tomato3             \xcd\x4f\x39'
+    b'tomato4             \x8b\x36\x26'
+    b'turquoise           \x40\xe0\xd0'
+    b'turquoise1          \x00\xf5\xff'
+    b'turquoise2          \x00\xe5\xee'
+    b'turquoise3          \x00\xc5\xcd'
+    b'turquoise4          \x00\x86\x8b'
+    b'violet              \xee\x82\xee'
+    b'violetred           \xd0\x20\x90'
+    b'violetred1          \xff\x3e\x96'
+    b'violetred2          \xee\x3a\x8c'
+    b'violetred3          \xcd\x32\x78'
+    b'violetred4          \x8b\x22\x52'
+    b'wheat               \xf5\xde\xb3'
+    b'wheat1              \xff\xe7\xba'
+    b'wheat2              \xee\xd8\xae'
+    b'wheat3              \xcd\xba\x96'
+    b'wheat4              \x8b\x7e\x66'
+    b'white               \xff\xff\xff'
+    b'whitesmoke          \xf5\xf5\xf5'
+    b'yellow              \xff\xff\x00'
+    b'yellow1             \xff\xff\x00'
+    b'yellow2             \xee\xee\x00'
+    b'yellow3             \xcd\xcd\x00'
+    b'yellow4             \x8b\x8b\x00'
+    b'yellowgreen         \x9a\xcd\x32'
+)
+
+
+def get_x11_color(name):
+    ''' Look up an X11 color by name, case insensitive.
+
+        Returns:
+            tuple(int): (r, g, b), or None if not found.
+    '''
+    key = name.lower().encode('ascii', 'replace').ljust(NAME_WIDTH)
+    if len(key) > NAME_WIDTH:
+        return None
+
+    lo, hi = 0, len(x11_colors) // RECORD_WIDTH
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = mid * RECORD_WIDTH
+        found = x11_colors[start:start + NAME_WIDTH]
+        if found < key:
+            lo = mid + 1
+        elif found > key:
+            hi = mid
+        else:
+            return tuple(x11_colors[start + NAME_WIDTH:start + RECORD_WIDTH])
+
+
+def iter_x11_colors():
+    ''' Yields (name, (r, g, b)) tuples in name order. '''
+    for start in range(0, len(x11_colors), RECORD_WIDTH):
+        yield (x11_colors[start:start + NAME_WIDTH].rstrip().decode(),
+               tuple(x11_colors[start + NAME_WIDTH:start + RECORD_WIDTH]))
+
+
+def __getattr__(name):
+    ''' Build the former dict of decimal strings on demand, for
+        compatibility.
+    '''
+    if name == 'x11_color_map':
+        global x11_color_map
+        x11_color_map = {
+            name: tuple(str(value) for value in rgb)
+            for name, rgb in iter_x11_colors()
+        }
+        return x11_color_map
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 if __name__ == '__main__':
 
     import sys
 
-    # do a search
+    # do a search
     args = [ arg.casefold() for arg in sys.argv[1:] ]
 
-    for name in x11_color_map:
+    for name, rgb in iter_x11_colors():
         for arg in args:
             if arg in name:
-                print(name, tuple(int(n) for n in x11_color_map[name]))
+                print(name, rgb)
@@ -7,11 +7,12 @@
     Classes below are not meant to be instantiated by client code;
     see style.py.
 '''
+import io
 import sys
 import logging
-import re
+from collections import OrderedDict, namedtuple
+from functools import partial
 
-from . import term_level as _term_level
 from .constants import (CSI, ANSI_BG_LO_BASE, ANSI_FG_LO_BASE, ANSI_RESET,
                         TermLevel)
 from .disabled import empty_bin, empty
@@ -26,7 +27,10 @@ except ImportError:
     webcolors = None
 
 
+MAX_COMPOSED_STYLES = defaults.MAX_COMPOSED_STYLES
 MAX_NL_SEARCH = defaults.MAX_NL_SEARCH
+MAX_UNKNOWN_NAMES = defaults.MAX_UNKNOWN_NAMES
+STREAM_CHUNK_SIZE = defaults.STREAM_CHUNK_SIZE
 _STRING_PLUS_CALL_ERROR_TEMPLATE = '''\
 Ambiguous addition—first sequence has may not have been ended.
     Example Form:  pal.style1 + pal.style2(msg)
@@ -39,13 +43,35 @@ Ambiguous addition—first sequence has may not have been ended.
 '''
 
 log = logging.getLogger(__name__)
-# Palette attribute name finders.  Now we've got two problems.
-_hd = '[0-9A-Fa-f]'  # hex digits
-_index_finder = re.compile(r'^i_?\d{1,3}$', re.A)                   # i_DDD
-_nearest_finder = re.compile(f'^n_?{_hd}{{3}}$', re.A)              # n_HHH
-_true_finder = re.compile(f'^t_?({_hd}{{3}}|{_hd}{{6}})$', re.A)    # t_HHH+
-_x11_finder = re.compile(r'^x_\w{4,64}$', re.A)                     # x_NAME
-_web_finder = re.compile(r'^w_\w{4,64}$', re.A)                     # w_NAME
+_hex_digits = frozenset('0123456789ABCDEFabcdef')
+
+
+# Palette attribute name parsers, return the key or None when not matched:
+def _parse_index(name):                                             # i_DDD
+    key = name[2:] if name[1:2] == '_' else name[1:]
+    if 0 < len(key) < 4 and key.isascii() and key.isdigit():
+        return key
+
+
+def _parse_nearest(name):                                           # n_HHH
+    key = name[2:] if name[1:2] == '_' else name[1:]
+    if len(key) == 3 and _hex_digits.issuperset(key):
+        return key
+
+
+def _parse_true(name):                                              # t_HHH+
+    key = name[2:] if name[1:2] == '_' else name[1:]
+    if len(key) in (3, 6) and _hex_digits.issuperset(key):
+        return key
+
+
+def _parse_named(name):                                     # x_NAME, w_NAME
+    key = name[2:]
+    if (name[1:2] == '_' and 3 < len(key) < 65 and key.isascii()
+        and key.replace('_', 'x').isalnum()):
+        return key
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions maxsize currsize')
 
 
 class _BasicPaletteBuilder:
@@ -59,18 +85,21 @@ class _BasicPaletteBuilder:
     '''
     _level = TermLevel.DUMB
 
-    def __new__(cls, color_sep=None, level=Ellipsis):
+    def __new__(cls, color_sep=None, level=Ellipsis, **kwargs):
         ''' Override new() to replace the class entirely on deactivation.
 
             Arguments:
                 level       - Term level to support.
                               - Ellipsis - Detect from environment.
+                kwargs      - Passed on to init, e.g. downgrade_method.
         '''
         self = super().__new__(cls)
 
         if level is Ellipsis:                   # autodetecten-Sie
-            if _term_level:
-                self._level = _term_level
+            from . import term_level            # defer, runs detection
+
+            if term_level:
+                self._level = term_level
             else:  # None
                 self = empty_bin                # deactivate self
         elif isinstance(level, TermLevel):      # continue on fine sir…
@@ -115,8 +144,20 @@ class _HighColorPaletteBuilder(_BasicPaletteBuilder):
     ''' Container/Router for ANSI Extended & Truecolor palettes.
 
         Unlike the Basic palette builder, computes attributes on the fly.
+
+        Arguments:
+            downgrade_method    - See the proximity module, e.g. 'euclid'.
+            cache_size          - Computed entries are cached forever by
+                                  default.  Given an int, the most recently
+                                  used are kept instead, see _cache_info().
+                                  Basic colors are never evicted.
     '''
-    def __init__(self, downgrade_method='euclid', **kwargs):
+    def __init__(self, downgrade_method='euclid', cache_size=None, **kwargs):
+        # before super, __getattr__ is live:
+        self._cache = None if cache_size is None else OrderedDict()
+        self._cache_size = cache_size
+        self._unknown = {}  # name: error message, fail fast
+        self._hits = self._misses = self._evictions = 0
         super().__init__(**kwargs)
         self._dg_method = downgrade_method
 
@@ -130,6 +171,8 @@ class _HighColorPaletteBuilder(_BasicPaletteBuilder):
 
             Attribute prefixes:                     Examples:
 
+                - i_ index:                         .i_208
+                - n_ nearest hex-string:            .n_b0b
                 - t_ hex-string:                    .t_bb00bb
                 - x_ name:                          .x_lime
                 - w_ name to tuple of int8:         .w_bisque
@@ -155,44 +198,51 @@ class _HighColorPaletteBuilder(_BasicPaletteBuilder):
 
             Final Output:
                 - wrap in _PaletteEntry(output)
+
+            Routing is by first character, unknown names are remembered.
         '''
-        key = name[1:].lstrip('_')  # rm prefix from key
-        result = None
+        if name[:1] == '_':  # private and dunder names aren't colors, may be
+            cname = self.__class__.__name__  # read before init, e.g. copy
+            raise AttributeError(f'{cname!r} object has no attribute {name!r}')
+
+        cache = self._cache
+        if cache is not None:  # bounded, entries live here, not in __dict__
+            try:
+                result = cache[name]
+                cache.move_to_end(name)
+                self._hits += 1
+                return result
+            except KeyError:
+                pass
+
+        unknown = self._unknown
+        message = unknown.get(name)
+        if message:  # seen it, nope
+            raise AttributeError(message)
 
         # follow the yellow brick road…
-        if _index_finder.match(name):       # Indexed aka Extended
-            result = self._get_extended_palette_entry(name, key)
-
-        elif _nearest_finder.match(name):   # Nearest index
-            result = self._get_extended_palette_entry(name, key, is_hex=True)
-
-        elif _true_finder.match(name):      # Direct color
-            result = self._get_direct_palette_entry(name, key)
-
-        elif _x11_finder.match(name):       # X11, forced via prefix
-            result = self._get_X11_palette_entry(key)
-
-        elif _web_finder.match(name):       # Webcolors, forced via prefix
-            result = self._get_web_palette_entry(key)
-
-        else:  # look for bare names (without prefix)
-            if webcolors:
-                try:
-                    return self._get_web_palette_entry(name)
-                except AttributeError:
-                    pass  # nope, didn't find…
-
-            try:  # try X11
-                result = self._get_X11_palette_entry(name)
-                if result:
-                    return result
-            except AttributeError:
-                pass  # nada
-
-            # Emerald city
-            cname = self.__class__.__name__
-            raise AttributeError(f'{cname} - {name!r} is not a recognized '
-                                 'color name or format.')
+        result = None
+        route = _routes.get(name[:1])
+        try:
+            if route:
+                parse, get_entry = route
+                key = parse(name)
+                if key is not None:
+                    return get_entry(self, name, key)
+
+            result = self._get_bare_palette_entry(name)  # w/o prefix
+        except AttributeError as err:
+            message = err.args[0]
+
+        if result is None:  # Emerald city
+            if not message:
+                cname = self.__class__.__name__
+                message = (f'{cname} - {name!r} is not a recognized '
+                           'color name or format.')
+            if len(unknown) >= MAX_UNKNOWN_NAMES:
+                unknown.clear()  # bound it, rare
+            unknown[name] = message
+            raise AttributeError(message)
         return result
 
     def _get_extended_palette_entry(self, name, index, is_hex=False):
@@ -274,27 +324,47 @@ class _HighColorPaletteBuilder(_BasicPaletteBuilder):
 
         return (self._create_entry(name, values) if values else empty)
 
-    def _get_X11_palette_entry(self, name):
-        ''' Look up colors from bundled X11 palette. '''
-        from .color_tables_x11 import x11_color_map
-        result = empty
-        try:            # to decimal int strings, e.g.: ('1', '2', '3')
-            color = x11_color_map[name.lower()]
-        except KeyError:  # convert to AttributeError
-            raise AttributeError(f'{name.lower()!r} not found in X11 palette.')
-        result = self._get_direct_palette_entry(name, color)
-        return result
+    def _get_nearest_palette_entry(self, name, key):
+        ''' Compute extended entry, nearest to a hex string. '''
+        return self._get_extended_palette_entry(name, key, is_hex=True)
 
-    def _get_web_palette_entry(self, name):
+    def _get_X11_palette_entry(self, name, key=None):
+        ''' Look up colors from bundled X11 palette. '''
+        from .color_tables_x11 import get_x11_color
+        key = (key or name).lower()
+        color = get_x11_color(key)  # to ints, e.g.: (1, 2, 3)
+        if color is None:  # convert to AttributeError
+            raise AttributeError(f'{key!r} not found in X11 palette.')
+        return self._get_direct_palette_entry(name, color)
+
+    def _get_web_palette_entry(self, name, key=None):
         ''' Look up colors from webcolors module. '''
-        result = None
+        key = key or name
         try:  # wc: returns tuple of "decimal" int: (1, 2, 3)
-            color = webcolors.name_to_rgb(name)
-            result = self._get_direct_palette_entry(name, color)
+            color = webcolors.name_to_rgb(key)
         except (ValueError, AttributeError):  # convert to AttributeError
             raise AttributeError(
-                f'{name!r} not found in webcolors palette.')
-        return result
+                f'{key!r} not found in webcolors palette.')
+        return self._get_direct_palette_entry(name, color)
+
+    def _get_bare_palette_entry(self, name):
+        ''' Look up a name without prefix, in webcolors then X11.
+            Returns None when not found.
+        '''
+        color = None
+        if webcolors:
+            try:
+                color = webcolors.name_to_rgb(name)
+            except ValueError:
+                pass  # nope, didn't find…
+
+        if color is None:  # try X11
+            from .color_tables_x11 import get_x11_color
+            color = get_x11_color(name)
+            if color is None:
+                return None  # nada
+
+        return self._get_direct_palette_entry(name, color)
 
     def _create_entry(self, name, values):
         ''' Render first values as string and place as first code,
@@ -306,7 +376,16 @@ class _HighColorPaletteBuilder(_BasicPaletteBuilder):
         else:
             str_values = self._color_sep.join(values)
             attr = _PaletteEntry(self, name.upper(), str_values)
-        setattr(self, name, attr)  # now cached
+
+        self._misses += 1
+        cache = self._cache
+        if cache is None:
+            setattr(self, name, attr)  # now cached
+        else:
+            cache[name] = attr
+            if len(cache) > self._cache_size:  # drop least recently used
+                cache.popitem(last=False)
+                self._evictions += 1
         return attr
 
     def _index_to_ansi_values(self, index):
@@ -329,37 +408,81 @@ class _HighColorPaletteBuilder(_BasicPaletteBuilder):
                 index += 92                     # (ANSI_BG_HI_BASE - 8)
         return [str(index)]
 
+    def _cache_info(self):
+        ''' Return statistics on computed entries, a la functools.lru_cache.
+            Hits are counted only with a bounded cache_size, as otherwise
+            entries are found as plain attributes.
+        '''
+        if self._cache is None:
+            currsize = sum(1 for name in self.__dict__
+                           if not (name.startswith('_') or
+                                   hasattr(type(self), name)))
+        else:
+            currsize = len(self._cache)
+        return CacheInfo(self._hits, self._misses, self._evictions,
+                         self._cache_size, currsize)
+
     def _clear(self):
-        ''' "Cleanse the palette" to free memory.
-            Useful for direct color, perhaps.
+        ''' "Cleanse the palette" of computed entries to free memory.
+            Useful for direct color, perhaps.  Basic colors are kept.
         '''
-        self.__dict__.clear()
+        cls = type(self)
+        for name in list(self.__dict__):
+            if not (name.startswith('_') or hasattr(cls, name)):
+                del self.__dict__[name]
+        if self._cache is not None:
+            self._cache.clear()
+
+
+_routes = dict(  # first character: name parser, entry getter
+    i=(_parse_index, _HighColorPaletteBuilder._get_extended_palette_entry),
+    n=(_parse_nearest, _HighColorPaletteBuilder._get_nearest_palette_entry),
+    t=(_parse_true, _HighColorPaletteBuilder._get_direct_palette_entry),
+    x=(_parse_named, _HighColorPaletteBuilder._get_X11_palette_entry),
+    w=(_parse_named, _HighColorPaletteBuilder._get_web_palette_entry),
+)
 
 
 class _LineWriter:
     ''' Writes each line with escape sequences terminated so paging works
         correctly, a la Pygments.
+
+        The lines of each write are gathered and handed to the stream in a
+        single call.  Binary streams get the same output, encoded.
     '''
-    def __init__(self, start, stream, default):
-        self.start = start
+    def __init__(self, start, stream, default, encoding='utf8'):
+        self.start = str(start)
         self.stream = stream
-        self.default = default
+        self.default = str(default)
+        self._encoding = None
+        if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+            self._encoding = encoding
 
     def write(self, data):
-        ''' This could be a bit less clumsy. '''
-        if data == '\n':  # print does this
-            return self.stream.write(data)
+        ''' Wrap lines of data, then write once. '''
+        if data == '\n':  # print does this, pass thru
+            if not self._encoding:
+                return self.stream.write(data) or 0  # None on Windows
+        elif data:
+            start, default = self.start, self.default
+            lines = data.splitlines(True)  # keep ends: True
+            if len(lines) == 1 and data[-1] != '\n':  # fast path
+                data = f'{start}{data}{default}'
+            else:
+                pieces = []
+                extend = pieces.extend
+                for line in lines:
+                    if line.endswith('\n'):  # mv nl to end of output:
+                        extend((start, line[:-1], default, '\n'))
+                    else:
+                        extend((start, line, default))
+                data = ''.join(pieces)
         else:
-            bytes_written = 0
-            for line in data.splitlines(True):  # keep ends: True
-                end = ''
-                if line.endswith('\n'):  # mv nl to end of output below:
-                    line = line[:-1]
-                    end = '\n'
-                bytes_written += self.stream.write(
-                                    f'{self.start}{line}{self.default}{end}'
-                                 ) or 0  # in case None returned (on Windows)
-            return bytes_written
+            return 0
+
+        if self._encoding:
+            data = data.encode(self._encoding)
+        return self.stream.write(data) or 0  # None on Windows
 
     def __getattr__(self, attr):
          return getattr(self.stream, attr)
@@ -380,26 +503,53 @@ class _PaletteEntry:
             name    - Display name, used in demos.
             code    - Associated ANSI code number.
             stream  - Stream to print to, when using a context manager.
+            default - Sequence to end with, overrides the one found via code
+                      or parent.
+
+        Entries are immutable, aside from their output stream, and render
+        their sequences once at construction.
     '''
+    __slots__ = ('_parent', 'name', 'default', '_stream', '_orig_stdout',
+                 '_str', '_default_str')
     _end_code = 'm'
+    _mutable = frozenset(('_stream', '_orig_stdout'))  # for redirection
 
-    def __init__(self, parent, name, code, stream=sys.stdout):
-        self._parent = parent
-        self.name = name
-        self._stream = stream               # for redirection
+    def __init__(self, parent, name, code, stream=sys.stdout, default=None):
+        setattr_ = object.__setattr__
+        setattr_(self, '_parent', parent)
+        setattr_(self, 'name', name)
+        setattr_(self, '_stream', stream)           # for redirection
+        setattr_(self, '_orig_stdout', None)
 
         # find initial code and default
-        default = None
         if type(code) in (int, str):
-            self._codes = [str(code)]
+            codes = (str(code),)
         elif type(code) is tuple:
-            self._codes = [str(code[0])]
-            default = f'{CSI}{code[1]}m'    # pre-render
+            codes = (str(code[0]),)
+            default = default or f'{CSI}{code[1]}m'  # pre-render
+        else:
+            raise TypeError('code not valid: %r' % code)
+
+        if not default:
+            default = (parent.default if hasattr(parent, 'default')
+                                      else parent.end)  # style
+        setattr_(self, 'default', default)
+        # not color_sep, styles also:
+        setattr_(self, '_str', f'{CSI}{";".join(codes)}{self._end_code}')
+        setattr_(self, '_default_str', str(default))
+
+    def __setattr__(self, name, value):
+        if name in self._mutable:
+            object.__setattr__(self, name, value)
         else:
-            TypeError('code not valid: %r' % code)
+            raise AttributeError(
+                f'{type(self).__name__} attribute {name!r} is read-only.'
+            )
 
-        self.default = default or (parent.default if hasattr(parent, 'default')
-                                                  else parent.end)  # style
+    @property
+    def _codes(self):
+        ''' Codes recovered from the rendered sequence, rather than stored. '''
+        return self._str[len(CSI):-len(self._end_code)].split(';')
 
     def __add__(self, other):
         ''' Add: self + other '''
@@ -409,47 +559,75 @@ class _PaletteEntry:
                     _STRING_PLUS_CALL_ERROR_TEMPLATE.format(self, other)
                 )
             else:
-                return str(self) + other
+                return self._str + other
 
         elif type(other) is _PaletteEntryFBTerm:  # not! isinstance
-            return _CallableFBString(str(self) + str(other))
+            return _CallableFBString(self._str + other._str)
 
         elif isinstance(other, _PaletteEntry):
+            # a copy, as the output stream of the shared one must not change
+            return self._compose(other)._copy()
+        else:
+            raise TypeError(f'Addition to type {type(other)} not supported.')
+
+    def _compose(self, other):
+        ''' Returns the shared entry for self + other, rendered once.
+            Not to be handed out, as its stream must stay the default.
+        '''
+        default = None
+        if not self.default == other.default:   # not in same class,
+            default = ANSI_RESET                # switch to full reset
+
+        key = (self._parent, self.name, self._str, other._str, default)
+        new_entry = _composed.get(key)
+        if new_entry is None:
             # Make a copy, so codes don't pile up after each addition
             # Render initial values once as string and place as first code:
             newcodes = self._codes + other._codes
             new_entry = _PaletteEntry(self._parent, self.name,
-                                      ';'.join(newcodes))   # _not_ color_sep
-                                                            # different type
-            if not self.default == other.default:   # not in same class,
-                new_entry.default = ANSI_RESET      # switch to full reset
-
-            return new_entry
-        else:
-            raise TypeError(f'Addition to type {type(other)} not supported.')
+                                      ';'.join(newcodes),  # not color_sep
+                                      default=default)
+            if len(_composed) >= MAX_COMPOSED_STYLES:
+                _composed.clear()
+            _composed[key] = new_entry
+        return new_entry
+
+    def _copy(self):
+        ''' Returns a copy with its own output stream state. '''
+        entry = object.__new__(type(self))
+        setattr_ = object.__setattr__
+        setattr_(entry, '_parent', self._parent)
+        setattr_(entry, 'name', self.name)
+        setattr_(entry, 'default', self.default)
+        setattr_(entry, '_stream', self._stream)
+        setattr_(entry, '_orig_stdout', None)
+        setattr_(entry, '_str', self._str)
+        setattr_(entry, '_default_str', self._default_str)
+        return entry
 
     def __radd__(self, other):
         ''' Reverse add: other + self '''
-        return other + str(self)
+        return other + self._str
 
     def __bool__(self):
         return bool(self._codes)
 
     def __enter__(self):
         ''' Wrap output streams. '''
-        log.debug(repr(str(self)))
+        log.debug(repr(self._str))
         # wrap originals
         self._orig_stdout = sys.stdout
-        sys.stdout = _LineWriter(self, self._stream, self.default)
+        sys.stdout = _LineWriter(self._str, self._stream, self._default_str)
         return sys.stdout
 
     def __exit__(self, type, value, traceback):
         sys.stdout = sys.stdout.stream
-        log.debug(repr(str(self.default)))
-        self._stream.write(str(self.default))  # just in case
+        log.debug(repr(self._default_str))
+        self._stream.write(self._default_str)  # just in case
 
     def __call__(self, text, *styles, save_length=False) -> str | _LengthyString:
-        ''' Formats text.  Not appropriate for *huge* input strings.
+        ''' Formats text.  Not appropriate for *huge* input strings,
+            see iter_lines() and stream() instead.
 
             Arguments:
                 text                Original text.
@@ -461,10 +639,7 @@ class _PaletteEntry:
                 Color sequences are terminated at newlines,
                 so that paging of output works correctly.
         '''
-        if (self._parent.__class__.__name__ == 'EffectsTerminator' or
-            self.name in ('DEFAULT', 'END')):
-            raise NotImplementedError("call form undefined for "
-                                      "EffectsTerminator or 'default'.")
+        self._check_call_form()
         # when an empty string/None is passed, don't emit, but allow falsey.
         if text == '' or text is None:
             return ''
@@ -472,7 +647,10 @@ class _PaletteEntry:
         # if the defaults of mixins are different,
         # uses fx.end instead of palette.default, see addition:
         for attr in styles:
-            self += attr
+            if type(attr) is _PaletteEntry:  # shared, only read here
+                self = self._compose(attr)
+            else:
+                self += attr
 
         # add end styles per line, to facilitate paging:
         if isinstance(text, str):
@@ -480,12 +658,13 @@ class _PaletteEntry:
         else:
             pos = None
 
+        start, default = self._str, self._default_str
         if pos in (-1, None):  # not found | not str, to str
-            result = f'{self}{text}{self.default}'
+            result = f'{start}{text}{default}'
         else:
             lines = text.splitlines()
             for i, line in enumerate(lines):
-                lines[i] = f'{self}{line}{self.default}'  # add styles, see tip
+                lines[i] = f'{start}{line}{default}'  # add styles, see tip
             result = '\n'.join(lines)
 
         if save_length:
@@ -494,10 +673,10 @@ class _PaletteEntry:
             return result
 
     def __str__(self):
-        return f'{CSI}{";".join(self._codes)}m'  # not color_sep, styles also
+        return self._str
 
     def __repr__(self):
-        return repr(self.__str__())
+        return repr(self._str)
 
     def template(self, placeholder='{}'):
         ''' Returns a template string from this Entry with its attributes.
@@ -505,7 +684,69 @@ class _PaletteEntry:
             Placeholder can be '%s', '{}', '${}' or other depending on your
             needs.
         '''
-        return f'{self}{placeholder}{self.default}'
+        return f'{self._str}{placeholder}{self._default_str}'
+
+    def iter_lines(self, source, chunk_size=STREAM_CHUNK_SIZE):
+        ''' Styles text lazily, in constant memory, yielding strings as they
+            are ready.  Each line is wrapped with start and default sequences
+            and line endings are preserved.
+
+            Arguments:
+                source              A string, a text file-like object,
+                                    or an iterable of strings.
+                                    Pieces need not end at newlines.
+                chunk_size          Max characters read at once from files,
+                                    bounds memory use on very long lines.
+        '''
+        self._check_call_form()
+        if isinstance(source, str):
+            pieces = _iter_str_lines(source)
+        elif hasattr(source, 'readline'):
+            pieces = iter(partial(source.readline, chunk_size), '')
+        else:
+            pieces = source
+
+        start, default = self._str, self._default_str
+        in_line = False  # start sequence emitted, default not yet
+        for piece in pieces:
+            if not piece:
+                continue
+            parts = piece.split('\n')
+            last = parts.pop()
+            output = []
+            for part in parts:
+                if not in_line:
+                    output.append(start)
+                output.extend((part, default, '\n'))  # CR stays, as write
+                in_line = False
+            if last:
+                if not in_line:
+                    output.append(start)
+                    in_line = True
+                output.append(last)
+            yield ''.join(output)
+
+        if in_line:
+            yield default
+
+    def stream(self, source, outfile=None, chunk_size=STREAM_CHUNK_SIZE):
+        ''' Styles text from source and writes it to outfile, or the entry's
+            stream when not given.  See iter_lines().
+
+            Returns:
+                int - the number of characters written.
+        '''
+        write = (outfile or self._stream).write
+        chars_written = 0
+        for output in self.iter_lines(source, chunk_size=chunk_size):
+            chars_written += write(output) or 0  # None returned on Windows
+        return chars_written
+
+    def _check_call_form(self):
+        if (self._parent.__class__.__name__ == 'EffectsTerminator' or
+            self.name in ('DEFAULT', 'END')):
+            raise NotImplementedError("call form undefined for "
+                                      "EffectsTerminator or 'default'.")
 
     def set_output(self, outfile):
         ''' Set's the output file, currently only useful with context-managers.
@@ -517,24 +758,39 @@ class _PaletteEntry:
             sys.stdout = self._orig_stdout
 
         self._stream = outfile
-        sys.stdout = _LineWriter(self, self._stream, self.default)
+        sys.stdout = _LineWriter(self._str, self._stream, self._default_str)
+
+
+_composed = {}  # (parent, name, start, other start, default): entry
+
+
+def _iter_str_lines(text):
+    ''' Yields lines of text with their endings, without building a list. '''
+    find = text.find
+    begin = 0
+    while True:
+        end = find('\n', begin) + 1
+        if not end:
+            if begin < len(text):
+                yield text[begin:]
+            return
+        yield text[begin:end]
+        begin = end
 
 
 class _PaletteEntryFBTerm(_PaletteEntry):
     ''' Help fbterm show 256 colors. '''
-    _end_code = '}'
+    __slots__ = ()
+    _end_code = '}'  # note '}' at end not std 'm'
 
     def __add__(self, other):
         ''' Add: self + other '''
         # these are not able to mix unfortunately, convert to callable string:
         if type(other) is _PaletteEntry:  # not! isinstance
-            return _CallableFBString(str(self) + str(other))
+            return _CallableFBString(self._str + other._str)
         else:
             return super().__add__(other)
 
-    def __str__(self):  # outer sep, not color_sep
-        return f'{CSI}{";".join(self._codes)}}}'  # note '}' at end not std 'm'
-
 
 class _CallableFBString(str):
     ''' String that is callable, only needed in the very specific instance of
@@ -0,0 +1,397 @@
+'''
+    .. console - Comprehensive utility library for ANSI terminals.
+    .. © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
+
+    Terminal input demultiplexer.  POSIX only.
+
+    The query functions in the detection module flush the input before
+    asking, throwing away keys pressed in the meantime, and replies that
+    arrive after their timeout leak into the program's input.
+
+    Instead, an InputDemux reads the terminal in a background thread and
+    splits what arrives into key presses and replies (CPR, OSC, DCS, DA,
+    DSR, etc).  Each reply goes to the query waiting for it, so several may
+    be in flight at once, and replies nobody waits for are dropped.  Keys
+    are queued for get_key().
+
+    While one is running, query through it rather than the detection
+    module, as both would read the terminal.
+
+    Example::
+
+        from console.demux import InputDemux
+
+        with InputDemux() as demux:
+            x, y = demux.get_position()
+            key = demux.get_key()
+'''
+import codecs
+import logging
+import os
+import re
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from queue import Empty, SimpleQueue
+
+from . import detection
+from .constants import CSI, OSC, ST
+from .detection import TermStack, termios, tty
+from .meta import defaults
+
+
+log = logging.getLogger(__name__)
+
+_csi_finder = re.compile(rb'\x1b\[([\x30-\x3f]*)([\x20-\x2f]*)([\x40-\x7e])')
+_csi_partial_finder = re.compile(rb'\x1b\[[\x30-\x3f]*[\x20-\x2f]*\Z')
+_position_params_finder = re.compile(rb'[0-9]+;[0-9]+\Z')
+_string_ends = (b'\x07', b'\x1b\\')  # BEL, ST
+
+
+def _get_csi_reply(params, intermediates, final):
+    ''' Returns the reply kind of a CSI sequence, None if a key. '''
+    reply = None
+    if final == b'R':
+        if _position_params_finder.match(params):  # or modified F3 :-/
+            reply = 'R'
+    elif final == b'c' and params[:1] in (b'?', b'>'):  # device attributes
+        reply = params[:1].decode() + 'c'
+    elif final == b'n':  # device status
+        reply = 'n'
+    elif final == b'y' and intermediates == b'$':  # mode report
+        reply = '$y'
+    elif final == b't':  # window reports
+        reply = 't'
+    return reply
+
+
+def _get_osc_reply(body):
+    ''' Returns the reply kind of an OSC string, e.g. "]11" or "]4;2". '''
+    if body[:1] in ('l', 'L'):  # title, icon label
+        return ']' + body[0]
+    code, _, rest = body.partition(';')
+    if code == '4':  # palette, by index
+        code += ';' + rest.partition(';')[0]
+    return ']' + code
+
+
+class _InputParser:
+    ''' Splits terminal input into keys and replies, keeping incomplete
+        sequences until more arrives.
+    '''
+    def __init__(self, max_bytes=defaults.MAX_CLIPBOARD_SIZE):
+        self._data = bytearray()
+        self._decoder = codecs.getincrementaldecoder('utf8')('replace')
+        self.max_bytes = max_bytes
+
+    @property
+    def pending(self):
+        ''' Number of bytes held, waiting for the rest of a sequence. '''
+        return len(self._data)
+
+    def feed(self, chunk):
+        ''' Parse a chunk of input.
+
+            Returns:
+                list: of (reply, text) tuples, where reply is a kind such as
+                      "R" or "]11", or None for a key.  Text is the whole
+                      sequence.
+        '''
+        data = self._data
+        data += chunk
+        events = []
+        length = len(data)
+        pos = 0
+
+        while pos < length:
+            if data[pos] != 0x1b:  # run of characters
+                end = data.find(b'\x1b', pos)
+                final = end != -1
+                if not final:
+                    end = length
+                text = self._decoder.decode(bytes(data[pos:end]), final)
+                events.extend((None, char) for char in text)
+                pos = end
+                continue
+
+            if pos + 1 == length:  # lone ESC, wait for more
+                break
+            introducer = data[pos + 1]
+
+            if introducer == 0x5b:  # [
+                match = _csi_finder.match(data, pos)
+                if match:
+                    reply = _get_csi_reply(*match.groups())
+                    end = match.end()
+                elif _csi_partial_finder.match(data, pos):
+                    break
+                else:  # malformed, take ESC as a key
+                    reply, end = None, pos + 1
+
+            elif introducer in (0x5d, 0x50):  # ], P: OSC, DCS strings
+                found = [index for index in (data.find(marker, pos + 2)
+                                             for marker in _string_ends)
+                         if index != -1]
+                if not found:
+                    if length - pos > self.max_bytes:
+                        log.debug('discarding overlong string.')
+                        pos = length
+                    break
+                end = min(found)
+                end += 1 if data[end] == 0x07 else 2
+                if introducer == 0x50:
+                    reply = 'P'
+                else:
+                    reply = _get_osc_reply(
+                        data[pos + 2:end].decode('utf8', 'replace')
+                    )
+
+            elif introducer == 0x4f:  # O: SS3 keys
+                if pos + 2 == length:
+                    break
+                reply, end = None, pos + 3
+
+            elif introducer < 0x80 and introducer != 0x1b:  # alt+key
+                reply, end = None, pos + 2
+
+            else:
+                reply, end = None, pos + 1
+
+            events.append((reply, data[pos:end].decode('utf8', 'replace')))
+            pos = end
+
+        del data[:pos]
+        return events
+
+    def flush(self):
+        ''' Give up on an incomplete sequence, returning it as a key. '''
+        text = self._data.decode('utf8', 'replace')
+        text += self._decoder.decode(b'', True)
+        self._data.clear()
+        return [(None, text)] if text else []
+
+
+class InputDemux:
+    ''' Reads terminal input in a background thread, sorting key presses
+        from replies to queries.  Puts the terminal into cbreak mode while
+        running.  POSIX only.
+
+        Arguments:
+            infile: file, terminal to read.
+            stream: file, terminal to write queries to.
+    '''
+    def __init__(self, infile=sys.stdin, stream=sys.stdout):
+        self.infile = infile
+        self.stream = stream
+        self._keys = SimpleQueue()
+        self._lock = threading.Lock()           # for waiters, not held on io
+        self._write_lock = threading.Lock()     # keeps queries in order
+        self._waiters = {}  # reply kind: deque of futures, in query order
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        ''' Start reading input. '''
+        self._termstack = TermStack(self.infile, exit_mode='drain')
+        fd = self._termstack.__enter__()
+        tty.setcbreak(fd, termios.TCSANOW)      # shut off echo
+        self._wake_fd, self._waker_fd = os.pipe()
+        self._thread = threading.Thread(
+            target=self._read, args=(fd,), name='console-demux', daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        ''' Stop reading input and restore the terminal.  Queries still
+            waiting are cancelled; queued keys remain available.
+        '''
+        if self._thread:
+            os.write(self._waker_fd, b'.')
+            self._thread.join()
+            self._thread = None
+            os.close(self._wake_fd)
+            os.close(self._waker_fd)
+            self._termstack.__exit__()
+
+            with self._lock:  # cancel outside, callbacks take the lock
+                waiting = [future for futures in self._waiters.values()
+                           for future in futures]
+                self._waiters.clear()
+            for future in waiting:
+                future.cancel()
+
+    def _read(self, fd):
+        from select import select
+
+        parser = _InputParser()
+        while True:
+            timeout = None
+            if parser.pending:  # lone ESC vs. start of a sequence
+                timeout = (defaults.ESC_TIMEOUT if parser.pending <= 2
+                           else defaults.READ_TIMEOUT)
+            ready = select((fd, self._wake_fd), (), (), timeout)[0]
+            if self._wake_fd in ready:
+                break
+            if ready:
+                chunk = os.read(fd, 4096)
+                events = parser.feed(chunk) if chunk else parser.flush()
+            else:
+                events = parser.flush()
+            for reply, text in events:
+                self._dispatch(reply, text)
+            if ready and not chunk:  # closed
+                break
+
+    def _dispatch(self, reply, text):
+        if reply:
+            with self._lock:
+                futures = self._waiters.get(reply)
+                future = futures.popleft() if futures else None
+            if future:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(text)
+                else:  # cancelled as it arrived
+                    log.debug('dropped late reply: %r', text)
+                return
+            elif reply != 'R':
+                log.debug('dropped unexpected reply: %r', text)
+                return
+        self._keys.put(text)
+
+    def get_key(self, timeout=None):
+        ''' Return the next key pressed, e.g. "a" or "\\x1b[A".
+
+            Arguments:
+                timeout: float secs, how long to wait, None to block.
+
+            Returns:
+                str, or None if not pressed in time.
+        '''
+        try:
+            return self._keys.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def write(self, sequence):
+        ''' Write a sequence to the terminal. '''
+        with self._write_lock:
+            self.stream.write(sequence)
+            self.stream.flush()
+
+    def request(self, sequence, reply):
+        ''' Write a query to the terminal without waiting for the answer.
+
+            Arguments:
+                sequence: str, the query.
+                reply: str, kind of reply expected, e.g. "R" for a cursor
+                       position report, "]11" for an OSC 11 reply.
+
+            Returns:
+                Future: resolving to the full text of the reply.
+                        Cancel it to give up.
+        '''
+        future = Future()
+        with self._write_lock:
+            with self._lock:
+                futures = self._waiters.setdefault(reply, deque())
+                futures.append(future)
+            future.add_done_callback(
+                lambda future: self._forget(futures, future)
+            )
+            self.stream.write(sequence)
+            self.stream.flush()
+        return future
+
+    def _forget(self, futures, future):
+        ''' Remove a cancelled query, so it doesn't take a later reply. '''
+        if future.cancelled():
+            with self._lock:
+                try:
+                    futures.remove(future)
+                except ValueError:
+                    pass  # already taken
+
+    def query(self, sequence, reply, timeout=defaults.READ_TIMEOUT):
+        ''' Write a query to the terminal and wait for the answer,
+            see request().
+
+            Returns:
+                str: full text of the reply, or None if not received.
+        '''
+        future = self.request(sequence, reply)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            if future.cancel():
+                log.debug('response not received in time, %s secs.', timeout)
+                return None
+            return future.result()
+
+    def get_color(self, name, number=None, timeout=defaults.READ_TIMEOUT):
+        ''' Query the terminal for colors, see detection.get_color().
+
+            Returns:
+                tuple[str]: four-digit hex strings, empty on failure.
+        '''
+        color = ()
+        query_sequence = detection._get_color_query(name, number)
+        if query_sequence:
+            reply = ']' + query_sequence[len(OSC):].rpartition(';?')[0]
+            resp = self.query(query_sequence, reply, timeout=timeout)
+            if resp:
+                color = detection._parse_color(_strip_end(resp))
+        return color
+
+    def get_clipboard(self, source='c', encoding='utf8', timeout=.2):
+        ''' Read string or byte data from the clipboard,
+            see utils.get_clipboard().
+        '''
+        resp = self.query(f'{OSC}52;{source};?{ST}', ']52', timeout=timeout)
+        return detection._parse_clipboard(resp and _strip_end(resp), encoding)
+
+    def get_position(self, fallback=defaults.CURSOR_POS_FALLBACK,
+                     timeout=defaults.READ_TIMEOUT):
+        ''' Return the current position of the terminal cursor,
+            see detection.get_position().
+
+            Returns:
+                tuple(int): (x, y) | fallback, if not received.
+        '''
+        resp = self.query(CSI + '6n', 'R', timeout=timeout)
+        if not resp:
+            return fallback
+        return detection._parse_position(_strip_end(resp))
+
+    def get_theme(self, timeout=defaults.READ_TIMEOUT, default=None):
+        ''' Checks terminal for light/dark theme information,
+            see detection.get_theme().
+        '''
+        theme = detection._find_theme(default)
+        if theme is Ellipsis:  # try xterm query
+            colors = self.get_color('background', timeout=timeout)
+            theme = detection._theme_from_colors(colors, default)
+        return theme
+
+    def get_title(self, mode='title', timeout=.2):
+        ''' Return the terminal title, see detection.get_title().
+
+            Returns:
+                title string, or None if not received.
+        '''
+        mode = detection._query_mode_map.get(mode, mode)
+        reply = ']L' if str(mode) == '20' else ']l'
+        resp = self.query(f'{CSI}{mode}t', reply, timeout=timeout)
+        if resp is not None:
+            return detection._parse_title(_strip_end(resp))
+
+
+def _strip_end(text):
+    ''' Remove the final character or string terminator of a reply. '''
+    return text[:-2] if text.endswith(ST) else text[:-1]
@@ -11,6 +11,7 @@
 '''
 import sys, os
 import logging
+import re
 
 import env
 
@@ -29,6 +30,7 @@ is_xterm = env.XTERM_VERSION.bool  # the real thing
 log = logging.getLogger(__name__)
 os_name = os.name  # frequent use
 _sized_char_support = is_xterm or env.TERM.startswith('konsole')
+_cache_key = None  # of this terminal session, when caching is enabled
 
 
 if os_name == 'posix':  # Tron leotards
@@ -92,6 +94,10 @@ def init(using_terminfo=False, _stream=sys.stdout, _basic_palette=()):
                 - ``TERM``, ``ANSICON``, ``COLORTERM`` configuration variables
                 - Are standard output streams wrapped by colorama on Windows?
 
+        When the ``PY_CONSOLE_CACHE`` environment variable is set,
+        results are saved under ``$XDG_CACHE_HOME/console`` and reused by
+        later processes in the same terminal session, without querying it.
+
         Arguments:
             using_terminfo:     2B || !2B  # that is the question…
             _stream:            Which output file to check: stdout, stderr
@@ -111,30 +117,49 @@ def init(using_terminfo=False, _stream=sys.stdout, _basic_palette=()):
 
     # find terminal capability level - given preferences and environment
     if color_is_forced() or (not color_is_disabled() and is_a_tty(stream=_stream)):
-        global color_sep  # makes available
+        global color_sep, _cache_key  # makes available
+
+        if env.PY_CONSOLE_CACHE.truthy:
+            _cache_key = _get_cache_key(using_terminfo, _stream)
+        entry = _read_cache(_cache_key) if _cache_key else None
+        if entry:
+            try:
+                level = TermLevel(entry['level'])
+                color_sep = entry['color_sep']
+                pal_name = entry['pal_name']
+                _basic_palette = tuple(map(tuple, entry['basic_palette']))
+                log.debug('using cached detection from %s', _get_cache_path())
+            except (KeyError, TypeError, ValueError) as err:
+                log.debug('cached detection invalid: %r', err)
+                level = entry = None
+
+        if not entry:
+            if using_terminfo:
+                if (not env.PY_CONSOLE_USE_TERMINFO.truthy  # set via ssh, not manually
+                    and env.LC_TERMINAL == 'iTerm2'):  # a recent iterm
+                    log.debug('ssh under iTerm2, skipping terminfo detection.')
+                    level, color_sep = TermLevel.ANSI_DIRECT, ':'  # upgrayyed
+                else:
+                    level, color_sep = detect_terminal_level_terminfo()
+                if level >= TermLevel.ANSI_BASIC:
+                    pal_name, _basic_palette = _find_basic_palette_from_term(env.TERM)
 
-        if using_terminfo:
-            if (not env.PY_CONSOLE_USE_TERMINFO.truthy  # set via ssh, not manually
-                and env.LC_TERMINAL == 'iTerm2'):  # a recent iterm
-                log.debug('ssh under iTerm2, skipping terminfo detection.')
-                level, color_sep = TermLevel.ANSI_DIRECT, ':'  # upgrayyed
-            else:
-                level, color_sep = detect_terminal_level_terminfo()
-            if level >= TermLevel.ANSI_BASIC:
-                pal_name, _basic_palette = _find_basic_palette_from_term(env.TERM)
+            if level is None:  # didn't occur, fall back to platform inspection
+                level, color_sep = detect_terminal_level()
 
-        if level is None:  # didn't occur, fall back to platform inspection
-            level, color_sep = detect_terminal_level()
+            # find the platform-dependent 16-color basic palette
+            if level and not using_terminfo:
+                pal_name, _basic_palette = _find_basic_palette_from_os(_stream)
+
+            if _cache_key:
+                _write_cache(_cache_key, level=int(level), color_sep=color_sep,
+                             pal_name=pal_name, basic_palette=_basic_palette)
 
         if level >= TermLevel.ANSI_DIRECT:  # check for webcolors
             try: import webcolors
             except ImportError: pass
         log.debug(f'webcolors: {bool(webcolors)}')
 
-        # find the platform-dependent 16-color basic palette
-        if level and not using_terminfo:
-            pal_name, _basic_palette = _find_basic_palette_from_os(_stream)
-
         log.debug('Basic palette: %r %r', pal_name, _basic_palette)
         if _basic_palette:
             from .proximity import build_color_tables
@@ -145,6 +170,77 @@ def init(using_terminfo=False, _stream=sys.stdout, _basic_palette=()):
     return level
 
 
+def _get_cache_key(using_terminfo, stream=sys.stdout):
+    ''' Identify the terminal session that detection results apply to, by
+        its environment, tty device, and session id.  None if not a tty.
+    '''
+    try:
+        tty_name = os.ttyname(stream.fileno())
+        session = os.getsid(0)
+    except (AttributeError, OSError, ValueError):  # not posix, not a tty
+        return None
+
+    return ' '.join(repr(part) for part in (
+        __version__, using_terminfo, tty_name, session,
+        env.TERM.value, env.COLORTERM.value, env.TERM_PROGRAM.value,
+        env.LC_TERMINAL.value, env.PY_CONSOLE_COLOR_SEP.value,
+    ))
+
+
+def _get_cache_path():
+    cache_home = env.XDG_CACHE_HOME.value or os.path.expanduser('~/.cache')
+    return os.path.join(cache_home, 'console', 'detection.json')
+
+
+def _load_cache():
+    import json  # defer
+
+    try:
+        with open(_get_cache_path(), encoding='utf8') as infile:
+            cache = json.load(infile)
+    except (OSError, ValueError) as err:
+        log.debug('detection cache not loaded: %s', err)
+        cache = None
+    return cache if isinstance(cache, dict) else {}
+
+
+def _read_cache(key):
+    ''' Returns the cached results for the key, unless missing or expired. '''
+    from time import time  # defer
+
+    entry = _load_cache().get(key)
+    if (isinstance(entry, dict) and
+        time() - entry.get('time', 0) < defaults.DETECTION_CACHE_TTL):
+        return entry
+
+
+def _write_cache(key, **results):
+    ''' Save results under the key, dropping the oldest sessions over
+        the limit.  Failures are logged and otherwise ignored.
+    '''
+    import json  # defer
+    from time import time
+
+    cache = _load_cache()
+    entry = cache.pop(key, None)  # reinsert as newest
+    if not isinstance(entry, dict):
+        entry = {}
+    entry.update(results, time=time())
+    cache[key] = entry
+    while len(cache) > defaults.DETECTION_CACHE_ENTRIES:
+        del cache[next(iter(cache))]
+
+    path = _get_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}'
+        with open(temp_path, 'w', encoding='utf8') as outfile:
+            json.dump(cache, outfile)
+        os.replace(temp_path, path)  # atomic
+    except OSError as err:
+        log.debug('detection cache not written: %s', err)
+
+
 def color_is_disabled(**envars):
     ''' Look for clues in environment, e.g.:
 
@@ -366,7 +462,11 @@ def _find_basic_palette_from_os(stream=sys.stdout):
             basic_palette = color_tables.vga_palette4
         else:  # Look harder by querying terminal; get_color may timeout
             try:  # TODO: this comparison could be much better:
-                colors = get_color('index', 2, stream=stream)
+                colors = ()
+                if _can_query_color():  # some hang, or echo the query
+                    # probe returns early on terminals that answer DA1 only
+                    answers = probe(('index', 2), stream=stream)
+                    colors = answers[('index', 2)] or ()
                 if colors[0][:2] == '85':
                     pal_name = 'solarized'
                     basic_palette = color_tables.solarized_dark_palette4
@@ -447,9 +547,78 @@ def _get_char():
         return sys.stdin.read(1)
 
 
+def _find_markers(*markers):
+    ''' Returns a function giving the end of the response in the data and
+        the end of its marker, or None.
+    '''
+    markers = tuple(marker.encode('ascii') for marker in markers)
+
+    def find_end(data):
+        found = [(index, index + len(marker)) for index, marker in
+                 ((data.find(marker), marker) for marker in markers)
+                 if index != -1]
+        return min(found) if found else None
+
+    return find_end
+
+
+def _read_chunk(infile, data, find_end, max_bytes):
+    ''' Read what has arrived of a terminal response onto data, returning
+        True when complete, with data trimmed to the response.
+
+        Reads in chunks through the file's buffer, taking from it only the
+        bytes up to the end, so input typed after the response is left
+        there for the program.  Files without a buffer to peek at are read
+        a byte at a time.
+    '''
+    buffer = getattr(infile, 'buffer', infile)
+    peek = getattr(buffer, 'peek', None)
+    start = len(data)
+    data += peek(1) if peek else os.read(infile.fileno(), 1)
+    if len(data) == start:  # closed
+        return True
+
+    done = True
+    found = find_end(data)
+    if found and found[0] <= max_bytes:  # marker consumed, not returned
+        length, consumed = found
+    elif len(data) >= max_bytes:
+        length = consumed = max_bytes
+    else:
+        length = consumed = len(data)
+        done = False
+
+    if peek:
+        buffer.read(consumed - start)
+    del data[length:]
+    return done
+
+
+def _read_response(infile, find_end, max_bytes, timeout=None):
+    ''' Read a terminal response with _read_chunk(), the timeout applying
+        to the response as a whole.  Returns the bytes read, partial if
+        the timeout passed.
+    '''
+    from select import select
+    from time import monotonic
+
+    fd = infile.fileno()
+    deadline = None if timeout is None else monotonic() + timeout
+    data = bytearray()
+    while True:
+        remaining = None if deadline is None else max(deadline - monotonic(), 0)
+        if not select((fd,), (), (), remaining)[0]:
+            log.debug('response not received in time, %s secs.', timeout)
+            break
+        if _read_chunk(infile, data, find_end, max_bytes):
+            break
+    return data
+
+
 def _read_until_select(infile=sys.stdin, max_bytes=20, end=RS, timeout=None):
     ''' Read a terminal response of up to a given max characters from stdin,
         with timeout.  POSIX only, files not compat with select on Windows.
+        Input following the response is left unread, see _read_chunk().
 
         Arguments:
             infile: file, stdin
@@ -457,31 +626,11 @@ def _read_until_select(infile=sys.stdin, max_bytes=20, end=RS, timeout=None):
             end: str, end of data marker, one or two chars.
             timeout: float secs, how long to wait until giving up.
     '''
-    from select import select
-    chars = []
-    read = infile.read  # shortcut
-    last_char = ''
     if not isinstance(end, tuple):
         end = (end,)
-    #~ log.debug('read: max_bytes=%s, end=%r, timeout %s …', max_bytes, end, timeout)
-
-    if select((infile,), (), (), timeout)[0]:  # wait until response or timeout
-        #~ log.debug('select output, start reading:')
-        while max_bytes:  # response: count down chars, stopping at 0
-            char = read(1)
-            # print(max_bytes, repr(char))
-            if char in end:  # single
-                break
-            if (last_char + char) in end:  # double char, i.e. ST
-                del chars[-1]  # rm end[0]
-                break
-            chars.append(char)
-            last_char = char
-            max_bytes -= 1
-    else:  # timeout
-        log.debug('response not received in time, %s secs.', timeout)
-
-    return ''.join(chars)
+    data = _read_response(infile, _find_markers(*end), max_bytes, timeout)
+    encoding = getattr(infile, 'encoding', None) or 'utf8'
+    return data.decode(encoding, 'replace')
 
 
 def _get_color_xterm(name, number=None, stream=sys.stdout, timeout=None):
@@ -490,13 +639,8 @@ def _get_color_xterm(name, number=None, stream=sys.stdout, timeout=None):
         Warning: likely to block on incompatible terminals, use timeout.
     '''
     colors = ()
-    if name == 'index' and isinstance(number, int):
-        color_code = '4;' + str(number)
-    else:
-        color_code = _COLOR_CODE_MAP.get(name)
-
-    if color_code:
-        query_sequence = f'{OSC}{color_code};?{ST}'
+    query_sequence = _get_color_query(name, number)
+    if query_sequence:
         #~ log.debug('query seq: %r', query_sequence)
         try:
             with TermStack(stream) as fd:
@@ -514,15 +658,31 @@ def _get_color_xterm(name, number=None, stream=sys.stdout, timeout=None):
             log.debug('see console.windows.get_color()')
         except termios.error as err:  # some "xterm" compats can't handle, haiku
             log.debug('get_position return value failed: %s', err)
-        else:  # parse response
-            colors = resp.partition(':')[2].split('/')
-            if colors == ['']:  # nuttin
-                colors = []  # empty on failure
-            colors = tuple(colors)
+        else:
+            colors = _parse_color(resp)
 
     return colors
 
 
+def _get_color_query(name, number=None):
+    ''' Returns the xterm color query sequence, or None if not known. '''
+    if name == 'index' and isinstance(number, int):
+        color_code = '4;' + str(number)
+    else:
+        color_code = _COLOR_CODE_MAP.get(name)
+
+    if color_code:
+        return f'{OSC}{color_code};?{ST}'
+
+
+def _parse_color(resp):
+    ''' Parse a color query response, e.g. "…;rgb:DEAD/BEEF/CAFE". '''
+    colors = resp.partition(':')[2].split('/')
+    if colors == ['']:  # nuttin
+        colors = []  # empty on failure
+    return tuple(colors)
+
+
 def _read_clipboard(
         source='c', encoding=None, max_bytes=defaults.MAX_CLIPBOARD_SIZE,
         timeout=.2
@@ -548,11 +708,17 @@ def _read_clipboard(
     except OSError:  # Winders
         log.debug('_read_clipboard not yet implemented by Windows.')
     else:
-        if resp:  # parse response
-            from base64 import b64decode
-            resp = b64decode(resp.split(';', 3)[-1])
-            if encoding:
-                resp = resp.decode(encoding)
+        resp = _parse_clipboard(resp, encoding)
+    return resp
+
+
+def _parse_clipboard(resp, encoding=None):
+    ''' Decode a clipboard query response, bytes unless encoding given. '''
+    if resp:
+        from base64 import b64decode
+        resp = b64decode(resp.split(';', 3)[-1])
+        if encoding:
+            resp = resp.decode(encoding)
     return resp
 
 
@@ -627,7 +793,17 @@ def get_color(name, number=None, stream=sys.stdout, timeout=defaults.READ_TIMEOU
             which may be different if they were customized.
     '''
     color = ()
+    if _can_query_color():
+        color = _get_color_xterm(name, number, stream=stream, timeout=timeout)
+
+    # Windows impl. uses its API, Terminal has begun support of xterm query
+    log.debug('%s %s color: %r', name, number, color)
+    return color
 
+
+def _can_query_color():
+    ''' Whether the terminal is thought to answer xterm color queries. '''
+    result = False
     if not is_a_tty(stream=sys.stdin):
         # skip this on posix/xterm when stdin is redirected—can't read answer!
         pass  # check here because Windows impl. does not need
@@ -635,11 +811,11 @@ def get_color(name, number=None, stream=sys.stdout, timeout=defaults.READ_TIMEOU
     elif sys.platform == 'darwin':  # check first
         if env.TERM_PROGRAM == 'iTerm.app':
             # supports, though returns only two chars per
-            color = _get_color_xterm(name, number, stream=stream, timeout=timeout)
+            result = True
 
     elif os_name == 'posix':
         if env.WSLENV or env.TERM_PROGRAM == 'vscode':
-            pass  # LSW, vscode on Linux don't support xterm query
+            pass  # LSW, vscode on Linux don't support xterm query
 
         elif env.TERM =='xterm' and sys.platform.startswith(
             ('freebsd', 'haiku')
@@ -647,11 +823,9 @@ def get_color(name, number=None, stream=sys.stdout, timeout=defaults.READ_TIMEOU
             pass  # defective xterms, TODO: probably should opt-in instead
 
         elif env.TERM.startswith('xterm'):
-            color = _get_color_xterm(name, number, stream=stream, timeout=timeout)
+            result = True
 
-    # Windows impl. uses its API, Terminal has begun support of xterm query
-    log.debug('%s %s color: %r', name, number, color)
-    return color
+    return result
 
 
 def get_position(fallback=defaults.CURSOR_POS_FALLBACK):
@@ -661,7 +835,7 @@ def get_position(fallback=defaults.CURSOR_POS_FALLBACK):
         Returns:
             tuple(int): (x, y) | (0, 0)  - fallback, if an error occurred.
     '''
-    values, resp = None, ''
+    resp = ''
     try:
         with TermStack() as fd:
             termios.tcflush(fd, termios.TCIFLUSH)   # clear input
@@ -677,7 +851,12 @@ def get_position(fallback=defaults.CURSOR_POS_FALLBACK):
         log.debug('get_position return value failed: %s', err)
         return fallback
 
-    # parse response
+    return _parse_position(resp)
+
+
+def _parse_position(resp):
+    ''' Parse a cursor position report, returning (x, y) or None. '''
+    values = None
     resp = resp.lstrip(CSI)
     try:  # reverse
         values = tuple( int(token) for token in resp.partition(';')[::-2] )
@@ -687,6 +866,131 @@ def get_position(fallback=defaults.CURSOR_POS_FALLBACK):
     return values
 
 
+_probe_queries = dict(
+    answerback=ENQ,
+    position=CSI + '6n',
+    icon=CSI + '20t',
+    title=CSI + '21t',
+    foreground=f'{OSC}10;?{ST}',
+    fg=f'{OSC}10;?{ST}',
+    background=f'{OSC}11;?{ST}',
+    bg=f'{OSC}11;?{ST}',
+)
+_probe_sentinel = CSI + 'c'  # DA1, answered in order by nearly all terminals
+_probe_sentinel_finder = re.compile(rb'\x1b\[\?[0-9;]*c').search
+_probe_reply_finder = re.compile(
+    r'\x1b\[\?[0-9;]*c'                                          # DA1
+    r'|\x1b\[(?P<row>[0-9]+);(?P<col>[0-9]+)R'                    # position
+    r'|\x1b\](?P<color>4;[0-9]+|1[01]);rgb:(?P<rgb>[0-9a-fA-F/]*)'
+    r'(?:\x07|\x1b\\)'                                            # colors
+    r'|\x1b\](?P<label>[lL])(?P<text>[^\x07\x1b]*)(?:\x07|\x1b\\)'  # titles
+)
+_probe_reply_names = {'10': ('foreground', 'fg'), '11': ('background', 'bg'),
+                      'l': ('title',), 'L': ('icon',)}
+
+def probe(*queries, stream=sys.stdout, timeout=defaults.READ_TIMEOUT):
+    ''' Ask the terminal several questions at once.
+        The queries are written together followed by a Device Attributes
+        request, which the terminal answers last, so all replies are read
+        in one pass, waiting at most one round-trip or the timeout.
+
+        Arguments:
+            queries: str, one of ('answerback', 'position', 'title', 'icon',
+                                  'foreground', 'fg', 'background', 'bg')
+                     or tuple, ('index', number) for a palette color.
+            stream: file, to write queries to.
+            timeout: float secs, how long to wait for the replies.
+
+        Returns:
+            dict: of each query to its parsed reply, None if not answered.
+            Colors are tuples of hex strings as with get_color(), position
+            an (x, y) tuple as with get_position().
+
+        Example::
+
+            >>> probe('background', ('index', 2), 'position')
+            {'background': ('0000', '0000', '0000'),
+             ('index', 2): ('4e4d', '9a9a', '0605'), 'position': (1, 24)}
+    '''
+    sequences = _get_probe_sequences(queries)
+    resp = ''
+    if is_a_tty(stream=sys.stdin):  # else can't read answer
+        try:
+            with TermStack() as fd:
+                termios.tcflush(fd, termios.TCIFLUSH)   # clear input
+                tty.setcbreak(fd, termios.TCSANOW)      # shut off echo
+                stream.write(''.join(sequences) + _probe_sentinel)
+                stream.flush()
+                log.debug('about to read probe responses…')
+                resp = _read_until_sentinel(timeout=timeout)
+        except AttributeError:
+            log.debug('warning - no .fileno() attribute was found on the stream.')
+        except OSError:  # Winders
+            log.debug('probe not yet implemented by Windows.')
+        except termios.error as err:  # some "xterm" compats can't handle
+            log.debug('probe failed: %s', err)
+
+    results = _parse_probe_replies(queries, resp)
+    log.debug('%r', results)
+    return results
+
+
+def _get_probe_sequences(queries):
+    ''' Returns the query sequences for probe(), raising ValueError on an
+        unknown one.
+    '''
+    sequences = []
+    for query in queries:
+        if type(query) is tuple and query[0] == 'index':
+            sequences.append(f'{OSC}4;{int(query[1])};?{ST}')
+        elif query in _probe_queries:
+            sequences.append(_probe_queries[query])
+        else:
+            raise ValueError(f'unknown query: {query!r}')
+    return sequences
+
+
+def _find_probe_end(data):
+    match = _probe_sentinel_finder(data)
+    return (match.end(), match.end()) if match else None
+
+
+def _read_until_sentinel(infile=sys.stdin, timeout=None):
+    ''' Read replies from the terminal until the probe sentinel's reply
+        arrives, or the timeout passes in total.
+    '''
+    data = _read_response(infile, _find_probe_end,
+                          defaults.MAX_CLIPBOARD_SIZE, timeout)
+    return data.decode('utf8', 'replace')
+
+
+def _parse_probe_replies(queries, resp):
+    ''' Sort replies to the given queries out of the response text. '''
+    answers, leftovers, position = {}, [], 0
+    for match in _probe_reply_finder.finditer(resp):
+        leftovers.append(resp[position:match.start()])
+        position = match.end()
+        groups = match.groupdict()
+
+        if groups['row']:  # x, y order
+            answers['position'] = (int(groups['col']), int(groups['row']))
+        elif groups['color']:
+            colors = tuple(groups['rgb'].split('/')) if groups['rgb'] else ()
+            code = groups['color']
+            if code.startswith('4;'):
+                answers[('index', int(code[2:]))] = colors
+            else:
+                for name in _probe_reply_names[code]:
+                    answers[name] = colors
+        elif groups['label']:
+            for name in _probe_reply_names[groups['label']]:
+                answers[name] = groups['text']
+    leftovers.append(resp[position:])
+
+    answers['answerback'] = ''.join(leftovers) or None
+    return {query: answers.get(query) for query in queries}
+
+
 def get_size(fallback=defaults.TERM_SIZE_FALLBACK):
     ''' Convenience copy of `shutil.get_terminal_size
         <https://docs.python.org/3/library/shutil.html#shutil.get_terminal_size>`_
@@ -739,13 +1043,16 @@ def get_title(mode='title'):
     except AttributeError:  # no .fileno()
         return title
 
-    # parse response
-    title = resp.lstrip(OSC)[1:].rstrip(ESC)
-
+    title = _parse_title(resp)
     log.debug('%r', title)
     return title
 
 
+def _parse_title(resp):
+    ''' Parse a title or icon label report, "OSC l|L text ST". '''
+    return resp.lstrip(OSC)[1:].rstrip(ESC)
+
+
 def get_theme(timeout=defaults.READ_TIMEOUT, default=None):
     ''' Checks terminal for light/dark theme information.
 
@@ -762,11 +1069,31 @@ def get_theme(timeout=defaults.READ_TIMEOUT, default=None):
         Returns:
             str, None:  'dark', 'light', or None if no information.
     '''
+    theme = _find_theme(default)
+    if theme is Ellipsis:  # try xterm query
+        colors = get_color('background', timeout=timeout)  # bg wins
+        theme = _theme_from_colors(colors, default)
+
+    log.debug('%r', theme)
+    return theme
+
+
+def _find_theme(default=None):
+    ''' Find the theme without asking the terminal.
+
+        Returns:
+            str, None:  as get_theme, or Ellipsis if a query is needed.
+    '''
     theme = default
     COLORFGBG = env.COLORFGBG.value
     log.debug('COLORFGBG: %s', COLORFGBG)
 
-    if COLORFGBG:
+    entry = _read_cache(_cache_key) if _cache_key else None
+    if entry and entry.get('theme'):
+        theme = entry['theme']
+        log.debug('using cached theme')
+
+    elif COLORFGBG:
         FG, _, BG = COLORFGBG.partition(';')     # TODO: rxvt default;default
         theme = 'dark' if BG < '8' else 'light'  # background wins
 
@@ -775,18 +1102,24 @@ def get_theme(timeout=defaults.READ_TIMEOUT, default=None):
         if TERM =='xterm' and sys.platform.startswith('freebsd'):  # console
             theme = 'dark'
         elif TERM.startswith('xterm'):
-            # try xterm query - find average across rgb
-            colors = get_color('background', timeout=timeout)  # bg wins
-            if colors:
-                colors = tuple(int(hexclr[:2], 16) for hexclr in colors)
-                avg = sum(colors) / len(colors)
-                theme = 'dark' if avg < 128 else 'light'
+            theme = Ellipsis
         elif TERM.startswith(('linux', 'fbterm')):  # vga console
             theme = 'dark'
         elif TERM.startswith('vt'):  # openbsd, hardware
             theme = 'dark'
 
-    log.debug('%r', theme)
+    return theme
+
+
+def _theme_from_colors(colors, default=None):
+    ''' Light or dark from background colors, the average across rgb. '''
+    theme = default
+    if colors:
+        colors = tuple(int(hexclr[:2], 16) for hexclr in colors)
+        avg = sum(colors) / len(colors)
+        theme = 'dark' if avg < 128 else 'light'
+        if _cache_key:
+            _write_cache(_cache_key, theme=theme)
     return theme
 
 
@@ -5,6 +5,9 @@
     Singletons that mimic the style/palette/entry interface but do not print
     ANSI control sequences, i.e.: for use when a terminal doesn't support them.
 '''
+import sys
+
+from .meta import defaults
 
 
 class _EmptyAttribute(str):
@@ -26,6 +29,23 @@ class _EmptyAttribute(str):
     def __call__(self, text, *args, **kwargs):
         return text
 
+    def iter_lines(self, source, chunk_size=defaults.STREAM_CHUNK_SIZE):
+        ''' Passes text through unchanged. '''
+        if isinstance(source, str):
+            yield source
+        elif hasattr(source, 'readline'):  # as core
+            yield from iter(lambda: source.readline(chunk_size), '')
+        else:
+            yield from source
+
+    def stream(self, source, outfile=None,
+               chunk_size=defaults.STREAM_CHUNK_SIZE):
+        write = (outfile or sys.stdout).write
+        chars_written = 0
+        for output in self.iter_lines(source, chunk_size=chunk_size):
+            chars_written += write(output) or 0
+        return chars_written
+
     def __enter__(self):
         return self
 
@@ -50,10 +50,17 @@ trove_classifiers = [
 
 defaults = _Namespace(
     CURSOR_POS_FALLBACK = (0, 0),
+    DETECTION_CACHE_ENTRIES = 32,  # terminal sessions remembered
+    DETECTION_CACHE_TTL = 86400,  # seconds a cached detection is valid
+    ESC_TIMEOUT = .050,  # secs until a lone ESC is taken as the key
+    MAX_CACHED_MOVES = 16384,  # rendered cursor positions per template
     MAX_CLIPBOARD_SIZE = 65536,  # 64k by default
+    MAX_COMPOSED_STYLES = 1024,  # interned results of addition
     MAX_NL_SEARCH = 4096,
+    MAX_UNKNOWN_NAMES = 1024,  # remembered per palette
     MAX_URL_LEN = 2083,
     MAX_VAL_LEN = 250,
     READ_TIMEOUT = .200,  # select read timeout in float seconds
+    STREAM_CHUNK_SIZE = 65536,  # max chars read at once when styling files
     TERM_SIZE_FALLBACK = (80, 24),
 )
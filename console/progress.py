@@ -21,7 +21,7 @@ from . import fg, bg, fx, sc, term_level as _term_level
 from .constants import TermLevel
 from .detection import detect_unicode_support, get_size, os_name
 from .disabled import empty as _empty
-from .utils import len_stripped, notify_progress
+from .utils import cell_width, len_stripped, notify_progress
 
 DEF_TOTAL = 1
 DEF_WIDTH = 24+6
@@ -297,7 +297,10 @@ class ProgressBar:
         _icons = self.icons
         if self.width < self._min_width:
             self.width = self._min_width
-        self.padding = len(_icons[_if]) + len(_icons[_il])  # bookends
+        # bookends, icons may be wide:
+        self.padding = cell_width(_icons[_if]) + cell_width(_icons[_il])
+        self._icon_cells = (max(cell_width(_icons[_ic]), 1),
+                            max(cell_width(_icons[_ie]), 1))
         self._bwidth = self._set_bar_width()
         if self._clear_left is True:
             self.clear_left = self._clear_left  # render
@@ -370,7 +373,7 @@ class ProgressBar:
                 f'⇱ r:{self.ratio:5.3f} ncc:{self._num_complete_chars:2d} '
                 f'rm:{self._remainder!r} '
                 f'nec:{self._num_empty_chars:2d} '
-                f'l:{len_stripped(rendered.lstrip(chr(13)))}'  # '\r' aka CR
+                f'l:{len_stripped(rendered.lstrip(chr(13)), cells=True)}'  # CR
             )
             self._cached_str = rendered = ''.join(pieces)  # again :-/
 
@@ -494,18 +497,23 @@ class ProgressBar:
         self._lbl = label
         # dynamic resizing of the bar, depending on label length:
         if label and label_mode != 'internal':
-            self._bwidth = self._bwidth_base - len(label_unstyled) # or label)
+            self._bwidth = self._bwidth_base - cell_width(label_unstyled)
         else:
             self._bwidth = self._bwidth_base
 
     def _render(self):
         ''' Standard rendering of bar graph. '''
-        cm_chars = (    # completed
-            self._comp_style(self.icons[_ic] * self._num_complete_chars)
-        )
-        em_chars = (    # empty
-            self._empt_style(self.icons[_ie] * self._num_empty_chars)
-        )
+        ncc, nec = self._num_complete_chars, self._num_empty_chars
+        cm_cells, em_cells = self._icon_cells
+        if cm_cells == em_cells == 1:
+            cm_icons = self.icons[_ic] * ncc
+            em_icons = self.icons[_ie] * nec
+        else:  # wide icons, counts are in cells, fill any gap with space
+            cm_icons = self.icons[_ic] * (ncc // cm_cells)
+            em_icons = (self.icons[_ie] * (nec // em_cells) +
+                        ' ' * (ncc % cm_cells + nec % em_cells))
+        cm_chars = self._comp_style(cm_icons)   # completed
+        em_chars = self._empt_style(em_icons)   # empty
         return f'{self._first}{cm_chars}{em_chars}{self._last}{self._lbl}'
 
     def _render_with_internal_label(self):
@@ -24,12 +24,56 @@
     Note:
         An experiment was done using a more accurate CIELAB distance algorithm,
         but the solution was quite heavy and therefore removed.
+        It's back as OKLab below, made cheap by converting the tables once.
+
+    Downgrade methods:
+
+        - ``'euclid'`` - a linear scan over the color table, the default.
+        - ``'lookup'`` - a read from a precomputed index of the RGB cube at a
+          reduced bit depth, built lazily per table.
+          Same results as the scan: cells straddling a boundary between
+          nearest colors are marked and searched instead, about 40% of
+          colors with color_table8 and 20% with color_table4 at the default
+          depth.
+          The first lookup stalls while the index is built, about a second
+          for color_table8 in pure Python, see build_lookup_index().
+        - ``'analytic'`` - computes the nearest cube and grayscale entries of
+          color_table8 arithmetically, then compares them with the basic
+          16 only.  Same results as the scan, other tables are scanned.
+        - ``'oklab'`` - a perceptual scan, distance measured in the
+          `OKLab <https://bottosson.github.io/posts/oklab/>`_ color space.
+          Better picks for dark colors, at a similar cost to euclid,
+          see bench/oklab.py.
 '''
+import os
+import sys
+from array import array
+from functools import lru_cache
+from operator import add, sub
+
 from . import color_tables
 
 
+LOOKUP_BITS = 5     # per channel, 32k entries per index
+_LOOKUP_MAGIC = b'CNLI2'
+_LOOKUP_MIXED = 0xffff  # cell entry, colors in it have differing nearest
+_CUBE_VALUES = (0x00, 0x5f, 0x87, 0xaf, 0xd7, 0xff)
+# nearest cube level per channel value, lower level wins a tie:
+_cube_levels = bytes(
+    min(range(6), key=lambda level: abs(_CUBE_VALUES[level] - value))
+    for value in range(256)
+)
+
 color_table4 = []   # 16 colors
 color_table8 = []   # 265 colors
+_lookup_indexes = {}  # id(table): (bits, index) - module tables only
+_numpy = Ellipsis     # not yet imported
+_oklab_tables = {}    # id(table): OKLab coordinates of table entries
+# sRGB transfer function, decoded to linear light per channel value:
+_srgb_to_linear = tuple(
+    value / 3294.6 if value <= 10 else ((value / 255 + .055) / 1.055) ** 2.4
+    for value in range(256)
+)
 
 
 def _build_color_table(base, extended=True):
@@ -39,7 +83,7 @@ def _build_color_table(base, extended=True):
 
     if extended:
         # colors 16..232: the 6x6x6 color cube
-        valuerange = (0x00, 0x5f, 0x87, 0xaf, 0xd7, 0xff)
+        valuerange = _CUBE_VALUES
 
         for i in range(217):
             r = valuerange[(i // 36) % 6]
@@ -65,14 +109,261 @@ def build_color_tables(base=color_tables.vga_palette4):
 
     # make sure we have them before clearing
     table4 = _build_color_table(base, extended=False)
-    if table4:
+    if table4 and table4 != color_table4:
         color_table4.clear()
         color_table4.extend(table4)
+        _lookup_indexes.pop(id(color_table4), None)  # stale, rebuild on use
+        _oklab_tables[id(color_table4)] = [rgb_to_oklab(*rgb) for rgb in table4]
 
     table8 = _build_color_table(base)
-    if table8:
+    if table8 and table8 != color_table8:
         color_table8.clear()
         color_table8.extend(table8)
+        _lookup_indexes.pop(id(color_table8), None)
+        _oklab_tables[id(color_table8)] = [rgb_to_oklab(*rgb) for rgb in table8]
+
+
+@lru_cache(maxsize=4096)
+def rgb_to_oklab(r, g, b):
+    ''' Convert an 8-bit sRGB color to OKLab coordinates, memoized.
+
+        Arguments:
+            r, g, b:    int - of range 0…255, clamped.
+
+        Returns:
+            tuple(float): (L, a, b)
+    '''
+    to_linear = _srgb_to_linear
+    r = to_linear[0 if r < 0 else 255 if r > 255 else r]
+    g = to_linear[0 if g < 0 else 255 if g > 255 else g]
+    b = to_linear[0 if b < 0 else 255 if b > 255 else b]
+
+    # to cone response, then cube root
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+
+    return (
+        0.2104542553 * l + 0.7936177850 * m - 0.0040720342 * s,
+        1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+        0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s,
+    )
+
+
+def _get_lookup_slack(color_table, width):
+    ''' How much nearer than entry i entry j may come, anywhere in a cell,
+        than at its center, less one where j comes later and so loses a tie.
+        The distance difference is linear per channel, so greatest at a
+        corner.
+    '''
+    down = width >> 1           # center to the low edge of a cell
+    up = width - 1 - down       # and to the high edge
+    slack = []
+    for i, ivalues in enumerate(color_table):
+        row = []
+        for j, jvalues in enumerate(color_table):
+            spread = 0
+            for ivalue, jvalue in zip(ivalues, jvalues):
+                diff = jvalue - ivalue
+                spread += diff * up if diff > 0 else -diff * down
+            row.append(spread + spread - (j > i))
+        row[i] = -1  # itself
+        slack.append(row)
+    return slack
+
+
+def _build_lookup_index(color_table, bits):
+    ''' Compute the nearest color index at the middle of each cell of a
+        reduced RGB cube, or _LOOKUP_MIXED where another entry is nearer to
+        some color in the cell.  Squared channel distances are separable,
+        so they are computed once per level and summed per cell.
+    '''
+    numpy = _get_numpy()
+    if numpy:
+        return _build_lookup_index_numpy(numpy, color_table, bits)
+
+    levels = 1 << bits
+    width = 1 << (8 - bits)
+    centers = [level * width + (width >> 1) for level in range(levels)]
+    rdists = [[(c - values[0]) ** 2 for values in color_table] for c in centers]
+    gdists = [[(c - values[1]) ** 2 for values in color_table] for c in centers]
+    bdists = [[(c - values[2]) ** 2 for values in color_table] for c in centers]
+    slack = _get_lookup_slack(color_table, width)
+
+    index = array('H')
+    append = index.append
+    for rrow in rdists:
+        for grow in gdists:
+            rgrow = list(map(add, rrow, grow))
+            for brow in bdists:
+                distances = list(map(add, rgrow, brow))
+                shortest = min(distances)
+                nearest = distances.index(shortest)  # first wins
+                if min(map(sub, distances, slack[nearest])) > shortest:
+                    append(nearest)  # for the whole cell
+                else:
+                    append(_LOOKUP_MIXED)
+    return index
+
+
+def _build_lookup_index_numpy(numpy, color_table, bits, _chunk_size=4096):
+    ''' _build_lookup_index() with NumPy, in chunks of cells. '''
+    levels = 1 << bits
+    width = 1 << (8 - bits)
+    centers = numpy.arange(levels) * width + (width >> 1)
+    table = numpy.array(color_table, dtype=numpy.int64)
+    channel_dists = (centers[:, None, None] - table[None]) ** 2  # level, entry
+    rdists, gdists, bdists = channel_dists.transpose(2, 0, 1)
+    slack = numpy.array(_get_lookup_slack(color_table, width))
+
+    index = numpy.empty(levels ** 3, dtype=numpy.uint16)
+    for start in range(0, len(index), _chunk_size):
+        cells = numpy.arange(start, min(start + _chunk_size, len(index)))
+        distances = (rdists[cells >> (bits + bits)] +
+                     gdists[(cells >> bits) & (levels - 1)] +
+                     bdists[cells & (levels - 1)])
+        nearest = distances.argmin(axis=1)  # first wins
+        shortest = distances[numpy.arange(len(cells)), nearest]
+        whole = (distances - slack[nearest]).min(axis=1) > shortest
+        index[cells] = numpy.where(whole, nearest, _LOOKUP_MIXED)
+    return array('H', index.tobytes())
+
+
+def _get_lookup_index(color_table):
+    ''' Return the lookup index for a module color table, building on first
+        use.
+    '''
+    try:
+        return _lookup_indexes[id(color_table)]
+    except KeyError:
+        entry = _lookup_indexes[id(color_table)] = (
+            LOOKUP_BITS, _build_lookup_index(color_table, LOOKUP_BITS)
+        )
+        return entry
+
+
+def build_lookup_index(color_table=None, bits=LOOKUP_BITS, path=None):
+    ''' Build the nearest-color lookup index of a color table ahead of time,
+        for use with ``method='lookup'``.
+
+        Building is slow in pure Python, about 1.2 seconds for color_table8
+        at the default depth and eight times that per extra bit, 0.15 with
+        NumPy.  Build ahead with a path to avoid stalling on first lookup.
+
+        Arguments:
+            color_table:    color_table4 or color_table8 (default)
+            bits:           int - per channel bit depth, 1…8.
+                            Memory used is 2 ** (bits * 3 + 1) bytes.
+            path:           str - optional file to persist the index to.
+                            It is loaded instead when it exists and was
+                            built from the same table at the same depth.
+
+        Returns:
+            array('H'): the index, of nearest color indexes per cell or
+                        _LOOKUP_MIXED.
+    '''
+    if not color_table:
+        if not color_table8:
+            build_color_tables()
+        color_table = color_table8
+    if color_table is not color_table4 and color_table is not color_table8:
+        raise ValueError('only the module color tables may be indexed.')
+    if not 0 < bits < 9:
+        raise ValueError(f'bits: {bits!r} out of range 1…8.')
+
+    header = (_LOOKUP_MAGIC + bytes((bits,)) + sys.byteorder[:1].encode() +
+              bytes(value for values in color_table for value in values))
+    index = None
+    if path:
+        try:
+            with open(path, 'rb') as infile:
+                data = infile.read()
+            if data.startswith(header):
+                index = array('H')
+                index.frombytes(data[len(header):])
+                if len(index) != 1 << (bits * 3):  # truncated
+                    index = None
+        except (OSError, ValueError):  # ValueError, odd length
+            index = None
+
+    if index is None:
+        index = _build_lookup_index(color_table, bits)
+        if path:  # a reader never sees it partly written
+            temp_path = f'{path}.{os.getpid()}'
+            with open(temp_path, 'wb') as outfile:
+                outfile.write(header)
+                index.tofile(outfile)
+            os.replace(temp_path, path)  # atomic
+
+    _lookup_indexes[id(color_table)] = (bits, index)
+    return index
+
+
+def _find_nearest_color_index_analytic(r, g, b, color_table):
+    ''' Closed-form search of color_table8, layout as built above:
+        0…15 basic, 16…231 cube (232 a duplicate of 16), 233…255 grays.
+        Candidates are compared in index order so the lowest index wins ties,
+        as with the scan.
+    '''
+    shortest_distance = 257*257*3
+    index = 0
+    for i in range(16):  # platform basic colors
+        values = color_table[i]
+        rd = r - values[0]
+        gd = g - values[1]
+        bd = b - values[2]
+        this_distance = (rd * rd) + (gd * gd) + (bd * bd)
+        if this_distance < shortest_distance:
+            index = i
+            shortest_distance = this_distance
+
+    # cube - channels are independent, so the nearest level of each
+    ri, gi, bi = _cube_levels[r], _cube_levels[g], _cube_levels[b]
+    rd = r - _CUBE_VALUES[ri]
+    gd = g - _CUBE_VALUES[gi]
+    bd = b - _CUBE_VALUES[bi]
+    this_distance = (rd * rd) + (gd * gd) + (bd * bd)
+    if this_distance < shortest_distance:
+        index = 16 + (ri * 36) + (gi * 6) + bi
+        shortest_distance = this_distance
+
+    # grays, 8 + step * 10 for steps 1…23 - nearest to the mean of channels
+    step = (r + g + b - 24) // 30  # floor of (mean - 8) / 10
+    for step in (step, step + 1):
+        step = 1 if step < 1 else 23 if step > 23 else step
+        value = 8 + step * 10
+        rd = r - value
+        gd = g - value
+        bd = b - value
+        this_distance = (rd * rd) + (gd * gd) + (bd * bd)
+        if this_distance < shortest_distance:
+            index = 232 + step
+            shortest_distance = this_distance
+
+    return index
+
+
+def _find_nearest_color_index_oklab(r, g, b, color_table):
+    ''' Scan table in OKLab space, lowest index wins a tie. '''
+    table = _oklab_tables.get(id(color_table))
+    if table is None:  # not a module table, convert on the fly
+        table = [rgb_to_oklab(*values) for values in color_table]
+
+    lightness, a, b = rgb_to_oklab(r, g, b)
+    shortest_distance = 3.0  # greater than black to white squared
+    index = 0
+    for i, values in enumerate(table):
+        ld = lightness - values[0]
+        ad = a - values[1]
+        bd = b - values[2]
+
+        this_distance = (ld * ld) + (ad * ad) + (bd * bd)
+
+        if this_distance < shortest_distance:  # closer
+            index = i
+            shortest_distance = this_distance
+
+    return index
 
 
 def find_nearest_color_index(r, g, b, color_table=None, method='euclid'):
@@ -83,6 +374,9 @@ def find_nearest_color_index(r, g, b, color_table=None, method='euclid'):
             r:    int - of range 0…255
             g:    int - of range 0…255
             b:    int - of range 0…255
+            color_table:    list of rgb tuples, defaults to color_table8
+            method:         str - 'euclid', 'lookup', 'analytic',
+                            or 'oklab', see above.
 
         Returns:
             int, None: index, or None on error.
@@ -94,6 +388,27 @@ def find_nearest_color_index(r, g, b, color_table=None, method='euclid'):
             build_color_tables()
         color_table = color_table8
 
+    if method == 'lookup':
+        if ((color_table is color_table8 or color_table is color_table4)
+            and not (r | g | b) >> 8):  # in 0…255, else scan below
+            bits, lookup_index = _get_lookup_index(color_table)
+            shift = 8 - bits
+            index = lookup_index[
+                (r >> shift) << (bits + bits) | (g >> shift) << bits | b >> shift
+            ]
+            if index != _LOOKUP_MIXED:
+                return index
+            if color_table is color_table8:  # exact, faster than the scan
+                return _find_nearest_color_index_analytic(r, g, b, color_table)
+            index = 0
+    elif method == 'analytic':
+        if color_table is color_table8 and not (r | g | b) >> 8:
+            return _find_nearest_color_index_analytic(r, g, b, color_table)
+    elif method == 'oklab':
+        return _find_nearest_color_index_oklab(r, g, b, color_table)
+    elif method != 'euclid':
+        raise ValueError(f'method: {method!r} was unrecognized.')
+
     for i, values in enumerate(color_table):
         rd = r - values[0]
         gd = g - values[1]
@@ -134,3 +449,104 @@ def find_nearest_color_hexstr(hexdigits, color_table=None, method='euclid'):
     return find_nearest_color_index(*triplet,
                                     color_table=color_table,
                                     method=method)
+
+
+def _get_numpy():
+    ''' Import NumPy on first use, it's optional and heavy. '''
+    global _numpy
+    if _numpy is Ellipsis:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+def _find_nearest_color_indexes_numpy(numpy, values, color_table, chunk_size):
+    ''' Scan the table for an (N, 3) array of colors at once. '''
+    # |v - t|² = |v|² - 2v·t + |t|², first term is constant per row.
+    # Small ints are exact as floats, so ties resolve as with the scan.
+    # Chunked to bound the size of the distance matrix.
+    table = numpy.array(color_table, dtype=numpy.float64)
+    table_t = table.T * -2
+    table_sq = (table * table).sum(axis=1)
+    values = values.astype(numpy.float64)
+    indexes = numpy.empty(len(values), dtype=numpy.uint8)
+    for start in range(0, len(values), chunk_size):
+        distances = values[start:start + chunk_size] @ table_t
+        distances += table_sq
+        indexes[start:start + chunk_size] = distances.argmin(axis=1)
+    return indexes
+
+
+def find_nearest_color_indexes(rgb_values, color_table=None, method='euclid',
+                               _chunk_size=4096):
+    ''' Given many RGB colors, return their nearest color indexes in one pass.
+
+        Uses NumPy when installed, otherwise falls back to pure Python,
+        computing each distinct color once.
+
+        Arguments:
+            rgb_values:     An iterable of (r, g, b) int triples,
+                            a flat buffer of bytes: b'\\xff\\x00\\x00…',
+                            or a NumPy array of shape (N, 3).
+            color_table:    list of rgb tuples, defaults to color_table8
+            method:         str - 'euclid', 'lookup', 'analytic',
+                            or 'oklab', see above.
+
+        Returns:
+            array('B'): of indexes, in input order, with or without NumPy.
+    '''
+    if not color_table:
+        if not color_table8:
+            build_color_tables()
+        color_table = color_table8
+    if method not in ('euclid', 'lookup', 'analytic', 'oklab'):
+        raise ValueError(f'method: {method!r} was unrecognized.')
+
+    numpy = method != 'oklab' and _get_numpy()  # oklab stays scalar
+    if numpy:
+        if isinstance(rgb_values, (bytes, bytearray, memoryview)):
+            rgb_values = numpy.frombuffer(rgb_values, dtype=numpy.uint8)
+        elif not isinstance(rgb_values, (list, tuple, numpy.ndarray)):
+            rgb_values = list(rgb_values)  # e.g. a generator
+        values = numpy.asarray(rgb_values, dtype=numpy.int32).reshape(-1, 3)
+
+        if (method == 'lookup' and
+            (color_table is color_table8 or color_table is color_table4) and
+            not ((values < 0) | (values > 255)).any()):
+            bits, lookup_index = _get_lookup_index(color_table)
+            cells = values >> (8 - bits)
+            cells = cells[:, 0] << (bits + bits) | cells[:, 1] << bits | cells[:, 2]
+            indexes = numpy.frombuffer(lookup_index, dtype=numpy.uint16)[cells]
+            mixed = indexes == _LOOKUP_MIXED
+            if mixed.any():  # searched as below
+                indexes[mixed] = _find_nearest_color_indexes_numpy(
+                    numpy, values[mixed], color_table, _chunk_size
+                )
+            indexes = indexes.astype(numpy.uint8)
+        else:
+            indexes = _find_nearest_color_indexes_numpy(
+                numpy, values, color_table, _chunk_size
+            )
+        return array('B', indexes.tobytes())  # as without numpy
+
+    if isinstance(rgb_values, (bytes, bytearray, memoryview)):
+        flat = memoryview(rgb_values).cast('B')
+        rgb_values = zip(flat[0::3], flat[1::3], flat[2::3])
+    if method == 'euclid' and color_table is color_table8:
+        method = 'analytic'  # same results, faster
+
+    found = {}
+    indexes = array('B')
+    append = indexes.append
+    for rgb in rgb_values:
+        rgb = tuple(rgb)
+        try:
+            append(found[rgb])
+        except KeyError:
+            index = found[rgb] = find_nearest_color_index(
+                *rgb, color_table=color_table, method=method
+            )
+            append(index)
+    return indexes
@@ -28,12 +28,20 @@
         :license: MIT License (MIT)
 
 '''
+import re
 import sys
+from array import array
 from contextlib import contextmanager
 
-from . import ansi_capable as _ansi_capable, using_terminfo
+from . import using_terminfo
 from .constants import CSI, ESC, RIS
 from .detection import get_position as _get_position, TermStack
+from .meta import defaults
+
+
+MAX_CACHED_MOVES = defaults.MAX_CACHED_MOVES
+# parameterized capabilities worth translating to Python, see _compile_tparm
+PRECOMPILED_CAPS = ('cup', 'cuu', 'cud', 'hpa', 'vpa')
 
 
 # Mapping of convenience names to terminfo capabilities,
@@ -83,6 +91,10 @@ class _ContextMixin:
     enable_bracketed_paste = CSI + '?2004h'
     disable_bracketed_paste = CSI + '?2004l'
 
+    # https://gist.github.com/christianparpart/d8a62cc1ab659194337d73e399004036
+    begin_synchronized_output = CSI + '?2026h'
+    end_synchronized_output = CSI + '?2026l'
+
     save_title = ('t', '22;%s')
     restore_title =  ('t', '23;%s')
 
@@ -186,6 +198,51 @@ class _ContextMixin:
             stream.write(self.restore_position)
             stream.flush()
 
+    def move_many(self, points):
+        ''' Returns the sequences to move the cursor to each of the given
+            (x, y) points in turn, faster than calling move_to for each.
+
+            .. code-block:: python
+
+                moves = screen.move_many(points)
+                for move, label in zip(moves, labels):
+                    print(move, label, sep='', end='')
+        '''
+        return self.move_to.many(points)
+
+    @contextmanager
+    def synchronized_output(self):
+        ''' Context Manager that has the terminal paint output all at once,
+            e.g. a whole frame without tearing.  Writes to the screen's
+            stream, and to sys.stdout when it is the same, are collected in
+            memory and written together on exit, wrapped in synchronized
+            update sequences (DEC mode 2026) that other terminals ignore.
+
+            .. code-block:: python
+
+                with screen.synchronized_output():
+                    for bar in bars:
+                        print(bar)
+        '''
+        stream = self._stream
+        if isinstance(stream, _OutputBuffer):  # nested, already collecting
+            yield self
+            return
+
+        buffer = self._stream = _OutputBuffer(stream)
+        redirect = sys.stdout is stream
+        if redirect:
+            sys.stdout = buffer
+        try:
+            yield self
+        finally:
+            if redirect and sys.stdout is buffer:
+                sys.stdout = stream
+            self._stream = stream
+            stream.write(self.begin_synchronized_output + buffer.getvalue() +
+                         self.end_synchronized_output)
+            stream.flush()
+
     @contextmanager
     def rare_mode(self):
         ''' Context Manager that temporarily turns off echo and line-editing
@@ -300,7 +357,9 @@ class Screen(_ContextMixin):
             Arguments:
                 force           - Force sequences on.
         '''
-        if _ansi_capable or force:
+        from . import ansi_capable  # defer, runs detection
+
+        if ansi_capable or force:
             self = super().__new__(cls)
         else:
             from .disabled import empty_scr_bin
@@ -330,7 +389,10 @@ class Screen(_ContextMixin):
 
                 # only cup and hvp need to worry about coordinates:
                 elif type(value) is tuple:
-                    attr = _TemplateString(*value, swap=swap)
+                    if value[1].count('%s') == 2:
+                        attr = _CoordinateTemplate(*value, swap=swap)
+                    else:
+                        attr = _TemplateString(*value, swap=swap)
                     setattr(self, name, attr)
 
     def __getattr__(self, attr):
@@ -346,6 +408,26 @@ class Screen(_ContextMixin):
             raise AttributeError(msg)
 
 
+class _OutputBuffer:
+    ''' Collects writes in memory, otherwise standing in for a stream. '''
+    def __init__(self, stream):
+        self._stream = stream
+        self._parts = []
+
+    def write(self, text):
+        self._parts.append(text)
+        return len(text)
+
+    def flush(self):
+        pass  # until the end
+
+    def getvalue(self):
+        return ''.join(self._parts)
+
+    def __getattr__(self, attr):
+        return getattr(self._stream, attr)
+
+
 class _TemplateString(str):
     ''' A template string that renders itself with given or default args. '''
     _default = 1
@@ -371,6 +453,33 @@ class _TemplateString(str):
             return self
 
 
+class _CoordinateTemplate(_TemplateString):
+    ''' A template string for a pair of coordinates, e.g. cup, that keeps
+        the sequences rendered for reuse.
+    '''
+    def __new__(cls, endcode, arg='%s;%s', swap=None):
+        self = super().__new__(cls, endcode, arg=arg, swap=swap)
+        self._cache = {}
+        return self
+
+    def __call__(self, *args):
+        cache = self._cache
+        text = cache.get(args)
+        if text is None:
+            if len(args) != 2:
+                return super().__call__(*args)  # not a pair, raises
+            x, y = args[::-1] if self._swap else args  # inlined, on each miss
+            if len(cache) >= MAX_CACHED_MOVES:
+                cache.clear()
+            text = cache[args] = self % (x + 1, y + 1)
+        return text
+
+    def many(self, points):
+        ''' Render a sequence for each of the given coordinate pairs. '''
+        get = self._cache.get
+        return [get(point) or self(*point) for point in map(tuple, points)]
+
+
 class ScreenTermInfo(_ContextMixin):
     ''' Convenience class for cursor and screen manipulation.
 
@@ -402,7 +511,9 @@ class ScreenTermInfo(_ContextMixin):
             Arguments:
                 force           - Force on.
         '''
-        if _ansi_capable or force:
+        from . import ansi_capable  # defer, runs detection
+
+        if ansi_capable or force:
             self = super().__new__(cls)
         else:
             from .disabled import empty_scr_bin
@@ -411,16 +522,21 @@ class ScreenTermInfo(_ContextMixin):
 
         return self
 
-    def __init__(self, stream=sys.stdout, swap=True, **kwargs):
+    def __init__(self, stream=sys.stdout, swap=True, precompile=True,
+                 **kwargs):
         '''
             Arguments:
                 stream          - For context managers
                 swap            - Coordinate order, i.e. Given in:
                                     True    # Standard order, needs swapping.
                                     False   # ANSI/Curses format
+                precompile      - Render common cursor movements
+                                  (PRECOMPILED_CAPS) in Python rather than
+                                  with tparm, when found to be equivalent.
         '''
         self._stream = stream
         self._swap = swap
+        self._precompile = precompile
 
     def __getattr__(self, attr):
         # when attribute is *missing*
@@ -444,7 +560,11 @@ class ScreenTermInfo(_ContextMixin):
                 pass
             else:  # convert, cache, and return
                 if b'%' in value:  # tparm!
-                    value = _TemplateStringTermInfo(value, swap=self._swap)
+                    value = _TemplateStringTermInfo(
+                        value, swap=self._swap,
+                        precompile=(self._precompile and
+                                    cap_name in PRECOMPILED_CAPS),
+                    )
                 else:
                     value = value.decode('ascii')
 
@@ -458,35 +578,316 @@ class ScreenTermInfo(_ContextMixin):
 
 
 class _TemplateStringTermInfo(str):
-    ''' A callable template string that renders itself with given args. '''
+    ''' A callable template string that renders itself with given args,
+        remembering the results.
+    '''
     _swap = None
 
-    def __new__(cls, value, swap=None):
+    def __new__(cls, value, swap=None, precompile=False):
         self = str.__new__(cls, value.decode('ascii'))  # as str
         self._byte_str = value  # orig as bytes
         self._swap = swap
+        self._cache = {}
+        self._format = _compile_tparm(value) if precompile else None
         return self
 
     def __call__(self, *args):
         ''' Run the tparm! '''
+        text = self._cache.get(args)
+        if text is not None:
+            return text
+
+        params = args
         if len(args) == 2 and self._swap:
-            args = args[::-1]  # swap standard coordinate order backwards
-        return _tparm(self._byte_str, *args).decode('ascii')  # to string
+            params = args[::-1]  # swap standard coordinate order backwards
+        if self._format:
+            text = self._format(*params)
+        else:
+            text = _tparm(self._byte_str, *params).decode('ascii')  # to str
+
+        if len(self._cache) >= MAX_CACHED_MOVES:
+            self._cache.clear()
+        self._cache[args] = text
+        return text
+
+    def many(self, points):
+        ''' Render a sequence for each of the given coordinate pairs. '''
+        get = self._cache.get
+        return [get(point) or self(*point) for point in map(tuple, points)]
+
+
+_tparm_finder = re.compile(r'%(?:i|p[1-9]|d|%)|%|[{}]')
+_tparm_samples = ((0, 0), (1, 2), (7, 30), (123, 45), (9999, 1))
+
+def _compile_tparm(capability):
+    ''' Translate a parameterized terminfo string that only increments,
+        pushes, and prints its parameters as decimals, e.g. cup, into a
+        Python formatter.  It is checked against tparm before use.
+
+        Returns: a function taking the parameters, or None.
+    '''
+    template, stack, arity, increment = [], [], 0, False
+    position = 0
+    text = capability.decode('ascii')
+    for match in _tparm_finder.finditer(text):
+        template.append(text[position:match.start()])
+        position = match.end()
+        token = match.group()
+        if token == '%i':
+            increment = True
+        elif token.startswith('%p'):
+            index = int(token[2]) - 1
+            stack.append(index)
+            arity = max(arity, index + 1)
+        elif token == '%d' and stack:
+            template.append(f'{{{stack.pop()}}}')
+        elif token == '%%':
+            template.append('%')
+        elif token in '{}':
+            template.append(token * 2)  # escape
+        else:  # conditionals, arithmetic, etc.
+            return None
+    template.append(text[position:])
+    if stack or not arity:
+        return None
+
+    template = ''.join(template)
+    if increment and arity == 2:  # the usual cup
+        def formatter(first, second):
+            return template.format(first + 1, second + 1)
+    elif increment:  # only the first two parameters, per terminfo(5)
+        def formatter(*params):
+            return template.format(*[param + 1 for param in params[:2]],
+                                   *params[2:])
+    else:
+        formatter = template.format
+
+    for sample in _tparm_samples:
+        sample = (sample * arity)[:arity]
+        if formatter(*sample) != _tparm(capability, *sample).decode('ascii'):
+            return None
+    return formatter
+
+
+class ScreenBuffer:
+    ''' A double-buffered grid of character cells, redrawn with minimal output.
+
+        Text is placed into the grid with put(), then flush() compares it to
+        the frame drawn last and writes only the runs of cells that changed,
+        with the fewest style changes between them.
+        Each cell is kept as a code point and a style number, in arrays.
+
+        Example::
+
+            from console.screen import sc, ScreenBuffer
+
+            buffer = ScreenBuffer()
+            with sc.fullscreen():
+                while True:
+                    buffer.put(0, 0, time.ctime(), fg.green, fx.bold)
+                    buffer.flush()
+                    time.sleep(1/30)
+    '''
+    _blank = ord(' ')
+    _tail = 0  # second cell of a wide character
+    _undrawn = 0x110000  # beyond Unicode, never equal to a cell
+    _max_gap = 4  # unchanged cells to rewrite rather than move past
+
+    def __init__(self, width=None, height=None, screen=None,
+                 stream=sys.stdout):
+        '''
+            Arguments:
+                width, height   - Size in cells, defaults to the terminal's.
+                screen          - Screen instance to move the cursor with,
+                                  in standard (x, y) order.  Default: sc
+                stream          - File to write frames to.
+        '''
+        if width is None or height is None:
+            from .detection import get_size  # defer
+            columns, lines = get_size()
+            width = columns if width is None else width
+            height = lines if height is None else height
+
+        if screen is None:
+            from . import sc as screen  # defer, runs detection
+        self._screen = screen
+        self._stream = stream
+        self._styles = [{}]  # style number -> SGR state, 0 is the default
+        self._style_numbers = {(): 0}
+        self._style_cache = {}
+        self.resize(width, height)
+
+    def clear(self):
+        ''' Blank every cell of the grid, to be drawn at the next flush. '''
+        size = self.width * self.height
+        self._chars = array('I', (self._blank,)) * size
+        self._attrs = array('I', (0,)) * size
+
+    def invalidate(self):
+        ''' Forget the frame on screen so the next flush redraws all cells,
+            e.g. after other output or a terminal reset.
+        '''
+        size = self.width * self.height
+        self._drawn_chars = array('I', (self._undrawn,)) * size
+        self._drawn_attrs = array('I', (0,)) * size
+
+    def resize(self, width, height):
+        ''' Change the size of the grid, which clears and invalidates it. '''
+        self.width, self.height = width, height
+        self.clear()
+        self.invalidate()
+
+    def put(self, x, y, text, *styles):
+        ''' Place text into the grid starting at the given 0-based cell,
+            in the given styles, e.g. palette entries or sequence strings.
+            Styles are absolute, none means the terminal default.
+            Text beyond the edges is clipped, control characters and
+            zero-width marks are dropped.
+        '''
+        if not 0 <= y < self.height or x >= self.width:  # off screen
+            return
+        from .utils import cell_width  # defer, utils imports us
+
+        number = self._style_number(styles)
+        chars, attrs, width = self._chars, self._attrs, self.width
+        row = y * width
+
+        if text.isascii() and text.isprintable():  # fast path
+            if x < 0:
+                text, x = text[-x:], 0
+            text = text[:width - x]
+            if text:
+                start = row + x
+                end = start + len(text)
+                self._split_wide(start, end, row + width)
+                chars[start:end] = array('I', map(ord, text))
+                attrs[start:end] = array('I', (number,)) * len(text)
+            return
+
+        for char in text:
+            cells = cell_width(char) if char.isprintable() else 0
+            if not cells:
+                continue
+            if x + cells > width:
+                break
+            if x >= 0:
+                index = row + x
+                self._split_wide(index, index + cells, row + width)
+                chars[index] = ord(char)
+                attrs[index] = number
+                if cells == 2:
+                    chars[index + 1] = self._tail
+                    attrs[index + 1] = number
+            x += cells
+
+    def _split_wide(self, start, end, row_end):
+        ''' Blank the rest of any wide characters partially overwritten. '''
+        chars, tail = self._chars, self._tail
+        if chars[start] == tail:
+            chars[start - 1] = self._blank
+        if end < row_end and chars[end] == tail:
+            chars[end] = self._blank
+
+    def _style_number(self, styles):
+        ''' Returns the number of the resulting SGR state, adding it if new. '''
+        sequences = tuple(map(str, styles))
+        number = self._style_cache.get(sequences)
+        if number is None:
+            from .utils import _sgr_state  # defer
+
+            state = _sgr_state(sequences)
+            key = tuple(state.items())
+            number = self._style_numbers.get(key)
+            if number is None:
+                number = self._style_numbers[key] = len(self._styles)
+                self._styles.append(state)
+            self._style_cache[sequences] = number
+        return number
+
+    def flush(self):
+        ''' Write the cells changed since the last flush to the stream,
+            in a single write.
+
+            Returns: the text written.
+        '''
+        from .utils import _diff_sgr  # defer
+
+        chars, attrs = self._chars, self._attrs
+        drawn_chars, drawn_attrs = self._drawn_chars, self._drawn_attrs
+        styles, width, tail = self._styles, self.width, self._tail
+        move_to, max_gap = self._screen.move_to, self._max_gap
+        output, style, cursor = [], 0, None
+
+        for y in range(self.height):
+            start = y * width
+            end = start + width
+            if (chars[start:end] == drawn_chars[start:end] and
+                attrs[start:end] == drawn_attrs[start:end]):
+                continue  # row unchanged
+
+            index = start
+            while index < end:
+                stop = index + 16  # skip unchanged chunks quickly
+                if (chars[index:stop] == drawn_chars[index:stop] and
+                    attrs[index:stop] == drawn_attrs[index:stop]):
+                    index = stop
+                    continue
+                if (chars[index] == drawn_chars[index] and
+                    attrs[index] == drawn_attrs[index]):
+                    index += 1
+                    continue
+                if chars[index] == tail:  # redraw the whole character
+                    index -= 1
+
+                # find the end of this run, bridging short unchanged gaps
+                run_end = scan = index + 1
+                while scan < end and scan - run_end < max_gap:
+                    scan += 1
+                    if (chars[scan - 1] != drawn_chars[scan - 1] or
+                        attrs[scan - 1] != drawn_attrs[scan - 1]):
+                        run_end = scan
+                if run_end < end and chars[run_end] == tail:
+                    run_end += 1
+
+                if cursor != index:
+                    output.append(move_to(index - start, y))
+                for i in range(index, run_end):
+                    if attrs[i] != style:
+                        output.append(_diff_sgr(styles[style],
+                                                styles[attrs[i]]))
+                        style = attrs[i]
+                    if chars[i] != tail:
+                        output.append(chr(chars[i]))
+
+                # the cursor may be waiting to wrap at the last column
+                cursor = run_end if run_end < end else None
+                index = run_end
+
+        if style:
+            output.append(_diff_sgr(styles[style], {}))
+        self._drawn_chars = array('I', chars)
+        self._drawn_attrs = array('I', attrs)
+
+        text = ''.join(output)
+        if text:
+            self._stream.write(text)
+            self._stream.flush()
+        return text
 
 
 # Rather than define get_position() under Screen*,
 # we let detection pick the implementation,
 # as it is different under Windows.  Then we attach it here.
-if _ansi_capable:
-    Screen.get_position = ScreenTermInfo.get_position = (
-        staticmethod(_get_position)
-    )
-else:
-    from .meta import defaults
+def _get_position_if_capable(*args, **kwargs):
+    from . import ansi_capable  # defer, runs detection
 
-    Screen.get_position = ScreenTermInfo.get_position = (
-        lambda *args, **kwargs: defaults.CURSOR_POS_FALLBACK
-    )
+    if ansi_capable:
+        return _get_position(*args, **kwargs)
+    return defaults.CURSOR_POS_FALLBACK
+
+Screen.get_position = ScreenTermInfo.get_position = (
+    staticmethod(_get_position_if_capable)
+)
 
 
 # It's Automatic:  https://youtu.be/y5ybok6ZGXk
@@ -497,6 +898,13 @@ if using_terminfo:
         _curses.tigetstr, _curses.tigetnum, _curses.tigetflag
     )
     _tparm = _curses.tparm
-    sc = ScreenTermInfo()
-else:
-    sc = Screen()
+
+
+def __getattr__(name):
+    ''' Create the default screen object on first use, after detection. '''
+    if name == 'sc':
+        global sc
+        sc = ScreenTermInfo() if using_terminfo else Screen()
+        return sc
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -4,6 +4,7 @@
 
     Testen-Sie, bitte.  Supported under Linux with a libvte terminal.
 '''
+import sys
 from io import StringIO, UnsupportedOperation
 
 import pytest
@@ -26,7 +27,6 @@ ul = style.UnderlinePalette(level=TermLevel.THE_FULL_MONTY)
 defx = style.EffectsTerminator(level=TermLevel.THE_FULL_MONTY)
 sc = screen.Screen(force=True)
 scs = screen.Screen(force=True, swap=False)
-utils._ansi_capable = True
 
 fg, bg, fx, defx, ul, pytest  # pyflakes
 
@@ -34,6 +34,21 @@ fg, bg, fx, defx, ul, pytest  # pyflakes
 CSI = '\x1b['           # sanity check
 
 
+@pytest.fixture
+def ansi(monkeypatch):
+    ''' Force the package detection results used by utils on. '''
+    package = sys.modules[__package__]
+    for name, value in dict(ansi_capable=True, fg=fg, fx=fx, sc=sc).items():
+        monkeypatch.setattr(package, name, value)
+
+
+@pytest.fixture
+def color_tables_restored():
+    ''' Rebuild the global downgrade tables after a test changes them. '''
+    yield
+    proximity.build_color_tables(base=color_tables.xterm_palette4)
+
+
 # Basic palette - fg, bg, fx
 # ----------------------------------------------------------------------------
 if True:  # fold
@@ -292,7 +307,25 @@ if True:  # fold
 
 # X11 color palette
 # ----------------------------------------------------------------------------
-#~ if True:  # fold
+if True:  # fold
+
+    def test_x11_table():
+        from .color_tables_x11 import get_x11_color, iter_x11_colors
+
+        assert get_x11_color('CornflowerBlue') == (100, 149, 237)
+        assert get_x11_color('gray') == get_x11_color('grey') == (190,) * 3
+        assert get_x11_color('gray100') == (255, 255, 255)
+        assert get_x11_color('cornflowerbleu') is None
+        assert get_x11_color('lightgoldenrodyellowish') is None
+
+        names = [name for name, _ in iter_x11_colors()]
+        assert names == sorted(names) and len(names) == 658
+
+    def test_x11_entries():
+        _fg = style.ForegroundPalette(level=TermLevel.ANSI_DIRECT)
+        assert str(_fg.x_bisque) == CSI + '38;2;255;228;196m'
+        _fg = style.ForegroundPalette(level=TermLevel.ANSI_EXTENDED)
+        assert str(_fg.x_navyblue) == CSI + '38;5;18m'
 
 
 # Concat + str
@@ -337,6 +370,71 @@ if True:  # fold
         text = fg.white + msg + fx.end
         assert text == f'{CSI}37m{msg}{CSI}0m'
 
+    def test_attribute_immutable():
+        ''' Entries are slotted, pre-rendered, and read-only. '''
+        style = fg.white + fx.bold
+        assert not hasattr(style, '__dict__')
+        assert str(style) == f'{CSI}37;1m'
+        assert style.template() == f'{CSI}37;1m{{}}{CSI}0m'
+        with pytest.raises(AttributeError):
+            style.default = ''
+        with pytest.raises(AttributeError):
+            style.foo = 'bar'
+        assert str(style) == f'{CSI}37;1m'
+
+    def test_attribute_addition_interned():
+        from .core import _composed
+        style = fx.dim + fg.red
+        size = len(_composed)
+        assert str(fx.dim + fg.red) == str(style) == f'{CSI}2;31m'
+        assert str(fg.red + fx.dim) == f'{CSI}31;2m'
+        assert len(_composed) == size + 1
+
+        # output is set per copy, not on the shared entry
+        outf = StringIO()
+        style.set_output(outf)
+        sys.stdout = sys.stdout.stream  # undo redirection
+        assert (fx.dim + fg.red)._stream is not outf
+        with style:
+            print('x')
+        with fx.dim + fg.red:
+            pass
+        assert outf.getvalue() == f'{CSI}2;31mx{CSI}0m\n{CSI}0m'
+
+        # mixins hit the same cache
+        size = len(_composed)
+        linkstyle = fg.blue + fx.underline
+        assert linkstyle('x', fx.blink) == linkstyle('x', fx.blink)
+        assert len(_composed) == size + 2
+
+    def test_attribute_iter_lines():
+        S, D = f'{CSI}31m', f'{CSI}39m'
+        text = 'one\ntwo\r\n\nthree'
+        result = f'{S}one{D}\n{S}two\r{D}\n{S}{D}\n{S}three{D}'
+        assert ''.join(fg.red.iter_lines(text)) == result
+
+        # pieces may split lines anywhere
+        pieces = ('o', 'ne\ntw', 'o\r\n', '\nthr', 'ee')
+        assert ''.join(fg.red.iter_lines(pieces)) == result
+
+        # files are read in bounded chunks, late newlines still found
+        infile = StringIO('x' * 10000 + '\ny\n')
+        outfile = StringIO()
+        count = fg.red.stream(infile, outfile, chunk_size=64)
+        assert outfile.getvalue() == f'{S}{"x" * 10000}{D}\n{S}y{D}\n'
+        assert count == len(outfile.getvalue())
+
+        with pytest.raises(NotImplementedError):
+            list(fg.default.iter_lines(text))
+
+    def test_empty_attribute_iter_lines():
+        from .disabled import empty
+        outfile = StringIO()
+        empty.stream(StringIO('one\ntwo'), outfile)
+        assert outfile.getvalue() == 'one\ntwo'
+        assert ''.join(empty.iter_lines(('a', 'b'))) == 'ab'
+        assert list(empty.iter_lines(StringIO('a\nb'))) == ['a\n', 'b']
+
 # Call
 # ----------------------------------------------------------------------------
 if True:  # fold
@@ -382,6 +480,18 @@ if True:  # fold
     def test_screen_pos_swapped():
         assert scs.move_to(10, 20) == CSI + '11;21H'
 
+    def test_screen_pos_cached():
+        assert sc.move_to(10, 20) is sc.move_to(10, 20)
+        assert sc.move_to.many([(10, 20), [0, 0]]) == [
+            CSI + '21;11H', CSI + '1;1H'
+        ]
+        assert scs.move_many(((10, 20), (3, 4))) == [
+            CSI + '11;21H', CSI + '4;5H'
+        ]
+        assert sc.save_title(0) == CSI + '22;0t'  # one param, not a pair
+        with pytest.raises(TypeError):
+            sc.move_to(1)
+
     def test_screen_save_restore():
         assert repr(sc.enable_alt_screen) == "'\\x1b[?1049h'"
         assert repr(sc.disable_alt_screen) == "'\\x1b[?1049l'"
@@ -414,6 +524,89 @@ if True:  # fold
                 text = attr(val)
                 assert repr(text) == f"'\\x1b[{val}{attr.endcode}'"
 
+    def test_screen_synchronized_output():
+        out = StringIO()
+        ssc = screen.Screen(force=True, stream=out)
+        with ssc.synchronized_output():
+            ssc._stream.write('a')
+            ssc._stream.flush()
+            with ssc.synchronized_output():     # nested
+                ssc._stream.write('b')
+            assert out.getvalue() == ''         # nothing yet
+        assert out.getvalue() == f'{CSI}?2026hab{CSI}?2026l'
+        assert ssc._stream is out
+
+        stdout, sys.stdout = sys.stdout, out    # print is collected too
+        try:
+            ssc = screen.Screen(force=True, stream=out)
+            with ssc.synchronized_output():
+                print('c')
+                assert sys.stdout is not out
+            assert out.getvalue().endswith(f'{CSI}?2026hc\n{CSI}?2026l')
+        finally:
+            sys.stdout = stdout
+
+    def test_screen_terminfo_precompiled(monkeypatch):
+        curses = pytest.importorskip('curses')
+        try:
+            curses.setupterm('xterm', 1)
+        except curses.error:
+            pytest.skip('xterm terminfo not found')
+        monkeypatch.setattr(screen, '_tparm', curses.tparm, raising=False)
+
+        cup = screen._compile_tparm(b'\x1b[%i%p1%d;%p2%dH')
+        assert cup(19, 9) == CSI + '20;10H'
+        assert screen._compile_tparm(b'\x1b[%p1%dA')(3) == CSI + '3A'
+        assert screen._compile_tparm(b'%p1%{1}%+%d') is None   # arithmetic
+
+        for precompile in (True, False):
+            move_to = screen._TemplateStringTermInfo(
+                b'\x1b[%i%p1%d;%p2%dH', swap=True, precompile=precompile
+            )
+            assert bool(move_to._format) is precompile
+            assert move_to(10, 20) == CSI + '21;11H'
+            assert move_to(10, 20) is move_to(10, 20)      # remembered
+            assert move_to.many([(0, 0), [1, 2]]) == [
+                CSI + '1;1H', CSI + '3;2H'
+            ]
+
+    def test_screen_buffer_off_screen():
+        buffer = screen.ScreenBuffer(8, 2, screen=sc, stream=StringIO())
+        buffer.flush()
+        for x, y in ((10, 0), (8, 0), (0, 2), (0, -1), (-20, 0)):
+            buffer.put(x, y, 'hello world')
+            buffer.put(x, y, 'hello 日本')
+        assert len(buffer._chars) == len(buffer._attrs) == 16
+        assert buffer.flush() == ''                     # nothing visible
+
+        buffer.put(5, 1, 'hello')                       # partly visible
+        assert buffer.flush() == f'{CSI}2;6Hhel'
+
+    def test_screen_buffer():
+        out = StringIO()
+        buffer = screen.ScreenBuffer(8, 3, screen=sc, stream=out)
+        buffer.put(0, 0, 'hello', fg.red)
+        first = buffer.flush()
+        assert first == out.getvalue()
+        assert first.startswith(f'{CSI}1;1H{CSI}31mhello{CSI}0m   ')
+        assert buffer.flush() == ''                     # nothing changed
+
+        buffer.put(0, 0, 'help', fg.red)                # only 'p' differs
+        assert buffer.flush() == f'{CSI}1;4H{CSI}31mp{CSI}0m'
+        buffer.put(1, 2, 'a', fx.bold)
+        buffer.put(6, 2, 'b')                           # too far, move again
+        assert buffer.flush() == f'{CSI}3;2H{CSI}1ma{CSI}3;7H{CSI}0mb'
+        buffer.put(-2, 1, 'xyz' + 'z' * 9)              # clipped both ends
+        assert buffer.flush().count('z') == 8
+
+        buffer.put(0, 1, '日本', fg.blue)                # wide
+        assert buffer.flush() == f'{CSI}2;1H{CSI}34m日本{CSI}0m'
+        buffer.put(1, 1, 'x')                           # splits 日
+        assert buffer.flush() == f'{CSI}2;1H{CSI}34m {CSI}0mx'
+        buffer.put(0, 5, 'off')
+        buffer.invalidate()
+        assert buffer.flush().count('\n') == 0          # no scrolling
+
 
 # Utils
 # ----------------------------------------------------------------------------
@@ -421,8 +614,7 @@ if True:  # fold
     txt = ('\x1b[30m-C0-TEXT-\x1b[0m | \x9b30m-C1-Text-\x9bm | '
            '\x1b]L-OSC-C0-\x1b\\ | \x1b]L-OSC-C0-7-\a | \x9bL-OSC-C1-\x9d END')
 
-    def test_utils_mk_hyperlink():
-        utils._ansi_capable = True  # force for make
+    def test_utils_mk_hyperlink(ansi):
         result = utils.make_hyperlink('ftp://netscape.com/…/navigator.tar.gz',
                                       'Blast from the past!')
         assert result == (
@@ -430,7 +622,7 @@ if True:  # fold
             '\x1b\\Blast from the past!\x1b]8;;\x1b\\'
         )
 
-    def test_utils_mk_hyperlink_params_and_low_encode():
+    def test_utils_mk_hyperlink_params_and_low_encode(ansi):
         result = utils.make_hyperlink('foo://n\x1bt.org/', 'cap', id='2',
                                       bar='z', icon='')
 
@@ -438,13 +630,12 @@ if True:  # fold
             '\x1b]8;id=2:bar=z;foo://n%1Bt.org/\x1b\\cap\x1b]8;;\x1b\\'
         )
 
-    def test_utils_mk_hyperlink_bad_params():
+    def test_utils_mk_hyperlink_bad_params(ansi):
         for char in (':', ';', '='):
             with pytest.raises(ValueError):
                 utils.make_hyperlink('abc', 'xyz', foo='b%sar' % char)
 
-    def test_utils_clear_line():
-        utils.sc = sc
+    def test_utils_clear_line(ansi):
         end = 'K'
         for i in range(3):
             text = utils.clear_line(i)
@@ -454,14 +645,12 @@ if True:  # fold
             text = utils.clear_line(mode)
             assert text == CSI + str(i) + end
 
-    def test_utils_clear_lines():
-        utils.sc = sc
+    def test_utils_clear_lines(ansi):
         result = utils.clear_lines(3)
                           # 1A   1B     # 2A   2B     # 3A   3B
         assert result == '\x1b[2K\x1b[1A\x1b[2K\x1b[1A\x1b[2K\x1b[1A'
 
-    def test_utils_clear_screen():
-        utils.sc = sc
+    def test_utils_clear_screen(ansi):
         end = 'J'
         for i in range(3):
             text = utils.clear_screen(i)
@@ -485,7 +674,7 @@ if True:  # fold
             #~ text = utils.notify_progress(value)
             #~ assert text == expected
 
-    def test_notify_message():
+    def test_notify_message(ansi):
         cases = (
             ('hi', '\x1b]9;hi\x1b\\'),
         )
@@ -512,17 +701,135 @@ if True:  # fold
         assert ('-C0-TEXT- | -C1-Text- |  |  | -OSC-C1-\x9d END'
                 == utils.strip_ansi(txt, c1=True, osc=True))
 
+    def test_strip_ansi_single_pass():
+        text = ('\x1b(0lqk\x1b(B \x1b7saved\x1b8 '
+                '\x1bP+q544e\x1b\\ \x1b_app\x1b\\ \x1b[1mbold\x1b[m')
+        assert utils.strip_ansi(text) == (
+            'lqk saved \x1bP+q544e\x1b\\ \x1b_app\x1b\\ bold'
+        )
+        assert utils.strip_ansi(text, osc=True) == 'lqk saved   bold'
+
+        text = '\x9b1mbold\x9bm \x9d0;title\x9c \x90dcs\x9c end'
+        assert utils.strip_ansi(text, c1=True, osc=True) == 'bold   end'
+        assert utils.strip_ansi('plain', c1=None) == 'plain'
+
     def test_strip_ansi_len():
         text = 'Hang \x1b[34;4;5mLoose\x1b[0m, Hawaii'
         assert utils.len_stripped(text) == 18
 
-    def test_set_cwd():
-        utils._ansi_capable = True  # force for make
+    def test_tokenize_ansi():
+        text = 'Hang \x1b[34;4mLoose\x1b[0m, \x1b]8;;x\x1b\\Hawaii\x1b[1m'
+        blue = '\x1b[34;4m'
+        assert list(utils.tokenize_ansi(text)) == [
+            ('text', 'Hang ', ''),
+            ('sgr', '\x1b[34;4m', blue),
+            ('text', 'Loose', blue),
+            ('sgr', '\x1b[0m', ''),
+            ('text', ', ', ''),
+            ('escape', '\x1b]8;;x\x1b\\', ''),
+            ('text', 'Hawaii', ''),
+            ('sgr', '\x1b[1m', '\x1b[1m'),
+        ]
+        # sequences split between chunks are rejoined
+        chunks = ('ab\x1b[3', '1mcd\x1b', '[0;1mef\x1b[39m', '\x1b[22mgh')
+        assert list(utils.tokenize_ansi(chunks)) == [
+            ('text', 'ab', ''),
+            ('sgr', '\x1b[31m', '\x1b[31m'),
+            ('text', 'cd', '\x1b[31m'),
+            ('sgr', '\x1b[0;1m', '\x1b[1m'),
+            ('text', 'ef', '\x1b[1m'),
+            ('sgr', '\x1b[39m', '\x1b[1m'),  # off codes cancel their slot
+            ('sgr', '\x1b[22m', ''),
+            ('text', 'gh', ''),
+        ]
+
+    def test_truncate():
+        text = 'Hang \x1b[34;4mLoose\x1b[0m, Hawaii'
+        assert utils.truncate(text, 8) == 'Hang \x1b[34;4mLoo\x1b[0m'
+        assert utils.truncate(text, 12) == 'Hang \x1b[34;4mLoose\x1b[0m, '
+        assert utils.truncate(text, 18) is text
+        assert utils.truncate('日本語', 5) == '日本'
+
+    def test_wrap():
+        text = 'Hang \x1b[1mLoose, Hawaii\x1b[0m mahalo'
+        assert utils.wrap(text, 12) == [
+            'Hang \x1b[1mLoose,\x1b[0m',
+            '\x1b[1mHawaii\x1b[0m',
+            'mahalo',
+        ]
+        assert utils.wrap('abcdefghij kl\n\n  mn', 4) == [
+            'abcd', 'efgh', 'ij', 'kl', '', '  mn',
+        ]
+        assert utils.wrap('日本語のテキスト', 5) == ['日本', '語の', 'テキ', 'スト']
+
+        # leading space wider than the line, no negative widths:
+        assert utils.wrap('      abcdefghijklmnop', 4) == [
+            '    ', 'abcd', 'efgh', 'ijkl', 'mnop',
+        ]
+        text = f'日本{CSI}1mabc{CSI}0m'  # wide chars taken, over width 1
+        lines = utils.wrap(text, 1)
+        assert [utils.len_stripped(line) for line in lines] == [1] * 5
+        assert utils.strip_ansi(''.join(lines)) == '日本abc'
+
+    def test_wrap_off_codes():
+        # spans closed by off codes don't accumulate state, or resets:
+        text = fx.bold('Hang') + ' ' + (fg.red('Loose') + ' ') * 3
+        assert utils.wrap(text, 6) == [
+            f'{CSI}1mHang{CSI}22m',
+            f'{CSI}31mLoose{CSI}39m',
+        ] + [f'{CSI}31mLoose{CSI}39m'] * 2
+
+        for count in (2000, 4000):  # output stays linear in input
+            text = (fg.red('word') + ' ' + fx.bold('word') + ' ') * count
+            lines = utils.wrap(text, 40)
+            assert len(lines) == count // 4  # eight words each
+            assert sum(map(len, lines)) < len(text)
+
+    def test_sgr_renderer():
+        render = utils.SGRRenderer()
+        assert render('a', fg.red, fx.bold) == f'{CSI}31;1ma'
+        assert render('b', fg.red) == f'{CSI}22mb'      # bold off only
+        assert render('c', fg.red) == 'c'
+        assert render('d', fg.i208, fx.dim) == f'{CSI}38;5;208;2md'
+        assert render('e', fx.bold) == f'{CSI}0;1me'         # shorter too
+        assert render('f') == f'{CSI}0mf'               # reset is shorter
+        assert render.reset() == ''
+
+        text = (fg.red('a') + fg.red('b') + (fg.red + fx.bold)('c') +
+                fx.italic('d') + defx.italic)
+        assert render.minimize(text) == (
+            f'{CSI}31mab{CSI}1mc{CSI}0;3md{CSI}0m'
+        )
+        assert utils.strip_ansi(render.minimize(text)) == 'abcd'
+
+        # state is set before other escapes, erase paints the background:
+        text = f'{CSI}41m{CSI}K{CSI}0mtext'
+        assert utils.SGRRenderer().minimize(text) == f'{CSI}41m{CSI}K{CSI}0mtext'
+
+    def test_sgr_renderer_minimize_log():
+        line = (fg.red('ERROR') + ' ' + fx.bold('disk') + ' space low ' +
+                fg.red('sda1') + '\n')
+        text = line * (500_000 // len(line))  # ~500 KB styled log
+        result = utils.SGRRenderer().minimize(text)
+        assert utils.strip_ansi(result) == utils.strip_ansi(text)
+        assert len(result) <= len(text)
+
+    def test_cell_width():
+        assert utils.cell_width('Hang Loose') == 10
+        assert utils.cell_width('日本語') == 6
+        assert utils.cell_width('😎🤘⛤') == 5
+        assert utils.cell_width('e\u0301te\u0301') == 3   # combining acute
+        assert utils.cell_width('ü\u200d') == 1            # ZWJ
+        text = '\x1b[1m日本\x1b[0m'
+        assert utils.len_stripped(text) == 2
+        assert utils.len_stripped(text, cells=True) == 4
+
+    def test_set_cwd(ansi):
         result = utils.notify_cwd('/foo/bar/baz')
         assert result == '\x1b]7;file%3A///foo/bar/baz\x1b\\'
 
     # set_title - read title doesn't work to verify
-    def test_set_title():
+    def test_set_title(ansi):
         text = 'foo'
         result = utils.set_title(text)
         assert result == '\x1b]0;foo\x1b\\'
@@ -538,7 +845,7 @@ if True:  # fold
         except UnsupportedOperation:
             pass
 
-    def test_set_clipboard():
+    def test_set_clipboard(ansi):
         data = 'collywobbles'
         result = utils.set_clipboard(data)
         # best effort test, may not be allowed to succeed:
@@ -594,6 +901,189 @@ if True:  # fold
         detection.env = Environment(environ=dict(CLICOLOR_FORCE='1'))
         assert detection.color_is_forced() is True
 
+    def test_detection_cache(monkeypatch, tmp_path):
+        monkeypatch.setattr(detection, 'env', Environment(environ=dict(
+            CLICOLOR_FORCE='1', PY_CONSOLE_CACHE='1', TERM='xterm-direct',
+            XDG_CACHE_HOME=str(tmp_path),
+        )))
+        monkeypatch.setattr(detection, '_get_cache_key', lambda *args: 'key')
+        monkeypatch.setattr(detection, '_cache_key', None)
+        monkeypatch.setattr(detection, 'color_sep', ';')
+        monkeypatch.setattr(detection, '_find_basic_palette_from_os',
+                            lambda stream: ('xterm', color_tables.xterm_palette4))
+        assert detection.init() == TermLevel.ANSI_DIRECT
+        assert (tmp_path / 'console' / 'detection.json').exists()
+
+        def query(*args, **kwargs):
+            raise AssertionError('terminal was queried')
+
+        monkeypatch.setattr(detection, 'color_sep', ';')
+        monkeypatch.setattr(detection, 'detect_terminal_level', query)
+        monkeypatch.setattr(detection, '_find_basic_palette_from_os', query)
+        assert detection.init() == TermLevel.ANSI_DIRECT  # from cache
+        assert detection.color_sep == ':'
+
+        monkeypatch.setattr(detection, 'get_color', lambda *a, **k: ('ffff',) * 3)
+        assert detection.get_theme() == 'light'
+        monkeypatch.setattr(detection, 'get_color', query)
+        assert detection.get_theme() == 'light'  # from cache
+
+    def test_probe_replies():
+        queries = ('position', ('index', 2), 'bg', 'title', 'answerback')
+        resp = (f'{CSI}24;1R' '\x1b]4;2;rgb:4e4d/9a9a/0605\x1b\\'
+                '\x1b]11;rgb:0000/0000/0000\x07' '\x1b]lvim\x1b\\'
+                f'{CSI}?62;22c')
+        assert detection._parse_probe_replies(queries, resp) == {
+            'position': (1, 24),
+            ('index', 2): ('4e4d', '9a9a', '0605'),
+            'bg': ('0000', '0000', '0000'),
+            'title': 'vim',
+            'answerback': None,
+        }
+        # only DA1 answered, others missing
+        resp = f'PuTTY{CSI}?6c'
+        assert detection._parse_probe_replies(queries, resp) == dict.fromkeys(
+            queries[:-1]) | {'answerback': 'PuTTY'}
+
+        with pytest.raises(ValueError):
+            detection.probe('favorite_color')
+        if not detection.is_a_tty(sys.stdin):
+            assert detection.probe('fg') == {'fg': None}  # no waiting
+
+    def test_read_until_select():
+        import os, threading
+
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(read_fd) as infile:
+            os.write(write_fd, b'\x1b]52;c;' + b'QUJD' * 5000 + b'\x1b')
+            # marker split across reads, arrives later:
+            threading.Timer(.05, os.write, (write_fd, b'\\rest')).start()
+            result = detection._read_until_select(
+                infile, max_bytes=65536, end=detection.ST, timeout=1
+            )
+            assert result == '\x1b]52;c;' + 'QUJD' * 5000
+            assert infile.read(4) == 'rest'  # left for the program
+
+            # typeahead following a reply, read in the same chunk, is left:
+            os.write(write_fd, b'\x1b[24;80Rx')
+            assert detection._read_until_select(infile, end='R') == '\x1b[24;80'
+            assert infile.read(1) == 'x'
+            os.write(write_fd, b'abcdef')
+            assert detection._read_until_select(infile, max_bytes=4) == 'abcd'
+            # no reply, what was buffered before is left too:
+            assert detection._read_until_select(infile, timeout=.01) == ''
+            assert infile.read(2) == 'ef'
+
+            os.write(write_fd, b'\x1b[5;1R\x1b[?62cq')
+            assert detection._read_until_sentinel(infile, timeout=1) == (
+                '\x1b[5;1R\x1b[?62c'
+            )
+            assert infile.read(1) == 'q'
+
+        os.close(write_fd)
+
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(read_fd, 'rb', buffering=0) as infile:  # no buffer
+            os.write(write_fd, b'\x1b[5;1Rq')
+            assert detection._read_until_select(infile, end='R') == '\x1b[5;1'
+            assert infile.read(1) == b'q'
+        os.close(write_fd)
+
+    def test_aio_query():
+        import asyncio, os, threading
+        from . import aio
+
+        async def ticker(ticks):
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(.005)
+
+        async def main(infile, stream):
+            ticks = []
+            task = asyncio.create_task(ticker(ticks))
+            resp = await aio._query(
+                CSI + '6n', aio._find_markers('R'), max_bytes=10,
+                stream=stream, timeout=1, infile=infile,
+            )
+            missing = await aio._query(
+                CSI + '6n', aio._find_markers('R'), max_bytes=10,
+                stream=stream, timeout=.05, infile=infile,
+            )
+            task.cancel()
+            return resp, missing, len(ticks)
+
+        master, slave = os.openpty()
+        with os.fdopen(slave, 'w') as tty_file, \
+             os.fdopen(os.dup(slave)) as infile:
+            # terminal answers after a delay, loop should keep running,
+            # a key typed just after is left for the program:
+            threading.Timer(.1, os.write, (master, b'\x1b[24;80Rk')).start()
+            resp, missing, ticks = asyncio.run(main(infile, tty_file))
+            typed = infile.read(1)
+        os.close(master)
+
+        assert detection._parse_position(resp) == (80, 24)
+        assert missing == '' and typed == 'k'
+        assert ticks > 5
+
+    def test_demux_parser():
+        from .demux import _InputParser
+
+        parser = _InputParser()
+        events = parser.feed(
+            b'a\x1b[24;80R\x1b[Ab\x1b]11;rgb:0000/0000/0000\x1b\\'
+            b'\x1b[?62;22c\xc3'
+        )
+        assert events == [
+            (None, 'a'), ('R', '\x1b[24;80R'), (None, '\x1b[A'), (None, 'b'),
+            (']11', '\x1b]11;rgb:0000/0000/0000\x1b\\'),
+            ('?c', '\x1b[?62;22c'),
+        ]
+        assert parser.feed(b'\xa9\x1b]4;2;rgb:4e4d/9a9a/0605\x07\x1b[') == [
+            (None, 'é'), (']4;2', '\x1b]4;2;rgb:4e4d/9a9a/0605\x07'),
+        ]
+        assert parser.pending == 2  # wait for the rest
+        assert parser.feed(b'1;5') == []
+        assert parser.feed(b'D\x1bOP\x1bx\x1b') == [
+            (None, '\x1b[1;5D'), (None, '\x1bOP'), (None, '\x1bx'),
+        ]
+        assert parser.flush() == [(None, '\x1b')]  # lone escape key
+
+    def test_demux_routing():
+        import os, threading
+        from .demux import InputDemux
+
+        def terminal(master):  # answers out of order, interleaved w/ keys
+            queries = b''
+            while queries.count(b'\x1b') < 2:
+                queries += os.read(master, 100)
+            os.write(master, b'q\x1b]11;rgb:ffff/ffff/ffff\x1b\\w'
+                             b'\x1b[5;10Re')
+
+        master, slave = os.openpty()
+        with os.fdopen(slave, 'w') as tty_file:
+            thread = threading.Thread(target=terminal, args=(master,))
+            thread.start()
+            with InputDemux(tty_file, tty_file) as demux:
+                position = demux.request(CSI + '6n', 'R')
+                assert demux.get_color('bg', timeout=1) == ('ffff',) * 3
+                assert position.result(1) == CSI + '5;10R'
+                keys = [demux.get_key(1) for i in range(3)]
+
+                # a timed out query is forgotten, the next gets the answer:
+                assert demux.get_title(timeout=.01) is None
+                assert not demux._waiters[']l']
+                title = demux.request(CSI + '21t', ']l')
+                os.write(master, b'\x1b]lanswered\x1b\\')
+                assert title.result(1) == '\x1b]lanswered\x1b\\'
+
+                # unexpected replies are dropped, not taken as keys:
+                os.write(master, b'\x1b]lnot waited for\x1b\\r')
+                assert demux.get_key(1) == 'r'
+            thread.join()
+        os.close(master)
+        assert keys == ['q', 'w', 'e']
+
     def test_color_sep():
 
         assert str(bg.i_11) == CSI + '48:5:11m'  # sanity check
@@ -636,6 +1126,37 @@ if True:  # fold
         windows.env = Environment(environ=dict(ANSICON='1'))
         assert windows.detect_terminal_level() ==( TermLevel.ANSI_EXTENDED, ';')
 
+    def test_basic_palette_query_skipped(monkeypatch):
+        def probe(*args, **kwargs):
+            raise AssertionError('queried a terminal that hangs or echoes')
+
+        monkeypatch.setattr(detection, 'probe', probe)
+        monkeypatch.setattr(detection, 'is_a_tty', lambda stream: True)
+        for platform, environ in (
+                ('linux', dict(TERM='xterm-256color', TERM_PROGRAM='vscode')),
+                ('haiku', dict(TERM='xterm')),
+            ):
+            monkeypatch.setattr(sys, 'platform', platform)
+            monkeypatch.setattr(detection, 'env', Environment(environ=environ))
+            name, palette = detection._find_basic_palette_from_os()
+            assert name == 'default (xterm)'
+
+    def test_import_submodule_first():
+        ''' Documented usage, e.g. from console.style import BgPalette. '''
+        import os, subprocess
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, CLICOLOR_FORCE='1', TERM='xterm-256color',
+                   PYTHONPATH=root)
+        env.pop('PY_CONSOLE_AUTODETECT', None)
+        for module in ('style', 'core'):
+            code = (f'import {__package__}.{module}, {__package__} as pkg; '
+                    'print(repr(pkg.fg.red), pkg.fg is pkg.style.fg)')
+            result = subprocess.run(
+                (sys.executable, '-c', code), env=env, cwd=root,
+                stdin=subprocess.DEVNULL, capture_output=True, text=True,
+            )
+            assert result.stdout == "'\\x1b[31m' True\n", result.stderr
+
     def test_terminal_level_detection_override():
         terms = (
             ('dumb', (TermLevel.DUMB, '@')),
@@ -770,6 +1291,45 @@ if True:  # fold
                   '\x1b[42;1m 1, 2, 3. \x1b[0m\n')
         assert result == outf.getvalue()
 
+    def test_line_writer_batched(ansi):
+        from io import BytesIO
+        from .core import _LineWriter
+
+        class CountingIO(StringIO):
+            writes = 0
+            def write(self, data):
+                self.writes += 1
+                return super().write(data)
+
+        outf = CountingIO()
+        writer = _LineWriter('<', outf, '>')
+        writer.write('one\r\ntwo\nthree')
+        assert outf.writes == 1
+        assert outf.getvalue() == '<one\r>\n<two>\n<three>'
+
+        # binary streams are encoded into a buffer
+        outb = BytesIO()
+        writer = _LineWriter('<', outb, '>')
+        print(' Testing… \n 1, 2, 3. ', file=writer)
+        assert outb.getvalue() == '< Testing… >\n< 1, 2, 3. >\n'.encode('utf8')
+
+        # line breaks other than newline split the same in both:
+        outf, outb = StringIO(), BytesIO()
+        for outx in (outf, outb):
+            _LineWriter('<', outx, '>').write('one\r\ntwo\x0bthree\x1b')
+        assert outb.getvalue() == outf.getvalue().encode('utf8')
+        assert outf.getvalue() == '<one\r>\n<two\x0b><three\x1b>'
+
+    def test_line_writer_empty(ansi):
+        from io import BytesIO
+        from .core import _LineWriter
+
+        for outf in (StringIO(), BytesIO()):
+            writer = _LineWriter('<', outf, '>')
+            assert writer.write('') == 0
+            print('', end='', file=writer)
+            assert not outf.getvalue()
+
     def test_find_nearest_color_index():
         from .proximity import find_nearest_color_index
         values = (
@@ -811,6 +1371,108 @@ if True:  # fold
         for val in values:
             assert find_nearest_color_hexstr(val[0]) == val[1]
 
+    def test_find_nearest_color_lookup(tmp_path, color_tables_restored,
+                                       monkeypatch):
+        import random
+        from array import array
+        from .proximity import (build_lookup_index, color_table4, color_table8,
+                                find_nearest_color_index as find,
+                                find_nearest_color_indexes)
+        # centers of cells match the scan, exact hits stay exact:
+        for rgb in ((4, 4, 4), (92, 132, 212), (252, 252, 252), (0, 0, 255)):
+            for table in (color_table4, color_table8):
+                assert (find(*rgb, color_table=table, method='lookup') ==
+                        find(*rgb, color_table=table))
+        assert find(256, 0, 0, method='lookup') == 9  # out of range, scans
+
+        # no disagreement with the scan, mixed cells are searched:
+        rand = random.Random(1)
+        colors = [tuple(rand.randrange(256) for _ in range(3))
+                  for _ in range(2000)]
+        for numpy in (proximity._get_numpy(), None):  # builds the same
+            monkeypatch.setattr(proximity, '_numpy', numpy)
+            proximity._lookup_indexes.clear()
+            for table in (color_table4, color_table8):
+                expected = array('B', (find(*rgb, color_table=table)
+                                       for rgb in colors))
+                found = array('B', (find(*rgb, color_table=table,
+                                         method='lookup') for rgb in colors))
+                assert found == expected
+                assert find_nearest_color_indexes(colors, table,
+                                                  method='lookup') == expected
+
+        path = tmp_path / 'lookup4.bin'
+        index = build_lookup_index(color_table4, bits=4, path=path)
+        assert len(index) == 4096
+        assert build_lookup_index(color_table4, bits=4, path=path) == index
+        assert [item.name for item in tmp_path.iterdir()] == ['lookup4.bin']
+        with open(path, 'ab') as outfile:  # odd length, rebuilt
+            outfile.write(b'x')
+        assert build_lookup_index(color_table4, bits=4, path=path) == index
+
+        # palette change invalidates
+        proximity.build_color_tables(base=color_tables.vga_palette4)
+        assert id(color_table4) not in proximity._lookup_indexes
+        assert find(85, 85, 85, color_table=color_table4, method='lookup') == 8
+
+        with pytest.raises(ValueError):
+            find(1, 2, 3, method='wut')
+
+    def test_find_nearest_color_analytic(color_tables_restored):
+        from itertools import product
+        from .proximity import find_nearest_color_index as find
+        # include ties between cube levels and grays
+        channel = (0, 4, 8, 13, 18, 47, 48, 75, 95, 115, 128, 155, 195, 235,
+                   238, 255)
+        for palette in (color_tables.xterm_palette4, color_tables.vga_palette4,
+                        color_tables.solarized_dark_palette4):
+            proximity.build_color_tables(base=palette)
+            for rgb in product(channel, repeat=3):
+                assert find(*rgb, method='analytic') == find(*rgb), rgb
+
+    def test_find_nearest_color_indexes(monkeypatch):
+        from array import array
+        from .proximity import (color_table4, find_nearest_color_index,
+                                find_nearest_color_indexes)
+        colors = [(0, 0, 0), (16, 16, 16), (176, 0, 176), (255, 255, 255),
+                  (100, 149, 237), (16, 16, 16)]
+        flat = bytes(value for rgb in colors for value in rgb)
+        for numpy in (proximity._get_numpy(), None):  # same either way
+            monkeypatch.setattr(proximity, '_numpy', numpy)
+            for table in (None, color_table4):
+                expected = array('B', (
+                    find_nearest_color_index(*rgb, color_table=table)
+                    for rgb in colors
+                ))
+                for values in (colors, flat, (rgb for rgb in colors)):
+                    assert find_nearest_color_indexes(values, table) == expected
+            assert (find_nearest_color_indexes(colors, method='lookup') ==
+                    find_nearest_color_indexes(iter(colors), method='lookup'))
+            assert find_nearest_color_indexes([]) == array('B')
+        with pytest.raises(ValueError):
+            find_nearest_color_indexes(colors, method='wut')
+
+    def test_find_nearest_color_oklab():
+        from .proximity import find_nearest_color_index as find, rgb_to_oklab
+        assert rgb_to_oklab(0, 0, 0) == (0, 0, 0)
+        assert round(rgb_to_oklab(255, 255, 255)[0], 6) == 1
+
+        assert find(40, 40, 60) == 236  # slate, perceptually darker:
+        assert find(40, 40, 60, method='oklab') == 235
+        assert find(255, 0, 0, method='oklab') == 9
+
+        _fg = style.ForegroundPalette(level=TermLevel.ANSI_EXTENDED,
+                                      downgrade_method='oklab')
+        assert str(_fg.t_28283c) == CSI + '38;5;235m'
+
+    def test_palette_copy():
+        import copy
+        _fg = style.ForegroundPalette(level=TermLevel.ANSI_EXTENDED)
+        duplicate = copy.copy(_fg)
+        assert str(duplicate.i_208) == str(_fg.i_208) == CSI + '38;5;208m'
+        with pytest.raises(AttributeError):
+            _fg._nope
+
     def test_compute_attr_created_once():
         ''' Attributes should only be created once. '''
         attrid1 = id(fg.t_ff00ff)
@@ -821,6 +1483,44 @@ if True:  # fold
         assert attrid1 == attrid2
         assert attrid3 == attrid4
 
+    def test_bounded_entry_cache():
+        _fg = style.ForegroundPalette(level=TermLevel.ANSI_DIRECT, cache_size=2)
+        first = _fg.t_111
+        _fg.t_222
+        assert _fg.t_111 is first           # hit, now most recent
+        _fg.t_333                           # evicts t_222
+        assert 't_111' not in vars(_fg)
+        assert _fg._cache_info() == (1, 3, 1, 2, 2)
+        assert _fg.t_111 is first
+        _fg.t_222                           # recreated
+        assert _fg._cache_info().misses == 4
+
+        _fg._clear()
+        assert _fg._cache_info().currsize == 0
+        assert str(_fg.red) == CSI + '31m'  # basic colors never evicted
+
+        _fg = style.ForegroundPalette(level=TermLevel.ANSI_DIRECT)
+        _fg.t_111, _fg.t_222, _fg.t_111
+        assert _fg._cache_info() == (0, 2, 0, None, 2)
+        _fg._clear()
+        assert _fg._cache_info().currsize == 0
+        assert str(_fg.red) == CSI + '31m'
+
+    def test_unknown_names_fail_fast():
+        _fg = style.ForegroundPalette(level=TermLevel.ANSI_DIRECT)
+        for _ in range(2):
+            with pytest.raises(AttributeError) as err:
+                _fg.cornflowerbleu
+            assert 'recognized' in err.value.args[0]
+            with pytest.raises(AttributeError) as err:
+                _fg.x_cornflowerbleu
+            assert 'X11' in err.value.args[0]
+        assert set(_fg._unknown) == {'cornflowerbleu', 'x_cornflowerbleu'}
+
+        assert not hasattr(_fg, '__deepcopy__')
+        assert _fg.x_cornflowerblue is _fg.x_cornflowerblue  # cached
+        assert str(_fg.indianred) == CSI + '38;2;205;92;92m'  # not i_DDD
+
     def test_style_plus_call_construct():
         ''' test warning on inefficient/problematic form '''
         #~ import warnings  # old way, just going to make it an exception
@@ -892,31 +1592,45 @@ if True:  # fold
         assert str(pb(1))  == '\x1b[2;32m▕\x1b[0m\x1b[2;32m▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉\x1b[0m\x1b[2;32m▏\x1b[0m   ✓'
         assert str(pb(1.119)) == '\x1b[2;32m▕\x1b[0m\x1b[2;32m▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉▉\x1b[0m\x1b[91m⏵\x1b[39m\x1b[91m  ✗ \x1b[39m'
 
+    def test_progress_wide_icons():
+        from .utils import len_stripped
+        pb = ProgressBar(clear_left=False, icons='wide_faces', width=30,
+                         styles='dumb')
+        for value in (0, .33, .5, 1):
+            assert len_stripped(str(pb(value)), cells=True) == 30
+        assert str(pb(.5)).startswith(f' {"😎" * 6}{"😞" * 6} ')
+
 # Line
 # ----------------------------------------------------------------------------
 if True:  # fold
     from .utils import make_line
     _def_width = 80
 
-    def test_line_std():
+    def test_line_std(ansi):
         expected = f'\x1b[2m{"─" * _def_width}\x1b[22m'
         assert make_line() == expected
 
-    def test_line_color():
+    def test_line_color(ansi):
         expected = f'\x1b[31m{"─" * _def_width}\x1b[39m'
         assert make_line(color='red') == expected
 
-    def test_line_str():
+    def test_line_str(ansi):
         char = '='
         expected = f'\x1b[2m{char * _def_width}\x1b[22m'
         assert make_line(string=char) == expected
 
-    def test_line_width():
+    def test_line_width(ansi):
         width = 10
         expected = f'\x1b[2m{"─" * width}\x1b[22m'
         assert make_line(width=width) == expected
 
-    def test_line_center_no_widt():
+    def test_line_wide_str(ansi):
+        expected = f'\x1b[2m{"🔥" * 5}\x1b[22m'
+        assert make_line(string='🔥', width=10) == expected
+        expected = f'\x1b[2m{"🔥=" * 3} \x1b[22m'   # padded to fit
+        assert make_line(string='🔥=', width=10) == expected
+
+    def test_line_center_no_widt(ansi):
         with pytest.raises(RuntimeError):
             make_line(center=True)
 
@@ -924,14 +1638,14 @@ if True:  # fold
     _get_spacing = lambda columns, width: " " * ((columns - width) // 2)
     _ansi_chars = 9  # len('\x1b[2m\x1b[22m')
 
-    def test_line_center_width_even():
+    def test_line_center_width_even(ansi):
         width = 10  # even, even
         spaces = _get_spacing(_def_width, width)
         expected = f'\x1b[2m{spaces}{"─" * width}{spaces}\x1b[22m'
         result = make_line(width=width, center=True)
         assert result == expected
 
-    def test_line_center_columns_odd():
+    def test_line_center_columns_odd(ansi):
         width = 10  # even
         columns = 81  # odd
         spaces = _get_spacing(columns, width)
@@ -941,7 +1655,7 @@ if True:  # fold
         assert result == expected
         assert len(result) == columns + _ansi_chars
 
-    def test_line_center_width_odd():
+    def test_line_center_width_odd(ansi):
         width = 11  # odd
         columns = 80  # even
         spaces = _get_spacing(columns, width)
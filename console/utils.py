@@ -14,13 +14,13 @@
 import logging
 import re
 import sys, os
+from functools import lru_cache
 from time import sleep
 from urllib.parse import quote
 from itertools import zip_longest, chain
 
-from . import ansi_capable as _ansi_capable
-from .constants import OSC, ST, _MODE_MAP, _TITLE_MODE_MAP
-from .screen import sc
+from .constants import (ANSI_RESET, CSI, OSC, ST, _MODE_MAP,
+                        _TITLE_MODE_MAP)
 from .detection import (get_size, is_a_tty, os_name, _read_clipboard,
                         _sized_char_support)
 from .meta import defaults
@@ -28,12 +28,56 @@ from .meta import defaults
 
 log = logging.getLogger(__name__)
 
+
 ansi_csi0_finder = re.compile(r'\x1b\[[0-?]*[ -/]*[@-~]')
 ansi_csi1_finder = re.compile(r'\x9b[0-?]*[ -/]*[@-~]')
 
 ansi_osc0_finder = re.compile(r'\x1b\].*?(\a|\x1b\\)')
 ansi_osc1_finder = re.compile(r'\x9b.*?(\a|\x9d)')
 
+# single-pass strippers, one combined pattern per option set: (c1, osc)
+_strip_c0 = r'\[[0-?]*[ -/]*[@-~]|[ -/]+[0-~]|[0-OQ-WYZ`-~]'  # CSI, charsets…
+_strip_c0_osc = r'\][^\a\x1b\n]*(?:\a|\x1b\\)|[PX^_][^\x1b\n]*\x1b\\'  # +DCS…
+_strip_c1 = r'(?<=\x9b)[0-?]*[ -/]*[@-~]'
+_strip_c1_osc = (r'(?<=\x9d)[^\a\x1b\x9c\n]*(?:\a|\x9c|\x1b\\)|'
+                 r'(?<=[\x90\x98\x9e\x9f])[^\x1b\x9c\n]*(?:\x9c|\x1b\\)')
+_strip_finders = {
+    (False, False): re.compile(rf'\x1b(?:{_strip_c0})'),
+    (False, True): re.compile(rf'\x1b(?:{_strip_c0}|{_strip_c0_osc})'),
+    # a leading class lets the regex engine skip ahead to introducers:
+    (True, False): re.compile(
+        rf'[\x1b\x9b](?:(?<=\x1b)(?:{_strip_c0})|{_strip_c1})'
+    ),
+    (True, True): re.compile(
+        rf'[\x1b\x90\x98\x9b\x9d\x9e\x9f](?:(?<=\x1b)(?:{_strip_c0}|'
+        rf'{_strip_c0_osc})|{_strip_c1}|{_strip_c1_osc})'
+    ),
+}
+_c1_introducers = '\x90\x98\x9b\x9d\x9e\x9f'
+_cell_index = _cell_blocks = None  # two-level table, see cell_width
+_wrap_finder = re.compile(r'\n|[ \t]+|[^ \t\n]+')
+_MAX_SEQUENCE_LEN = 4096  # longest partial sequence carried between chunks
+_sgr_matcher = re.compile(r'\x1b\[[0-9;:]*m').fullmatch
+
+# SGR state machine tables - slot: code to turn off, in output order
+_sgr_off_codes = dict(
+    bold='22', dim='22', italic='23', underline='24', blink='25',
+    reverse='27', conceal='28', crossed='29', font='10', frame='54',
+    overline='55', ideogram='65', script='75', fg='39', bg='49', ul='59',
+)
+_sgr_slots = dict(  # code: slot, None for off codes which may clear two
+    {'1': 'bold', '2': 'dim', '3': 'italic', '4': 'underline',
+     '21': 'underline', '5': 'blink', '6': 'blink', '7': 'reverse',
+     '8': 'conceal', '9': 'crossed', '51': 'frame', '52': 'frame',
+     '53': 'overline', '73': 'script', '74': 'script'},
+    **{str(code): 'font' for code in range(11, 21)},
+    **{str(code): 'ideogram' for code in range(60, 65)},
+    **{str(code): 'fg' for code in chain(range(30, 38), range(90, 98))},
+    **{str(code): 'bg' for code in chain(range(40, 48), range(100, 108))},
+    **{code: None for code in _sgr_off_codes.values()},
+)
+_sgr_extended = {'38': 'fg', '48': 'bg', '58': 'ul'}
+
 
 def clear_line(mode=2):
     ''' Clear the current line.
@@ -51,8 +95,10 @@ def clear_line(mode=2):
         Note:
             Cursor position does not change.
     '''
+    from . import ansi_capable, sc  # defer, runs detection
+
     text = sc.clear_line(_MODE_MAP.get(mode, mode))
-    if _ansi_capable:
+    if ansi_capable:
         print(text, end='', flush=True)
     return text
 
@@ -70,6 +116,8 @@ def clear_lines(lines: int, mode: int | str = 2):
 
         Returns: text sequence to be written, for testing.
     '''
+    from . import ansi_capable, sc  # defer, runs detection
+
     mode = _MODE_MAP.get(mode, mode)
     erase_cmd = sc.clear_line(mode)
     up_cmd = sc.move_up(1)
@@ -80,7 +128,7 @@ def clear_lines(lines: int, mode: int | str = 2):
         commands.append(up_cmd)
 
     text = ''.join(commands)
-    if _ansi_capable:
+    if ansi_capable:
         print(text, end='', flush=True)
     return text
 
@@ -100,8 +148,10 @@ def clear_screen(mode=2):
 
         Returns: text sequence to be written, for testing.
     '''
+    from . import ansi_capable, sc  # defer, runs detection
+
     text = sc.clear(_MODE_MAP.get(mode, mode))
-    if _ansi_capable:
+    if ansi_capable:
         print(text, end='', flush=True)
     return text
 
@@ -115,7 +165,9 @@ def flash(seconds=.1):
 
         Returns: text sequence to be written, for testing.
     '''
-    if _ansi_capable:
+    from . import ansi_capable, sc  # defer, runs detection
+
+    if ansi_capable:
         print(sc.enable_flash, end='', flush=True)
         sleep(seconds)
         print(sc.disable_flash, end='', flush=True)
@@ -139,8 +191,10 @@ def get_clipboard(source='c', encoding='utf8',
             Works on xterm, hterm, not many other terminals.
             https://invisible-island.net/xterm/ctlseqs/ctlseqs.html
             #h3-Operating-System-Commands
-    '''  # functionality in detection module:
-    if _ansi_capable:
+    '''
+    from . import ansi_capable  # defer, runs detection
+
+    if ansi_capable:  # functionality in detection module:
         return _read_clipboard(source=source, encoding=encoding,
                                max_bytes=max_bytes, timeout=timeout)
 
@@ -182,7 +236,9 @@ def make_hyperlink(target, caption=None, icon='',
             Experimental, see below for details:
              https://gist.github.com/egmontkob/eb114294efbcd5adb1944c9f3cb5feda
     '''
-    if _ansi_capable:
+    from . import ansi_capable  # defer, runs detection
+
+    if ansi_capable:
         SAFE_CHARS = (  # ''.join([ chr(n) for n in range(32, 126) ])
             ' !"#$%&\'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ'
             '[\\]^_`abcdefghijklmnopqrstuvwxyz{|}'
@@ -232,8 +288,8 @@ def make_line(string='─', width=0, color=None, center=False, _fallback=80):
         width = columns
 
     line = string * width
-    if len(string) > 1:  # truncate line length if multi-char string
-        line = line[:width]
+    if len(string) > 1 or not string.isascii():  # truncate to width in cells
+        line = _fit_cells(line, width)
 
     if center:
         if auto_width:  # manual width not set
@@ -244,10 +300,12 @@ def make_line(string='─', width=0, color=None, center=False, _fallback=80):
             line = spacing + line + spacing
 
             # if result is short from floor, we'll need another space
-            if len(line) != columns:
+            if cell_width(line) != columns:
                 line += ' '
 
-    if _ansi_capable:
+    from . import ansi_capable  # defer, runs detection
+
+    if ansi_capable:
         from . import fg, fx
         if color:
             line = getattr(fg, color)(line)
@@ -273,8 +331,10 @@ def make_sized(text, double=True, wide=False):
             - Double text is also wide so both options together are redundant.
               Wide therefore takes precedence.
     '''
+    from . import ansi_capable  # defer, runs detection
+
     result = text
-    if _ansi_capable and _sized_char_support:
+    if ansi_capable and _sized_char_support:
         if wide:
             result =  f'\x1b#6{text}'  # DECDWL
         elif double:
@@ -355,6 +415,8 @@ def notify_message(message, title=''):
             iterm2, rxvt with plugin, kitty
             https://gitlab.freedesktop.org/terminal-wg/specifications/-/issues/13
     '''
+    from . import ansi_capable  # defer, runs detection
+
     if os.environ.get('TERM', '').startswith('rxvt'):
         code = '777'
         message = f'notify;{title};{message};'
@@ -362,7 +424,7 @@ def notify_message(message, title=''):
         code = '9'
 
     text = f'{OSC}{code};{message}{ST}'
-    if _ansi_capable:
+    if ansi_capable:
         print(text, end='', flush=True)
     return text
 
@@ -381,11 +443,13 @@ if os_name == 'nt':
                 https://conemu.github.io/en/AnsiEscapeCodes.html#OSC_Operating_system_commands
                 https://gitlab.freedesktop.org/terminal-wg/specifications/-/issues/20
         '''
+        from . import ansi_capable  # defer, runs detection
+
         if not path:
             path = os.getcwd()
 
         text = f'{OSC}9;9;"{path}"{ST}'
-        if _ansi_capable:
+        if ansi_capable:
             print(text, end='', flush=True)
         return text
 
@@ -411,6 +475,8 @@ if os_name == 'nt':
                 https://gitlab.freedesktop.org/terminal-wg/specifications/-/issues/29
 
         '''
+        from . import ansi_capable  # defer, runs detection
+
         CLEAR, PROGRESS, ERROR, INDETERMINATE, PAUSED = range(5)  # modes
         mode = PROGRESS
 
@@ -430,7 +496,7 @@ if os_name == 'nt':
             value = 99  # paint full bar red, 2 bytes
 
         text = f'{OSC}9;4;{mode};{value}{ST}'
-        if _ansi_capable:
+        if ansi_capable:
             print(text, end='', flush=True)
         return text
 
@@ -447,6 +513,8 @@ else:
                 https://gitlab.freedesktop.org/terminal-wg/specifications/-/issues/20
                 https://conemu.github.io/en/AnsiEscapeCodes.html#OSC_Operating_system_commands
         '''
+        from . import ansi_capable  # defer, runs detection
+
         if not path:
             path = os.getcwd()
 
@@ -457,7 +525,7 @@ else:
         path = quote(path)
 
         text = f'{OSC}7;{path}{ST}'
-        if _ansi_capable:
+        if ansi_capable:
             print(text, end='', flush=True)
         return text
 
@@ -473,12 +541,14 @@ def reset_terminal():
         Greater than a fullscreen terminal clear, also clears the scrollback
         buffer.  May expose bugs in dumb terminals.
     '''
+    from . import ansi_capable, sc  # defer, runs detection
+
     if os_name == 'nt':
         from .windows import cls
         cls()
     else:
         text = sc.reset
-        if _ansi_capable:
+        if ansi_capable:
             print(text, end='', flush=True)
         return text  # for testing
 
@@ -501,7 +571,9 @@ def set_clipboard(data, destination='c', encoding='utf8',
             https://invisible-island.net/xterm/ctlseqs/ctlseqs.html
             #h3-Operating-System-Commands
     '''
-    if _ansi_capable:
+    from . import ansi_capable  # defer, runs detection
+
+    if ansi_capable:
         if len(data) > max_bytes:
             raise RuntimeError(f'clipboard data too large! ({len(data)} bytes)')
 
@@ -538,12 +610,14 @@ def set_title(title, mode=0):
 
         Returns: text sequence to be written or None, for testing.
     '''
+    from . import ansi_capable  # defer, runs detection
+
     if os_name == 'nt':
         from .windows import set_title
         set_title(title)  # returns a status code, not a string
     else:
         text = f'{OSC}{_TITLE_MODE_MAP.get(mode, mode)};{title}{ST}'
-        if _ansi_capable:
+        if ansi_capable:
             print(text, end='', flush=True)
         return text
 
@@ -555,32 +629,406 @@ def strip_ansi(text, c1=False, osc=False):
         Arguments:
             line: str
             c1:  bool  - include C1 based commands in the strippage.
-            osc: bool  - include OSC commands in the strippage.
+            osc: bool  - include OSC and other string commands,
+                         i.e. DCS, SOS, PM, and APC, in the strippage.
 
         Returns: stripped text
 
         Notes:
-            Enabling both C1 and OSC stripping is less efficient and the two
-            options can mildly conflict with one another.
-            The less problematic order was chosen,
-            but there may still be rare C1/OSC fragments left over.
+            CSI and short escapes, e.g. charset selection, are always
+            stripped.  All enabled kinds are removed in a single pass,
+            so they no longer interfere with one another.
+            See bench/strip_ansi.py.
     '''
-    text = ansi_csi0_finder.sub('', text)
-    if osc:
-        text = ansi_osc0_finder.sub('', text)
-    if c1:
-        text = ansi_csi1_finder.sub('', text)  # go first, less destructive
-        if osc:
-            text = ansi_osc1_finder.sub('', text)
-    return text
+    if c1 and not any(char in text for char in _c1_introducers):
+        c1 = False  # none found, use a simpler pattern
+    return _strip_finders[bool(c1), bool(osc)].sub('', text)
 
 
-def len_stripped(text):
+def len_stripped(text, cells=False):
     ''' Convenience - returns the length of a string minus escape sequences.
 
         Useful to find if a string will fit inside a given length on screen.
+
+        Arguments:
+            cells: bool  - count terminal cells rather than characters,
+                           see cell_width.
+    '''
+    text = _strip_finders[False, False].sub('', text)
+    return cell_width(text) if cells else len(text)
+
+
+def cell_width(text):
+    ''' Returns the number of terminal cells (columns) needed to display a
+        string without escape sequences.
+
+        Wide East Asian characters and emoji take two cells,
+        combining marks and other zero-width characters none.
+        Control characters count as one, as with len().
+    '''
+    if text.isascii():  # fast path
+        return len(text)
+
+    if _cell_index is None:
+        _load_cell_table()
+
+    index, blocks = _cell_index, _cell_blocks
+    width = 0
+    for char in text:
+        code = ord(char)
+        width += blocks[index[code >> 8] << 8 | code & 0xFF]
+    return width
+
+
+def _load_cell_table():
+    ''' Expand the compact range table into a two-level lookup:
+        an index of 256-character blocks, into the distinct blocks.
+    '''
+    global _cell_index, _cell_blocks
+    from .width_tables import cell_width_ranges
+
+    ends = [start for start, _ in cell_width_ranges[1:]] + [0x110000]
+    widths = bytearray()
+    for (start, width), end in zip(cell_width_ranges, ends):
+        widths += bytes((width,)) * (end - start)
+
+    blocks, index = {}, bytearray()
+    for start in range(0, 0x110000, 256):
+        block = bytes(widths[start:start + 256])
+        index.append(blocks.setdefault(block, len(blocks)))
+    _cell_index, _cell_blocks = bytes(index), b''.join(blocks)
+
+
+def _cut_cells(text, width):
+    ''' Returns the longest head of text fitting in width cells, and its
+        width.
+    '''
+    if text.isascii():
+        head = text[:width]
+        return head, len(head)
+    used = 0
+    for i, char in enumerate(text):
+        char_width = cell_width(char)
+        if used + char_width > width:
+            return text[:i], used
+        used += char_width
+    return text, used
+
+
+def _fit_cells(text, width):
+    ''' Cut text to the given number of cells, padding with spaces when a
+        wide character straddles the edge.
+    '''
+    head, used = _cut_cells(text, width)
+    if head is text:
+        return text
+    return head + ' ' * (width - used)
+
+
+def tokenize_ansi(source):
+    ''' Splits styled text into segments lazily, in a single pass.
+
+        Arguments:
+            source      A string, a text file-like object,
+                        or an iterable of strings.  Sequences split
+                        between pieces are rejoined.
+
+        Yields:
+            (kind, text, sgr_state) tuples, where kind is one of
+            'text', 'sgr', or 'escape' (other sequences),
+            and sgr_state is a single SGR sequence that restores the
+            colors and effects in effect after the segment,
+            empty when they are the default.
+    '''
+    slots, state = {}, ''
+    for kind, segment in _iter_ansi(source):
+        if kind == 'sgr':
+            _apply_sgr(slots, segment[2:-1])  # off codes remove slots
+            state = f'{CSI}{";".join(slots.values())}m' if slots else ''
+        yield kind, segment, state
+
+
+def _iter_ansi(source):
+    ''' Splits styled text into (kind, text) segments, see tokenize_ansi. '''
+    if isinstance(source, str):
+        pieces = (source,)
+    elif hasattr(source, 'read'):
+        pieces = iter(lambda: source.read(defaults.STREAM_CHUNK_SIZE), '')
+    else:
+        pieces = source
+
+    finder = _strip_finders[False, True]
+    carry = ''
+    for piece in chain(pieces, (None,)):  # None marks the end
+        if piece is None:
+            if carry:
+                yield 'text', carry
+            return
+        if carry:
+            piece = carry + piece
+            carry = ''
+
+        pos = 0
+        for match in finder.finditer(piece):
+            begin, end = match.span()
+            if begin > pos:
+                yield 'text', piece[pos:begin]
+            sequence = match.group()
+            yield ('sgr' if _sgr_matcher(sequence) else 'escape'), sequence
+            pos = end
+
+        # an escape near the end may be completed by the next piece:
+        esc = piece.find('\x1b', pos)
+        if esc != -1 and len(piece) - esc <= _MAX_SEQUENCE_LEN:
+            carry = piece[esc:]
+            piece = piece[:esc]
+        if len(piece) > pos:
+            yield 'text', piece[pos:]
+
+
+@lru_cache(maxsize=1024)
+def _parse_sgr(params):
+    ''' Returns a tuple of (slot, value) changes for SGR parameters,
+        where slot None means reset all and value None turns a slot off.
+    '''
+    changes = []
+    codes = params.split(';')
+    i = 0
+    while i < len(codes):
+        code = codes[i]
+        i += 1
+        if code in ('', '0'):
+            changes.append((None, None))
+        elif code in _sgr_slots:
+            slot = _sgr_slots[code]
+            if slot:
+                changes.append((slot, code))
+            else:  # off code, may turn off more than one slot
+                changes.extend((slot, None) for slot, off in
+                               _sgr_off_codes.items() if off == code)
+        elif code in _sgr_extended:  # ; form, consume color params
+            length = {'5': 2, '2': 4}.get(codes[i] if i < len(codes) else '')
+            if length is None:
+                changes.append((code, code))  # malformed, keep as is
+            else:
+                changes.append((_sgr_extended[code],
+                                ';'.join(codes[i - 1:i + length])))
+                i += length
+        elif code[:3] in ('38:', '48:', '58:'):  # : form, self-contained
+            changes.append((_sgr_extended[code[:2]], code))
+        elif code.startswith('4:'):  # underline styles
+            changes.append(('underline', None if code == '4:0' else code))
+        else:  # unknown, can only be cleared by a reset
+            changes.append((code, code))
+    return tuple(changes)
+
+
+def _apply_sgr(state, params):
+    ''' Update a state dict in place from SGR parameters. '''
+    for slot, value in _parse_sgr(params):
+        if slot is None:
+            state.clear()
+        elif value is None:
+            state.pop(slot, None)
+        else:
+            state[slot] = value
+
+
+def _sgr_state(styles):
+    ''' Returns the state dict produced by the given styles, in order. '''
+    state = {}
+    for style in styles:
+        for kind, segment in _iter_ansi(str(style)):
+            if kind == 'sgr':
+                _apply_sgr(state, segment[2:-1])
+    return state
+
+
+def _diff_sgr(current, target):
+    ''' Returns the shortest sequence that takes current state to target. '''
+    if current == target:
+        return ''
+    return _diff_sgr_items(tuple(current.items()), tuple(target.items()))
+
+
+@lru_cache(maxsize=1024)
+def _diff_sgr_items(current, target):
+    current, target = dict(current), dict(target)
+
+    # via off codes:
+    codes, working = [], dict(current)
+    for slot in current:
+        if slot not in target and slot in working:
+            off = _sgr_off_codes.get(slot)
+            if off is None:  # unknown code, needs reset
+                codes = None
+                break
+            codes.append(off)
+            for other, other_off in _sgr_off_codes.items():
+                if other_off == off:
+                    working.pop(other, None)
+    if codes is not None:
+        codes.extend(value for slot, value in target.items()
+                     if working.get(slot) != value)
+
+    # or via reset:
+    reset_codes = ['0']
+    reset_codes.extend(target.values())
+    if codes is None or len(';'.join(codes)) > len(';'.join(reset_codes)):
+        codes = reset_codes
+    return f'{CSI}{";".join(codes)}m'
+
+
+class SGRRenderer:
+    ''' Tracks the Select Graphic Rendition (colors and effects) state of a
+        terminal to emit only the minimal sequences needed between spans of
+        styled text.  Output should be written in order to one terminal.
+
+        Example::
+
+            render = SGRRenderer()
+            print(render('Warning: ', fg.red, fx.bold),
+                  render('disk space low', fg.red),  # emits only bold off
+                  render.reset(), sep='')
+    '''
+    def __init__(self):
+        self._state = {}
+
+    def __call__(self, text, *styles):
+        ''' Render text in the given styles, e.g. palette entries,
+            EffectsTerminator entries, or sequence strings.
+            Styles are absolute, none means the terminal default.
+        '''
+        return self._change(_sgr_state(styles)) + text
+
+    def minimize(self, text):
+        ''' Rewrite already styled text, dropping redundant SGR sequences
+            and merging consecutive ones.
+        '''
+        output = []
+        pending = dict(self._state)
+        for kind, segment in _iter_ansi(text):
+            if kind == 'sgr':
+                _apply_sgr(pending, segment[2:-1])
+                continue
+            # text, or escapes such as erase which paint the background:
+            output.append(self._change(pending))
+            pending = dict(pending)
+            output.append(segment)
+        output.append(self._change(pending))
+        return ''.join(output)
+
+    def reset(self):
+        ''' Returns the sequence to return to the terminal default, if any. '''
+        return self._change({})
+
+    def _change(self, target):
+        sequence = _diff_sgr(self._state, target)
+        self._state = target
+        return sequence
+
+
+def truncate(text, cells):
+    ''' Shortens styled text to at most the given number of terminal cells,
+        keeping its escape sequences.  Styles left open are reset.
+    '''
+    result, used = [], 0
+    state = ''
+    for kind, segment, next_state in tokenize_ansi(text):
+        if kind == 'text':
+            segment_cells = cell_width(segment)
+            if used + segment_cells > cells:
+                result.append(_cut_cells(segment, cells - used)[0])
+                if state:
+                    result.append(ANSI_RESET)
+                return ''.join(result)
+            used += segment_cells
+        result.append(segment)
+        state = next_state
+    return text
+
+
+def wrap(text, width):
+    ''' Wraps styled text into lines of at most width terminal cells,
+        breaking at whitespace where possible and keeping escape sequences.
+        Styles open at the end of a line are reset there and restored at the
+        start of the next.
+
+        Returns: list of lines, without newlines.
+    '''
+    lines = []
+    pieces, used = [], 0                # current line
+    start_state = state = ''            # SGR state at start of line, current
+    space, wrapped = '', False
+
+    for value, cells in _iter_words(text):
+        if value == '\n':
+            lines.append(_join_line(start_state, pieces, state))
+            pieces, used, start_state = [], 0, state
+            space, wrapped = '', False
+        elif type(value) is str:  # whitespace, dropped at wrapped breaks
+            space = value if (used or not wrapped) else ''
+        else:
+            if used and used + len(space) + cells > width:
+                lines.append(_join_line(start_state, pieces, state))
+                pieces, used, start_state = [], 0, state
+                space, wrapped = '', True
+            space = space[:max(width - used, 0)]  # leading may be too wide
+            pieces.append(space)
+            used += len(space)
+            space = ''
+            for segment, next_state in value:
+                if next_state is not None:  # sequence
+                    pieces.append(segment)
+                    state = next_state
+                    continue
+                while segment:  # break words longer than the line
+                    room = max(width - used, 0)  # over, after a wide char
+                    head, head_cells = _cut_cells(segment, room)
+                    if not head and not used:  # too narrow, take one char
+                        head, head_cells = segment[0], cell_width(segment[0])
+                    pieces.append(head)
+                    used += head_cells
+                    segment = segment[len(head):]
+                    if segment:
+                        lines.append(_join_line(start_state, pieces, state))
+                        pieces, used, start_state = [], 0, state
+                        wrapped = True
+
+    if pieces:
+        lines.append(_join_line(start_state, pieces, state))
+    return lines
+
+
+def _iter_words(text):
+    ''' Yields (whitespace, 0) or ([(segment, state)...], cells) for words.
+        Sequences belong to words and have a state, text has None.
+    '''
+    word, cells = [], 0
+    for kind, segment, state in tokenize_ansi(text):
+        if kind != 'text':
+            word.append((segment, state))
+            continue
+        for match in _wrap_finder.finditer(segment):
+            chunk = match.group()
+            if chunk[0] in ' \t\n':
+                if word:
+                    yield word, cells
+                    word, cells = [], 0
+                yield chunk, 0
+            else:
+                word.append((chunk, None))
+                cells += cell_width(chunk)
+    if word:
+        yield word, cells
+
+
+def _join_line(start_state, pieces, state):
+    ''' Restore the style at the start of a line, reset it at the end
+        if not the default.
     '''
-    return len(strip_ansi(text))
+    end = ANSI_RESET if state else ''
+    return ''.join(chain((start_state,), pieces, (end,)))
 
 
 # shortcuts for convenience, compatibility:
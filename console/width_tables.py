@@ -0,0 +1,251 @@
+'''
+    .. console - Comprehensive utility library for ANSI terminals.
+    .. © 2018-2025, Mike Miller - Released under the LGPL, version 3+.
+
+    Table of terminal cell widths by code point, for utils.cell_width().
+
+    Each entry gives the first code point of a range and the number of cells
+    its characters occupy, until the next entry.
+    Generated from the Unicode 14.0 database:
+    East Asian Wide and Fullwidth characters (incl. emoji) occupy two cells,
+    nonspacing/enclosing marks, format characters,
+    and Hangul medial/final Jamo occupy none.
+'''
+
+
+cell_width_ranges = (
+    (0x00000, 1), (0x00300, 0), (0x00370, 1), (0x00483, 0),
+    (0x0048A, 1), (0x00591, 0), (0x005BE, 1), (0x005BF, 0),
+    (0x005C0, 1), (0x005C1, 0), (0x005C3, 1), (0x005C4, 0),
+    (0x005C6, 1), (0x005C7, 0), (0x005C8, 1), (0x00600, 0),
+    (0x00606, 1), (0x00610, 0), (0x0061B, 1), (0x0061C, 0),
+    (0x0061D, 1), (0x0064B, 0), (0x00660, 1), (0x00670, 0),
+    (0x00671, 1), (0x006D6, 0), (0x006DE, 1), (0x006DF, 0),
+    (0x006E5, 1), (0x006E7, 0), (0x006E9, 1), (0x006EA, 0),
+    (0x006EE, 1), (0x0070F, 0), (0x00710, 1), (0x00711, 0),
+    (0x00712, 1), (0x00730, 0), (0x0074B, 1), (0x007A6, 0),
+    (0x007B1, 1), (0x007EB, 0), (0x007F4, 1), (0x007FD, 0),
+    (0x007FE, 1), (0x00816, 0), (0x0081A, 1), (0x0081B, 0),
+    (0x00824, 1), (0x00825, 0), (0x00828, 1), (0x00829, 0),
+    (0x0082E, 1), (0x00859, 0), (0x0085C, 1), (0x00890, 0),
+    (0x00892, 1), (0x00898, 0), (0x008A0, 1), (0x008CA, 0),
+    (0x00903, 1), (0x0093A, 0), (0x0093B, 1), (0x0093C, 0),
+    (0x0093D, 1), (0x00941, 0), (0x00949, 1), (0x0094D, 0),
+    (0x0094E, 1), (0x00951, 0), (0x00958, 1), (0x00962, 0),
+    (0x00964, 1), (0x00981, 0), (0x00982, 1), (0x009BC, 0),
+    (0x009BD, 1), (0x009C1, 0), (0x009C5, 1), (0x009CD, 0),
+    (0x009CE, 1), (0x009E2, 0), (0x009E4, 1), (0x009FE, 0),
+    (0x009FF, 1), (0x00A01, 0), (0x00A03, 1), (0x00A3C, 0),
+    (0x00A3D, 1), (0x00A41, 0), (0x00A43, 1), (0x00A47, 0),
+    (0x00A49, 1), (0x00A4B, 0), (0x00A4E, 1), (0x00A51, 0),
+    (0x00A52, 1), (0x00A70, 0), (0x00A72, 1), (0x00A75, 0),
+    (0x00A76, 1), (0x00A81, 0), (0x00A83, 1), (0x00ABC, 0),
+    (0x00ABD, 1), (0x00AC1, 0), (0x00AC6, 1), (0x00AC7, 0),
+    (0x00AC9, 1), (0x00ACD, 0), (0x00ACE, 1), (0x00AE2, 0),
+    (0x00AE4, 1), (0x00AFA, 0), (0x00B00, 1), (0x00B01, 0),
+    (0x00B02, 1), (0x00B3C, 0), (0x00B3D, 1), (0x00B3F, 0),
+    (0x00B40, 1), (0x00B41, 0), (0x00B45, 1), (0x00B4D, 0),
+    (0x00B4E, 1), (0x00B55, 0), (0x00B57, 1), (0x00B62, 0),
+    (0x00B64, 1), (0x00B82, 0), (0x00B83, 1), (0x00BC0, 0),
+    (0x00BC1, 1), (0x00BCD, 0), (0x00BCE, 1), (0x00C00, 0),
+    (0x00C01, 1), (0x00C04, 0), (0x00C05, 1), (0x00C3C, 0),
+    (0x00C3D, 1), (0x00C3E, 0), (0x00C41, 1), (0x00C46, 0),
+    (0x00C49, 1), (0x00C4A, 0), (0x00C4E, 1), (0x00C55, 0),
+    (0x00C57, 1), (0x00C62, 0), (0x00C64, 1), (0x00C81, 0),
+    (0x00C82, 1), (0x00CBC, 0), (0x00CBD, 1), (0x00CBF, 0),
+    (0x00CC0, 1), (0x00CC6, 0), (0x00CC7, 1), (0x00CCC, 0),
+    (0x00CCE, 1), (0x00CE2, 0), (0x00CE4, 1), (0x00D00, 0),
+    (0x00D02, 1), (0x00D3B, 0), (0x00D3D, 1), (0x00D41, 0),
+    (0x00D45, 1), (0x00D4D, 0), (0x00D4E, 1), (0x00D62, 0),
+    (0x00D64, 1), (0x00D81, 0), (0x00D82, 1), (0x00DCA, 0),
+    (0x00DCB, 1), (0x00DD2, 0), (0x00DD5, 1), (0x00DD6, 0),
+    (0x00DD7, 1), (0x00E31, 0), (0x00E32, 1), (0x00E34, 0),
+    (0x00E3B, 1), (0x00E47, 0), (0x00E4F, 1), (0x00EB1, 0),
+    (0x00EB2, 1), (0x00EB4, 0), (0x00EBD, 1), (0x00EC8, 0),
+    (0x00ECE, 1), (0x00F18, 0), (0x00F1A, 1), (0x00F35, 0),
+    (0x00F36, 1), (0x00F37, 0), (0x00F38, 1), (0x00F39, 0),
+    (0x00F3A, 1), (0x00F71, 0), (0x00F7F, 1), (0x00F80, 0),
+    (0x00F85, 1), (0x00F86, 0), (0x00F88, 1), (0x00F8D, 0),
+    (0x00F98, 1), (0x00F99, 0), (0x00FBD, 1), (0x00FC6, 0),
+    (0x00FC7, 1), (0x0102D, 0), (0x01031, 1), (0x01032, 0),
+    (0x01038, 1), (0x01039, 0), (0x0103B, 1), (0x0103D, 0),
+    (0x0103F, 1), (0x01058, 0), (0x0105A, 1), (0x0105E, 0),
+    (0x01061, 1), (0x01071, 0), (0x01075, 1), (0x01082, 0),
+    (0x01083, 1), (0x01085, 0), (0x01087, 1), (0x0108D, 0),
+    (0x0108E, 1), (0x0109D, 0), (0x0109E, 1), (0x01100, 2),
+    (0x01160, 0), (0x01200, 1), (0x0135D, 0), (0x01360, 1),
+    (0x01712, 0), (0x01715, 1), (0x01732, 0), (0x01734, 1),
+    (0x01752, 0), (0x01754, 1), (0x01772, 0), (0x01774, 1),
+    (0x017B4, 0), (0x017B6, 1), (0x017B7, 0), (0x017BE, 1),
+    (0x017C6, 0), (0x017C7, 1), (0x017C9, 0), (0x017D4, 1),
+    (0x017DD, 0), (0x017DE, 1), (0x0180B, 0), (0x01810, 1),
+    (0x01885, 0), (0x01887, 1), (0x018A9, 0), (0x018AA, 1),
+    (0x01920, 0), (0x01923, 1), (0x01927, 0), (0x01929, 1),
+    (0x01932, 0), (0x01933, 1), (0x01939, 0), (0x0193C, 1),
+    (0x01A17, 0), (0x01A19, 1), (0x01A1B, 0), (0x01A1C, 1),
+    (0x01A56, 0), (0x01A57, 1), (0x01A58, 0), (0x01A5F, 1),
+    (0x01A60, 0), (0x01A61, 1), (0x01A62, 0), (0x01A63, 1),
+    (0x01A65, 0), (0x01A6D, 1), (0x01A73, 0), (0x01A7D, 1),
+    (0x01A7F, 0), (0x01A80, 1), (0x01AB0, 0), (0x01ACF, 1),
+    (0x01B00, 0), (0x01B04, 1), (0x01B34, 0), (0x01B35, 1),
+    (0x01B36, 0), (0x01B3B, 1), (0x01B3C, 0), (0x01B3D, 1),
+    (0x01B42, 0), (0x01B43, 1), (0x01B6B, 0), (0x01B74, 1),
+    (0x01B80, 0), (0x01B82, 1), (0x01BA2, 0), (0x01BA6, 1),
+    (0x01BA8, 0), (0x01BAA, 1), (0x01BAB, 0), (0x01BAE, 1),
+    (0x01BE6, 0), (0x01BE7, 1), (0x01BE8, 0), (0x01BEA, 1),
+    (0x01BED, 0), (0x01BEE, 1), (0x01BEF, 0), (0x01BF2, 1),
+    (0x01C2C, 0), (0x01C34, 1), (0x01C36, 0), (0x01C38, 1),
+    (0x01CD0, 0), (0x01CD3, 1), (0x01CD4, 0), (0x01CE1, 1),
+    (0x01CE2, 0), (0x01CE9, 1), (0x01CED, 0), (0x01CEE, 1),
+    (0x01CF4, 0), (0x01CF5, 1), (0x01CF8, 0), (0x01CFA, 1),
+    (0x01DC0, 0), (0x01E00, 1), (0x0200B, 0), (0x02010, 1),
+    (0x0202A, 0), (0x0202F, 1), (0x02060, 0), (0x02065, 1),
+    (0x02066, 0), (0x02070, 1), (0x020D0, 0), (0x020F1, 1),
+    (0x0231A, 2), (0x0231C, 1), (0x02329, 2), (0x0232B, 1),
+    (0x023E9, 2), (0x023ED, 1), (0x023F0, 2), (0x023F1, 1),
+    (0x023F3, 2), (0x023F4, 1), (0x025FD, 2), (0x025FF, 1),
+    (0x02614, 2), (0x02616, 1), (0x02648, 2), (0x02654, 1),
+    (0x0267F, 2), (0x02680, 1), (0x02693, 2), (0x02694, 1),
+    (0x026A1, 2), (0x026A2, 1), (0x026AA, 2), (0x026AC, 1),
+    (0x026BD, 2), (0x026BF, 1), (0x026C4, 2), (0x026C6, 1),
+    (0x026CE, 2), (0x026CF, 1), (0x026D4, 2), (0x026D5, 1),
+    (0x026EA, 2), (0x026EB, 1), (0x026F2, 2), (0x026F4, 1),
+    (0x026F5, 2), (0x026F6, 1), (0x026FA, 2), (0x026FB, 1),
+    (0x026FD, 2), (0x026FE, 1), (0x02705, 2), (0x02706, 1),
+    (0x0270A, 2), (0x0270C, 1), (0x02728, 2), (0x02729, 1),
+    (0x0274C, 2), (0x0274D, 1), (0x0274E, 2), (0x0274F, 1),
+    (0x02753, 2), (0x02756, 1), (0x02757, 2), (0x02758, 1),
+    (0x02795, 2), (0x02798, 1), (0x027B0, 2), (0x027B1, 1),
+    (0x027BF, 2), (0x027C0, 1), (0x02B1B, 2), (0x02B1D, 1),
+    (0x02B50, 2), (0x02B51, 1), (0x02B55, 2), (0x02B56, 1),
+    (0x02CEF, 0), (0x02CF2, 1), (0x02D7F, 0), (0x02D80, 1),
+    (0x02DE0, 0), (0x02E00, 1), (0x02E80, 2), (0x02E9A, 1),
+    (0x02E9B, 2), (0x02EF4, 1), (0x02F00, 2), (0x02FD6, 1),
+    (0x02FF0, 2), (0x02FFC, 1), (0x03000, 2), (0x0302A, 0),
+    (0x0302E, 2), (0x0303F, 1), (0x03041, 2), (0x03097, 1),
+    (0x03099, 0), (0x0309B, 2), (0x03100, 1), (0x03105, 2),
+    (0x03130, 1), (0x03131, 2), (0x0318F, 1), (0x03190, 2),
+    (0x031E4, 1), (0x031F0, 2), (0x0321F, 1), (0x03220, 2),
+    (0x03248, 1), (0x03250, 2), (0x04DC0, 1), (0x04E00, 2),
+    (0x0A48D, 1), (0x0A490, 2), (0x0A4C7, 1), (0x0A66F, 0),
+    (0x0A673, 1), (0x0A674, 0), (0x0A67E, 1), (0x0A69E, 0),
+    (0x0A6A0, 1), (0x0A6F0, 0), (0x0A6F2, 1), (0x0A802, 0),
+    (0x0A803, 1), (0x0A806, 0), (0x0A807, 1), (0x0A80B, 0),
+    (0x0A80C, 1), (0x0A825, 0), (0x0A827, 1), (0x0A82C, 0),
+    (0x0A82D, 1), (0x0A8C4, 0), (0x0A8C6, 1), (0x0A8E0, 0),
+    (0x0A8F2, 1), (0x0A8FF, 0), (0x0A900, 1), (0x0A926, 0),
+    (0x0A92E, 1), (0x0A947, 0), (0x0A952, 1), (0x0A960, 2),
+    (0x0A97D, 1), (0x0A980, 0), (0x0A983, 1), (0x0A9B3, 0),
+    (0x0A9B4, 1), (0x0A9B6, 0), (0x0A9BA, 1), (0x0A9BC, 0),
+    (0x0A9BE, 1), (0x0A9E5, 0), (0x0A9E6, 1), (0x0AA29, 0),
+    (0x0AA2F, 1), (0x0AA31, 0), (0x0AA33, 1), (0x0AA35, 0),
+    (0x0AA37, 1), (0x0AA43, 0), (0x0AA44, 1), (0x0AA4C, 0),
+    (0x0AA4D, 1), (0x0AA7C, 0), (0x0AA7D, 1), (0x0AAB0, 0),
+    (0x0AAB1, 1), (0x0AAB2, 0), (0x0AAB5, 1), (0x0AAB7, 0),
+    (0x0AAB9, 1), (0x0AABE, 0), (0x0AAC0, 1), (0x0AAC1, 0),
+    (0x0AAC2, 1), (0x0AAEC, 0), (0x0AAEE, 1), (0x0AAF6, 0),
+    (0x0AAF7, 1), (0x0ABE5, 0), (0x0ABE6, 1), (0x0ABE8, 0),
+    (0x0ABE9, 1), (0x0ABED, 0), (0x0ABEE, 1), (0x0AC00, 2),
+    (0x0D7A4, 1), (0x0F900, 2), (0x0FA6E, 1), (0x0FA70, 2),
+    (0x0FADA, 1), (0x0FB1E, 0), (0x0FB1F, 1), (0x0FE00, 0),
+    (0x0FE10, 2), (0x0FE1A, 1), (0x0FE20, 0), (0x0FE30, 2),
+    (0x0FE53, 1), (0x0FE54, 2), (0x0FE67, 1), (0x0FE68, 2),
+    (0x0FE6C, 1), (0x0FEFF, 0), (0x0FF00, 1), (0x0FF01, 2),
+    (0x0FF61, 1), (0x0FFE0, 2), (0x0FFE7, 1), (0x0FFF9, 0),
+    (0x0FFFC, 1), (0x101FD, 0), (0x101FE, 1), (0x102E0, 0),
+    (0x102E1, 1), (0x10376, 0), (0x1037B, 1), (0x10A01, 0),
+    (0x10A04, 1), (0x10A05, 0), (0x10A07, 1), (0x10A0C, 0),
+    (0x10A10, 1), (0x10A38, 0), (0x10A3B, 1), (0x10A3F, 0),
+    (0x10A40, 1), (0x10AE5, 0), (0x10AE7, 1), (0x10D24, 0),
+    (0x10D28, 1), (0x10EAB, 0), (0x10EAD, 1), (0x10F46, 0),
+    (0x10F51, 1), (0x10F82, 0), (0x10F86, 1), (0x11001, 0),
+    (0x11002, 1), (0x11038, 0), (0x11047, 1), (0x11070, 0),
+    (0x11071, 1), (0x11073, 0), (0x11075, 1), (0x1107F, 0),
+    (0x11082, 1), (0x110B3, 0), (0x110B7, 1), (0x110B9, 0),
+    (0x110BB, 1), (0x110BD, 0), (0x110BE, 1), (0x110C2, 0),
+    (0x110C3, 1), (0x110CD, 0), (0x110CE, 1), (0x11100, 0),
+    (0x11103, 1), (0x11127, 0), (0x1112C, 1), (0x1112D, 0),
+    (0x11135, 1), (0x11173, 0), (0x11174, 1), (0x11180, 0),
+    (0x11182, 1), (0x111B6, 0), (0x111BF, 1), (0x111C9, 0),
+    (0x111CD, 1), (0x111CF, 0), (0x111D0, 1), (0x1122F, 0),
+    (0x11232, 1), (0x11234, 0), (0x11235, 1), (0x11236, 0),
+    (0x11238, 1), (0x1123E, 0), (0x1123F, 1), (0x112DF, 0),
+    (0x112E0, 1), (0x112E3, 0), (0x112EB, 1), (0x11300, 0),
+    (0x11302, 1), (0x1133B, 0), (0x1133D, 1), (0x11340, 0),
+    (0x11341, 1), (0x11366, 0), (0x1136D, 1), (0x11370, 0),
+    (0x11375, 1), (0x11438, 0), (0x11440, 1), (0x11442, 0),
+    (0x11445, 1), (0x11446, 0), (0x11447, 1), (0x1145E, 0),
+    (0x1145F, 1), (0x114B3, 0), (0x114B9, 1), (0x114BA, 0),
+    (0x114BB, 1), (0x114BF, 0), (0x114C1, 1), (0x114C2, 0),
+    (0x114C4, 1), (0x115B2, 0), (0x115B6, 1), (0x115BC, 0),
+    (0x115BE, 1), (0x115BF, 0), (0x115C1, 1), (0x115DC, 0),
+    (0x115DE, 1), (0x11633, 0), (0x1163B, 1), (0x1163D, 0),
+    (0x1163E, 1), (0x1163F, 0), (0x11641, 1), (0x116AB, 0),
+    (0x116AC, 1), (0x116AD, 0), (0x116AE, 1), (0x116B0, 0),
+    (0x116B6, 1), (0x116B7, 0), (0x116B8, 1), (0x1171D, 0),
+    (0x11720, 1), (0x11722, 0), (0x11726, 1), (0x11727, 0),
+    (0x1172C, 1), (0x1182F, 0), (0x11838, 1), (0x11839, 0),
+    (0x1183B, 1), (0x1193B, 0), (0x1193D, 1), (0x1193E, 0),
+    (0x1193F, 1), (0x11943, 0), (0x11944, 1), (0x119D4, 0),
+    (0x119D8, 1), (0x119DA, 0), (0x119DC, 1), (0x119E0, 0),
+    (0x119E1, 1), (0x11A01, 0), (0x11A0B, 1), (0x11A33, 0),
+    (0x11A39, 1), (0x11A3B, 0), (0x11A3F, 1), (0x11A47, 0),
+    (0x11A48, 1), (0x11A51, 0), (0x11A57, 1), (0x11A59, 0),
+    (0x11A5C, 1), (0x11A8A, 0), (0x11A97, 1), (0x11A98, 0),
+    (0x11A9A, 1), (0x11C30, 0), (0x11C37, 1), (0x11C38, 0),
+    (0x11C3E, 1), (0x11C3F, 0), (0x11C40, 1), (0x11C92, 0),
+    (0x11CA8, 1), (0x11CAA, 0), (0x11CB1, 1), (0x11CB2, 0),
+    (0x11CB4, 1), (0x11CB5, 0), (0x11CB7, 1), (0x11D31, 0),
+    (0x11D37, 1), (0x11D3A, 0), (0x11D3B, 1), (0x11D3C, 0),
+    (0x11D3E, 1), (0x11D3F, 0), (0x11D46, 1), (0x11D47, 0),
+    (0x11D48, 1), (0x11D90, 0), (0x11D92, 1), (0x11D95, 0),
+    (0x11D96, 1), (0x11D97, 0), (0x11D98, 1), (0x11EF3, 0),
+    (0x11EF5, 1), (0x13430, 0), (0x13439, 1), (0x16AF0, 0),
+    (0x16AF5, 1), (0x16B30, 0), (0x16B37, 1), (0x16F4F, 0),
+    (0x16F50, 1), (0x16F8F, 0), (0x16F93, 1), (0x16FE0, 2),
+    (0x16FE4, 0), (0x16FE5, 1), (0x16FF0, 2), (0x16FF2, 1),
+    (0x17000, 2), (0x187F8, 1), (0x18800, 2), (0x18CD6, 1),
+    (0x18D00, 2), (0x18D09, 1), (0x1AFF0, 2), (0x1AFF4, 1),
+    (0x1AFF5, 2), (0x1AFFC, 1), (0x1AFFD, 2), (0x1AFFF, 1),
+    (0x1B000, 2), (0x1B123, 1), (0x1B150, 2), (0x1B153, 1),
+    (0x1B164, 2), (0x1B168, 1), (0x1B170, 2), (0x1B2FC, 1),
+    (0x1BC9D, 0), (0x1BC9F, 1), (0x1BCA0, 0), (0x1BCA4, 1),
+    (0x1CF00, 0), (0x1CF2E, 1), (0x1CF30, 0), (0x1CF47, 1),
+    (0x1D167, 0), (0x1D16A, 1), (0x1D173, 0), (0x1D183, 1),
+    (0x1D185, 0), (0x1D18C, 1), (0x1D1AA, 0), (0x1D1AE, 1),
+    (0x1D242, 0), (0x1D245, 1), (0x1DA00, 0), (0x1DA37, 1),
+    (0x1DA3B, 0), (0x1DA6D, 1), (0x1DA75, 0), (0x1DA76, 1),
+    (0x1DA84, 0), (0x1DA85, 1), (0x1DA9B, 0), (0x1DAA0, 1),
+    (0x1DAA1, 0), (0x1DAB0, 1), (0x1E000, 0), (0x1E007, 1),
+    (0x1E008, 0), (0x1E019, 1), (0x1E01B, 0), (0x1E022, 1),
+    (0x1E023, 0), (0x1E025, 1), (0x1E026, 0), (0x1E02B, 1),
+    (0x1E130, 0), (0x1E137, 1), (0x1E2AE, 0), (0x1E2AF, 1),
+    (0x1E2EC, 0), (0x1E2F0, 1), (0x1E8D0, 0), (0x1E8D7, 1),
+    (0x1E944, 0), (0x1E94B, 1), (0x1F004, 2), (0x1F005, 1),
+    (0x1F0CF, 2), (0x1F0D0, 1), (0x1F18E, 2), (0x1F18F, 1),
+    (0x1F191, 2), (0x1F19B, 1), (0x1F200, 2), (0x1F203, 1),
+    (0x1F210, 2), (0x1F23C, 1), (0x1F240, 2), (0x1F249, 1),
+    (0x1F250, 2), (0x1F252, 1), (0x1F260, 2), (0x1F266, 1),
+    (0x1F300, 2), (0x1F321, 1), (0x1F32D, 2), (0x1F336, 1),
+    (0x1F337, 2), (0x1F37D, 1), (0x1F37E, 2), (0x1F394, 1),
+    (0x1F3A0, 2), (0x1F3CB, 1), (0x1F3CF, 2), (0x1F3D4, 1),
+    (0x1F3E0, 2), (0x1F3F1, 1), (0x1F3F4, 2), (0x1F3F5, 1),
+    (0x1F3F8, 2), (0x1F43F, 1), (0x1F440, 2), (0x1F441, 1),
+    (0x1F442, 2), (0x1F4FD, 1), (0x1F4FF, 2), (0x1F53E, 1),
+    (0x1F54B, 2), (0x1F54F, 1), (0x1F550, 2), (0x1F568, 1),
+    (0x1F57A, 2), (0x1F57B, 1), (0x1F595, 2), (0x1F597, 1),
+    (0x1F5A4, 2), (0x1F5A5, 1), (0x1F5FB, 2), (0x1F650, 1),
+    (0x1F680, 2), (0x1F6C6, 1), (0x1F6CC, 2), (0x1F6CD, 1),
+    (0x1F6D0, 2), (0x1F6D3, 1), (0x1F6D5, 2), (0x1F6D8, 1),
+    (0x1F6DD, 2), (0x1F6E0, 1), (0x1F6EB, 2), (0x1F6ED, 1),
+    (0x1F6F4, 2), (0x1F6FD, 1), (0x1F7E0, 2), (0x1F7EC, 1),
+    (0x1F7F0, 2), (0x1F7F1, 1), (0x1F90C, 2), (0x1F93B, 1),
+    (0x1F93C, 2), (0x1F946, 1), (0x1F947, 2), (0x1FA00, 1),
+    (0x1FA70, 2), (0x1FA75, 1), (0x1FA78, 2), (0x1FA7D, 1),
+    (0x1FA80, 2), (0x1FA87, 1), (0x1FA90, 2), (0x1FAAD, 1),
+    (0x1FAB0, 2), (0x1FABB, 1), (0x1FAC0, 2), (0x1FAC6, 1),
+    (0x1FAD0, 2), (0x1FADA, 1), (0x1FAE0, 2), (0x1FAE8, 1),
+    (0x1FAF0, 2), (0x1FAF7, 1), (0x20000, 2), (0x2FFFE, 1),
+    (0x30000, 2), (0x3FFFE, 1), (0xE0001, 0), (0xE0002, 1),
+    (0xE0020, 0), (0xE0080, 1), (0xE0100, 0), (0xE01F0, 1),
+)
@@ -20,6 +20,7 @@ install_requires = (
 tests_require = ('pyflakes', 'pytest', 'readme_renderer'),
 extras_require = dict(
     figlet=('pyfiglet',),
+    numpy=('numpy',),  # batch color downgrade
     webcolors=('webcolors',),
 )  # build entry for all extras:
 extras_require['all'] = tuple(chain.from_iterable(extras_require.values()))